@@ -56,7 +56,7 @@ interface HistoryItem {
 interface LetterVersion {
   id: string;
   historyId: string;
-  markdown: string;
+  markdown?: string; // Not in the version list; loaded when the version is shown
   tone?: string;
   userPrompt?: string;
   version?: number;
@@ -66,8 +66,14 @@ interface LetterVersion {
 const API_BASE =
   `${import.meta.env.VITE_API_URL}/api` || "http://localhost:5000";
 
+// History rows per request; more are loaded on demand
+const HISTORY_PAGE_SIZE = 50;
+
 const HistoryPage: React.FC = () => {
   const [history, setHistory] = useState<HistoryItem[]>([]);
+  // Cursor for the next page of history (null when everything is loaded)
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -91,8 +97,9 @@ const HistoryPage: React.FC = () => {
       setLoading(true);
       setError(null);
       try {
-        const res = await getWithAuth("/history");
+        const res = await getWithAuth(`/history?limit=${HISTORY_PAGE_SIZE}`);
         setHistory(res.history ?? []);
+        setNextCursor(res.nextCursor ?? null);
       } catch (err) {
         console.error("Failed to load history", err);
         setError("Failed to load job history. Please try again.");
@@ -104,6 +111,44 @@ const HistoryPage: React.FC = () => {
     loadHistory();
   }, []);
 
+  const loadMoreHistory = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await getWithAuth(
+        `/history?limit=${HISTORY_PAGE_SIZE}&after=${encodeURIComponent(nextCursor)}`
+      );
+      setHistory((prev) => [...prev, ...(res.history ?? [])]);
+      setNextCursor(res.nextCursor ?? null);
+    } catch (err) {
+      console.error("Failed to load more history", err);
+      setError("Failed to load more history. Please try again.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Letter bodies are fetched one version at a time, when selected
+  useEffect(() => {
+    const version = versions[selectedVersionIndex];
+    if (!versionsOpen || !selectedHistoryItem || !version) return;
+    if (version.markdown !== undefined || version.version === undefined) return;
+
+    const historyId = selectedHistoryItem.id;
+    getWithAuth(`/history/${historyId}/letters/${version.version}`)
+      .then((res) => {
+        setVersions((prev) =>
+          prev.map((v) =>
+            v.id === version.id ? { ...v, markdown: res.letter?.markdown ?? "" } : v
+          )
+        );
+      })
+      .catch((err) => {
+        console.error("Failed to load letter version", err);
+        setVersionsError("Failed to load this letter version.");
+      });
+  }, [versionsOpen, selectedHistoryItem, versions, selectedVersionIndex]);
+
   const handleExport = async () => {
     try {
       const auth = await getAuthData();
@@ -150,6 +195,7 @@ const HistoryPage: React.FC = () => {
       setSaveMessage(null);
 
       const version = versions[selectedVersionIndex];
+      if (version.markdown === undefined) return;
 
       // 1. Build Word-compatible HTML just like on the main page
       const html = buildCoverLetterWordHtml(
@@ -247,7 +293,9 @@ const HistoryPage: React.FC = () => {
     setSelectedVersionIndex(0);
 
     try {
-      const res = await getWithAuth(`/history/${item.id}/letters`);
+      const res = await getWithAuth(
+        `/history/${item.id}/letters?summary=true&limit=200`
+      );
       setVersions(res.letters ?? []);
       setSelectedVersionIndex(0);
     } catch (err) {
@@ -540,6 +588,13 @@ const HistoryPage: React.FC = () => {
             </TableBody>
           </Table>
         </TableContainer>
+        {nextCursor && (
+          <Box sx={{ display: "flex", justifyContent: "center", pt: 1.5 }}>
+            <Button onClick={loadMoreHistory} disabled={loadingMore}>
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          </Box>
+        )}
       </Box>
 
       {/* Versions modal */}
@@ -649,7 +704,7 @@ const HistoryPage: React.FC = () => {
                         size="small"
                         onClick={() =>
                           handleCopyVersion(
-                            selectedVersion.markdown,
+                            selectedVersion.markdown ?? "",
                             `v${selectedVersionLabel}`
                           )
                         }
@@ -699,7 +754,9 @@ const HistoryPage: React.FC = () => {
                       whiteSpace: "pre-wrap",
                     }}
                   >
-                    {selectedVersion.markdown}
+                    {selectedVersion.markdown ?? (
+                      <CircularProgress size={20} />
+                    )}
                   </Paper>
                 </Box>
               )}
@@ -10,6 +10,7 @@ import {
   ListItemButton,
   ListItemText,
   IconButton,
+  Button,
   Tooltip,
   TextField,
   InputAdornment,
@@ -19,8 +20,14 @@ import WorkIcon from "@mui/icons-material/Work";
 import SearchIcon from "@mui/icons-material/Search";
 import { getWithAuth } from "../api/base";
 
+// Jobs per request; more are loaded on demand
+const JOBS_PAGE_SIZE = 200;
+
 const JobBoard = () => {
   const [jobs, setJobs] = React.useState<Record<string, string>>({});
+  // Cursor for the next page of jobs (null when everything is loaded)
+  const [nextCursor, setNextCursor] = React.useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = React.useState(false);
   const [loading, setLoading] = React.useState(true);
   const [error, setError] = React.useState<string | null>(null);
   const [searchTerm, setSearchTerm] = React.useState("");
@@ -30,8 +37,9 @@ const JobBoard = () => {
       try {
         setLoading(true);
         setError(null);
-        const res = await getWithAuth("/history/unique-jobs");
+        const res = await getWithAuth(`/history/unique-jobs?limit=${JOBS_PAGE_SIZE}`);
         setJobs(res.unique_jobs || {});
+        setNextCursor(res.nextCursor ?? null);
       } catch (err) {
         console.error("Failed to fetch jobs:", err);
         setError("Failed to load jobs. Please try again.");
@@ -42,6 +50,24 @@ const JobBoard = () => {
     fetchJobs();
   }, []);
 
+  const loadMoreJobs = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await getWithAuth(
+        `/history/unique-jobs?limit=${JOBS_PAGE_SIZE}&after=${encodeURIComponent(nextCursor)}`
+      );
+      // Pages are newest first: keep the link already shown for a title
+      setJobs((prev) => ({ ...(res.unique_jobs || {}), ...prev }));
+      setNextCursor(res.nextCursor ?? null);
+    } catch (err) {
+      console.error("Failed to load more jobs:", err);
+      setError("Failed to load more jobs. Please try again.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const openJobLink = (url: string) => {
     window.open(url, "_blank", "noreferrer");
   };
@@ -201,6 +227,13 @@ const JobBoard = () => {
           </ListItem>
         ))}
       </List>
+      {nextCursor && (
+        <Box sx={{ display: "flex", justifyContent: "center", pt: 1.5 }}>
+          <Button onClick={loadMoreJobs} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 };
@@ -31,6 +31,10 @@ import DeleteForeverIcon from "@mui/icons-material/DeleteForever";
 import { getGoogleAccessToken } from "../utils/googleIdentity";
 import CloudUploadIcon from "@mui/icons-material/CloudUpload";
 
+// Resume uploads are processed in the background by the server
+const isProcessing = (resume: User["resume"] | undefined) =>
+  resume?.status === "pending" || resume?.status === "processing";
+
 export default function Profile({
   setAttentionItem,
   onLogout,
@@ -122,6 +126,16 @@ export default function Profile({
         setFormData(response.user);
       }
       setAttentionItem("profile", response?.user?.attention_needed);
+
+      // The server reads the file in the background (202); poll until it is done
+      let resume = response?.user?.resume;
+      for (let i = 0; i < 60 && isProcessing(resume); i++) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const profile = await getWithAuth("/profile");
+        resume = profile?.user?.resume;
+        setUser(profile.user);
+        setFormData(profile.user);
+      }
     } catch (err) {
       console.error("Error uploading resume:", err);
     } finally {
@@ -325,6 +339,16 @@ export default function Profile({
                   {user.resume.file_name}
                 </Typography>
               </Stack>
+              {isProcessing(user.resume) && (
+                <Typography variant="body2" color="text.secondary" sx={{ mb: 1 }}>
+                  Reading your resume...
+                </Typography>
+              )}
+              {user.resume.status === "failed" && (
+                <Typography variant="body2" color="error" sx={{ mb: 1 }}>
+                  {user.resume.error || "Your resume could not be read. Please upload it again."}
+                </Typography>
+              )}
 
               <Stack
                 direction="row"
@@ -15,8 +15,10 @@ export interface User {
   // Resume details if uploaded
   resume: {
     file_name: string; // Original uploaded file name
-    text: string; // Extracted resume text content
+    text: string | null; // Extracted resume text content (null until processed)
     id: string; // Resume document ID from database
+    status: "pending" | "processing" | "ready" | "failed"; // Background text extraction state
+    error: string | null; // Why processing failed, if it did
   } | null;
 
   // Location and contact info
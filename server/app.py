@@ -1,14 +1,29 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from routes.health.routes import init_health_routes
 from routes.auth.routes import init_auth_routes
-from routes.cover_letter.routes import init_cover_letter_routes
+from routes.cover_letter.routes import BATCH_MAX_BODY_BYTES, COVER_LETTER_MAX_BODY_BYTES, init_cover_letter_routes
 from routes.profile.routes import init_profile_routes
 from routes.history.routes import init_history_routes
 from routes.drive.routes import init_drive_routes
+from routes.metrics.routes import init_metrics_routes
+from utils.metrics import instrument_app
+from utils.upload_spool import RESUME_MAX_REQUEST_BYTES
 
 app = Flask(__name__)
 CORS(app)
+instrument_app(app)
+
+# Werkzeug refuses bodies over the largest any endpoint accepts, before
+# parsing form data (routes check their own, smaller limits)
+app.config["MAX_CONTENT_LENGTH"] = max(RESUME_MAX_REQUEST_BYTES, COVER_LETTER_MAX_BODY_BYTES, BATCH_MAX_BODY_BYTES)
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({"error": "Request body is too large"}), 413
+
 
 init_health_routes(app)
 init_auth_routes(app)
@@ -16,6 +31,10 @@ init_cover_letter_routes(app)
 init_profile_routes(app)
 init_history_routes(app)
 init_drive_routes(app)
+init_metrics_routes(app)
 
 if __name__ == '__main__':
+    # Under gunicorn this runs once in the master instead (gunicorn.conf.py)
+    from config.migrations import run_startup_migrations
+    run_startup_migrations()
     app.run(debug=True, port=5000, host='0.0.0.0')
@@ -0,0 +1,73 @@
+"""
+Benchmark: site-specific job description extractors.
+
+For pages shaped like each supported job board (a description of
+--description-kb inside a larger page of listings and chrome), compares
+cleaning the whole page (trim_html) with extracting the description
+container first (clean_job_html), and reports throughput and how much text
+is left for the prompt. Also runs the fixture pages in tests/fixtures/job_pages.
+
+Run from the server directory:
+    python -m benchmarks.bench_extractors
+    python -m benchmarks.bench_extractors --sizes 50 500 --repeat 3
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from benchmarks.corpus import make_posting_html
+from utils.job_cleaner import trim_html
+from utils.job_postings import clean_job_html
+
+# site -> job URL the corpus page pretends to come from
+SITES = {
+    "generic": "https://careers.example.com/jobs/1",
+    "linkedin": "https://www.linkedin.com/jobs/view/1",
+    "indeed": "https://ca.indeed.com/viewjob?jk=1",
+    "workday": "https://example.wd3.myworkdayjobs.com/careers/job/1",
+    "greenhouse": "https://boards.greenhouse.io/example/jobs/1",
+    "lever": "https://jobs.lever.co/example/1",
+}
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "job_pages"
+
+
+def _time(fn, repeat: int) -> tuple[float, object]:
+    """Return (mean ms, last result)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="posting sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per posting")
+    parser.add_argument("--description-kb", type=int, default=8, help="size of the description itself")
+    args = parser.parse_args()
+
+    print(f"{'site':>10} {'KB':>5} {'extractor':>10} {'page ms':>8} {'extract ms':>11} "
+          f"{'speedup':>8} {'MB/s':>7} {'page chars':>11} {'desc chars':>11}")
+
+    for site, url in SITES.items():
+        for kb in args.sizes:
+            html = make_posting_html(random.Random(kb), kb, site, description_kb=min(kb, args.description_kb))
+            page_ms, page_text = _time(lambda: trim_html(html), args.repeat)
+            extract_ms, (text, _, extractor) = _time(lambda: clean_job_html(html, url), args.repeat)
+            mb_per_s = len(html) / (1024 * 1024) / (extract_ms / 1000)
+            print(f"{site:>10} {kb:>5} {extractor:>10} {page_ms:>8.1f} {extract_ms:>11.1f} "
+                  f"{page_ms / extract_ms:>7.1f}x {mb_per_s:>7.1f} {len(page_text):>11} {len(text):>11}")
+
+    print(f"\n{'fixture':>30} {'extractor':>10} {'page chars':>11} {'desc chars':>11}")
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        site = path.stem.split("_")[0]
+        text, _, extractor = clean_job_html(html, SITES.get(site))
+        print(f"{path.name:>30} {extractor:>10} {len(trim_html(html)):>11} {len(text):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: page-parallel PDF resume extraction.
+
+For generated text PDFs of 1 to 50 pages, compares:
+  - serial:   extract_text_from_file in this process (the old upload path)
+  - pool xN:  extract_pdf_text on N extraction worker processes, no budget
+  - budget:   same on the largest pool, stopping at RESUME_EXTRACT_MAX_CHARS
+  - cached:   re-extracting the same file (every page from the page cache)
+
+Parallel speedup needs as many free CPU cores as workers.
+
+Run from the server directory:
+    python -m benchmarks.bench_pdf_extraction
+    python -m benchmarks.bench_pdf_extraction --pages 10 50 --workers 1 4
+"""
+
+import argparse
+import hashlib
+import io
+import random
+import sys
+import time
+import warnings
+
+from benchmarks.corpus import make_resume_pdf
+from utils.extraction_pool import ExtractionPool
+from utils.files_utils import extract_pdf_pages, extract_text_from_file
+from utils.pdf_extraction import RESUME_EXTRACT_MAX_CHARS, clear_memory_cache, extract_pdf_text
+
+NO_BUDGET = sys.maxsize
+
+
+def _ms(fn, repeat: int) -> tuple[float, object]:
+    """Return (mean ms, last result)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, out
+
+
+def _pooled(pool: ExtractionPool, data: bytes, max_chars: int, cached: bool = False) -> str:
+    if not cached:
+        clear_memory_cache()
+    return extract_pdf_text(
+        hashlib.sha256(data).hexdigest(),
+        lambda pages: pool.extract(data, "resume.pdf", extract_pdf_pages, (pages,)),
+        workers=pool.workers,
+        max_chars=max_chars,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 25, 50], help="PDF page counts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="pool sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    pools = {n: ExtractionPool(workers=n, max_pages=NO_BUDGET, timeout=120) for n in args.workers}
+    widest = pools[max(args.workers)]
+    try:
+        # Start every worker before timing
+        warmup = make_resume_pdf(random.Random(0), max(args.workers) * 4)
+        for pool in pools.values():
+            _pooled(pool, warmup, NO_BUDGET)
+
+        header = f"{'pages':>5} {'KB':>6} {'serial ms':>10}"
+        header += "".join(f" {f'pool x{n} ms':>12}" for n in args.workers)
+        print(header + f" {'budget ms':>10} {'budget chars':>13} {'cached ms':>10}")
+
+        mismatches = 0
+        for page_count in args.pages:
+            data = make_resume_pdf(random.Random(page_count), page_count)
+            serial_ms, serial_text = _ms(lambda: extract_text_from_file(io.BytesIO(data), "resume.pdf"), args.repeat)
+            row = f"{page_count:>5} {len(data) // 1024:>6} {serial_ms:>10.1f}"
+
+            for n, pool in pools.items():
+                pool_ms, text = _ms(lambda: _pooled(pool, data, NO_BUDGET), args.repeat)
+                mismatches += text != serial_text
+                row += f" {pool_ms:>12.1f}"
+
+            budget_ms, budget_text = _ms(lambda: _pooled(widest, data, RESUME_EXTRACT_MAX_CHARS), args.repeat)
+            cached_ms, _ = _ms(lambda: _pooled(widest, data, RESUME_EXTRACT_MAX_CHARS, cached=True), args.repeat)
+            print(row + f" {budget_ms:>10.1f} {len(budget_text):>13} {cached_ms:>10.2f}")
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+
+    if mismatches:
+        print(f"\n{mismatches} case(s) produced different text than serial extraction")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
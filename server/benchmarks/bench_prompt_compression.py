@@ -0,0 +1,71 @@
+"""
+Benchmark: prompt compression stage.
+
+Measures estimated prompt tokens before/after compress_prompt_inputs and the
+time the stage itself costs, for postings of increasing size.
+
+Run from the server directory:
+    python -m benchmarks.bench_prompt_compression
+    python -m benchmarks.bench_prompt_compression --live   # also time model calls
+
+--live uses the configured LLM backend. To see the latency effect offline,
+use the fake backend with a prefill cost, e.g.
+    LLM_BACKEND=fake FAKE_LLM_LATENCY_MS=800 FAKE_LLM_MS_PER_1K_PROMPT_TOKENS=150 \
+        python -m benchmarks.bench_prompt_compression --live
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.corpus import make_posting_text, make_resume_text
+from utils.prompt_compressor import compress_prompt_inputs
+
+SAMPLE_USER_INFO = {
+    "name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "city": "Toronto",
+    "postal_code": "M5V",
+    "country": "Canada",
+}
+
+
+def _time_generation(job_posting: str, resume: str) -> float:
+    from utils.cover_letter_generator import generate_cover_letter
+
+    start = time.perf_counter()
+    generate_cover_letter(user_info=SAMPLE_USER_INFO, job_posting=job_posting, resume=resume)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="time real generations with and without compression")
+    parser.add_argument("--repeat", type=int, default=20, help="compression runs per size")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    resume = make_resume_text(rng, jobs=8)
+
+    print(f"{'posting chars':>14} {'tokens before':>14} {'tokens after':>13} {'saved':>7} {'stage ms':>9}", end="")
+    print(f" {'llm s (raw)':>12} {'llm s (compr)':>14}" if args.live else "")
+
+    for paragraphs in (20, 80, 200, 500, 1000):
+        posting = make_posting_text(rng, paragraphs)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            job_out, resume_out, stats = compress_prompt_inputs(posting, resume)
+        stage_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        before, after = stats["total_before"], stats["total_after"]
+        line = f"{len(posting):>14} {before:>14} {after:>13} {1 - after / before:>6.0%} {stage_ms:>9.2f}"
+        if args.live:
+            raw_s = _time_generation(posting, resume)
+            compressed_s = _time_generation(job_out, resume_out)
+            line += f" {raw_s:>12.2f} {compressed_s:>14.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: HTML-to-text cleaning of job postings.
+
+Compares the single-pass trim_html with the previous bleach + BeautifulSoup +
+regex pipeline (trim_html_legacy) on postings shaped like each supported
+job board, and checks that both produce exactly the same text.
+
+Run from the server directory:
+    python -m benchmarks.bench_trim_html
+    python -m benchmarks.bench_trim_html --sizes 50 500 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+import warnings
+
+from benchmarks.corpus import make_posting_html
+from utils.job_cleaner import trim_html, trim_html_legacy
+
+SITES = ["generic", "linkedin", "indeed", "workday", "greenhouse", "lever"]
+
+
+def _measure(fn, html: str, repeat: int) -> tuple[float, float, str]:
+    """Return (mean ms, peak MiB allocated during one call, output)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(html)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / (1024 * 1024), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 300, 1000], help="posting sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per posting")
+    args = parser.parse_args()
+
+    # BeautifulSoup warns about short inputs that look like file names
+    warnings.filterwarnings("ignore", module="bs4")
+
+    print(f"{'site':>10} {'KB':>5} {'legacy ms':>10} {'new ms':>8} {'speedup':>8} "
+          f"{'legacy MiB':>11} {'new MiB':>8} {'same':>5}")
+
+    mismatches = 0
+    for site in SITES:
+        for kb in args.sizes:
+            html = make_posting_html(random.Random(kb), kb, site)
+            legacy_ms, legacy_mib, legacy_out = _measure(trim_html_legacy, html, args.repeat)
+            new_ms, new_mib, new_out = _measure(trim_html, html, args.repeat)
+
+            same = legacy_out == new_out
+            mismatches += not same
+            print(f"{site:>10} {kb:>5} {legacy_ms:>10.1f} {new_ms:>8.1f} {legacy_ms / new_ms:>7.1f}x "
+                  f"{legacy_mib:>11.1f} {new_mib:>8.1f} {'yes' if same else 'NO':>5}")
+
+    if mismatches:
+        print(f"\n{mismatches} posting(s) produced different text")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Synthetic job posting and resume shapes for the benchmark scripts.
+Sizes and structure mimic what the extension sends from real job boards:
+long descriptions with legal/benefits boilerplate, page chrome, repeated
+blocks, inline scripts and styles.
+"""
+
+import random
+
+SKILLS = [
+    "Python", "Flask", "Django", "FastAPI", "MongoDB", "PostgreSQL", "Redis", "Docker",
+    "Kubernetes", "AWS", "GCP", "React", "TypeScript", "GraphQL", "REST APIs", "CI/CD",
+    "Terraform", "Kafka", "Spark", "Airflow", "pytest", "Linux", "Git", "Celery",
+]
+
+RESPONSIBILITIES = [
+    "Design, build and maintain backend services that power our {product} platform.",
+    "Collaborate with product managers and designers to ship features used by {users} customers.",
+    "Write clean, well-tested code in {skill} and review pull requests from teammates.",
+    "Own the reliability of {skill}-based services, including monitoring and on-call rotations.",
+    "Improve the performance of data pipelines that process {users} events per day.",
+    "Mentor junior engineers and contribute to our engineering culture.",
+    "Partner with data science to productionize machine learning models using {skill}.",
+]
+
+REQUIREMENTS = [
+    "{n}+ years of professional experience with {skill}.",
+    "Hands-on experience with {skill} and {skill2} in production environments.",
+    "Solid understanding of distributed systems, caching and database indexing.",
+    "Bachelor's degree in Computer Science or equivalent practical experience.",
+    "Excellent written and verbal communication skills.",
+]
+
+BOILERPLATE = [
+    "We are an equal opportunity employer and all qualified applicants will receive consideration for employment without regard to race, color, religion, sex, sexual orientation, gender identity, national origin, disability or veteran status.",
+    "We provide reasonable accommodations to individuals with disabilities during the application process.",
+    "Our benefits include medical, dental and vision insurance, a 401(k) with company match, and paid time off.",
+    "This employer participates in E-Verify.",
+    "We use cookies to improve your experience. By continuing you agree to our Cookie Policy.",
+    "Accept all cookies",
+    "Privacy Policy | Terms of Use",
+    "Sign in to save this job.",
+    "Share this job on LinkedIn.",
+    "Similar jobs you may be interested in.",
+    "Report this job",
+]
+
+
+def make_posting_text(rng: random.Random, paragraphs: int = 12) -> str:
+    """Plain-text posting: responsibilities, requirements and boilerplate."""
+    parts = []
+    for _ in range(paragraphs):
+        template = rng.choice(RESPONSIBILITIES + REQUIREMENTS)
+        parts.append(template.format(
+            product=rng.choice(["payments", "hiring", "analytics", "logistics"]),
+            users=rng.choice(["10,000", "2 million", "500"]),
+            skill=rng.choice(SKILLS),
+            skill2=rng.choice(SKILLS),
+            n=rng.randint(2, 8),
+        ))
+        if rng.random() < 0.35:
+            parts.append(rng.choice(BOILERPLATE))
+    return " ".join(parts)
+
+
+def make_posting_html(rng: random.Random, kb: int = 50, site: str = "generic", description_kb: int = None) -> str:
+    """
+    HTML page of roughly `kb` kilobytes: nav, description, sidebar, footer,
+    scripts and styles, with the description repeated to reach the size.
+    With description_kb the description stops at that size and the rest of
+    the page is "similar jobs" listings, like a real job board page.
+    """
+    head = (
+        "<html><head><title>Software Engineer</title>"
+        "<style>.job{color:#333}.nav a{margin:0 4px}</style>"
+        "<script>window.__STATE__ = {\"jobId\": 123, \"tracking\": true};</script>"
+        "</head><body>"
+        "<nav class='nav'><a href='/'>Home</a><a href='/jobs'>Jobs</a><a href='/login'>Sign in</a></nav>"
+        "<div class='cookie-banner'>We use cookies to improve your experience. <button>Accept all cookies</button></div>"
+    )
+    similar = 15
+    if description_kb is not None:
+        # ~50 bytes per listing
+        similar = max(similar, (kb - description_kb) * 1024 // 50)
+    sidebar = "<aside class='similar-jobs'><h3>Similar jobs</h3><ul>" + "".join(
+        f"<li><a href='/jobs/{i}'>Engineer {i}</a> <span>Remote</span></li>" for i in range(similar)
+    ) + "</ul></aside>"
+    footer = "<footer><p>Privacy Policy | Terms of Use</p><p>&copy; 2025 Example Corp</p></footer>"
+
+    blocks = []
+    size = len(head) + len(sidebar) + len(footer)
+    target = kb * 1024 if description_kb is None else size + description_kb * 1024
+    while size < target:
+        block = (
+            f"<div class='section'><h2>{rng.choice(['About the role', 'Responsibilities', 'Requirements', 'Benefits'])}</h2>"
+            f"<p style='margin:0'>{make_posting_text(rng, 4)}</p>"
+            "<ul>" + "".join(f"<li><b>{rng.choice(SKILLS)}</b> &amp; {rng.choice(SKILLS)}</li>" for _ in range(4)) + "</ul>"
+            "</div>"
+        )
+        blocks.append(block)
+        size += len(block)
+
+    description = "".join(blocks)
+    if site == "linkedin":
+        description = f"<div class='show-more-less-html__markup'>{description}</div>"
+    elif site == "indeed":
+        description = f"<div id='jobDescriptionText'>{description}</div>"
+    elif site == "workday":
+        description = f"<div data-automation-id='jobPostingDescription'>{description}</div>"
+    elif site == "greenhouse":
+        description = f"<div id='content'>{description}</div>"
+    elif site == "lever":
+        description = f"<div data-qa='job-description'>{description}</div>"
+    else:
+        description = f"<main>{description}</main>"
+
+    return head + description + sidebar + footer + "</body></html>"
+
+
+def make_resume_text(rng: random.Random, jobs: int = 6) -> str:
+    """Multi-section resume with a header, skills, experience, projects and education."""
+    lines = [
+        "Jane Doe",
+        "Toronto, ON | jane.doe@example.com | linkedin.com/in/janedoe",
+        "SUMMARY",
+        "Backend developer focused on reliable APIs and data-heavy products.",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 12)),
+        "EXPERIENCE",
+    ]
+    for i in range(jobs):
+        lines.append(f"Software Engineer, Company {i} ({2015 + i} - {2016 + i})")
+        for _ in range(5):
+            lines.append("- " + rng.choice(RESPONSIBILITIES).format(
+                product="internal", users="1,000", skill=rng.choice(SKILLS), skill2="", n=3
+            ))
+    lines.append("PROJECTS")
+    for i in range(4):
+        lines.append(f"Project {i}: built a {rng.choice(SKILLS)} service with {rng.choice(SKILLS)}.")
+    lines.extend([
+        "VOLUNTEER",
+        "Organized community coding workshops for high school students.",
+        "INTERESTS",
+        "Hiking, chess, photography.",
+        "EDUCATION",
+        "BSc Computer Science, University of Toronto",
+    ])
+    return "\n".join(lines)
+
+
+def make_resume_pdf(rng: random.Random, pages: int = 2, lines_per_page: int = 40) -> bytes:
+    """
+    Text PDF of `pages` pages of resume-like lines (Helvetica, one text
+    object per page), valid enough for PyPDF2's text extraction.
+    """
+    text = make_resume_text(rng, jobs=max(1, pages * lines_per_page // 6)).splitlines()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = [text[(page * lines_per_page + i) % len(text)] for i in range(lines_per_page)]
+        escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+        stream = ("BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({line}) '" for line in escaped) + " ET").encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,113 @@
+"""
+Load test: hammer a running server's generation endpoint and report
+throughput and latency percentiles. Start the server with the fake backend
+to measure worker saturation without calling (or paying for) Gemini:
+
+    LLM_BACKEND=fake FAKE_LLM_LATENCY_MS=3000 FAKE_LLM_LATENCY_DISTRIBUTION=lognormal \\
+        gunicorn app:app -w 2 --worker-class gthread --threads 8 -b 0.0.0.0:5000
+
+Then, from the server directory:
+    python -m benchmarks.load_generate --token <JWT> --concurrency 32 --requests 200
+
+Add --probe /api/health to measure how a cheap endpoint behaves while the
+generation load is running.
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.corpus import make_posting_html
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(label, latencies, statuses, elapsed):
+    ok = sum(1 for s in statuses if 200 <= s < 300)
+    print(f"\n{label}")
+    print(f"  requests: {len(statuses)}  ok: {ok}  non-2xx: {len(statuses) - ok}  "
+          f"throughput: {len(statuses) / elapsed:.2f} req/s")
+    if latencies:
+        print(f"  latency s  p50: {_percentile(latencies, 50):.3f}  p95: {_percentile(latencies, 95):.3f}  "
+              f"p99: {_percentile(latencies, 99):.3f}  mean: {statistics.mean(latencies):.3f}")
+    counts = {}
+    for s in statuses:
+        counts[s] = counts.get(s, 0) + 1
+    print(f"  status codes: {dict(sorted(counts.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--token", required=True, help="JWT for a user with an uploaded resume")
+    parser.add_argument("--endpoint", default="/api/cover-letter")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--posting-kb", type=int, default=20)
+    parser.add_argument("--probe", help="cheap endpoint to poll during the run, e.g. /api/health")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    headers = {"Authorization": f"Bearer {args.token}"}
+    postings = [make_posting_html(rng, kb=args.posting_kb) for _ in range(10)]
+
+    def one(i):
+        body = {
+            "jobDescription": postings[i % len(postings)],
+            "url": f"https://example.com/jobs/{i}",
+            # Unique prompt so the cover letter cache does not short-circuit the run
+            "userPrompt": f"load-test {i}",
+        }
+        start = time.perf_counter()
+        try:
+            status = requests.post(args.url + args.endpoint, json=body, headers=headers, timeout=600).status_code
+        except requests.RequestException:
+            status = 0
+        return time.perf_counter() - start, status
+
+    probe_latencies, probe_statuses = [], []
+    done = threading.Event()
+
+    def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                status = requests.get(args.url + args.probe, headers=headers, timeout=60).status_code
+            except requests.RequestException:
+                status = 0
+            probe_latencies.append(time.perf_counter() - start)
+            probe_statuses.append(status)
+            time.sleep(0.2)
+
+    probe_thread = None
+    if args.probe:
+        probe_thread = threading.Thread(target=probe, daemon=True)
+        probe_thread.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    if probe_thread:
+        probe_thread.join()
+
+    _summarize(f"{args.endpoint} (concurrency {args.concurrency})",
+               [r[0] for r in results], [r[1] for r in results], elapsed)
+    if args.probe:
+        _summarize(f"{args.probe} (probe during load)", probe_latencies, probe_statuses, elapsed)
+
+
+if __name__ == "__main__":
+    main()
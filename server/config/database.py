@@ -1,59 +1,132 @@
 from pymongo import MongoClient
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+import importlib.util
 import os
+import threading
 from dotenv import load_dotenv
 from typing import Optional
 
 # Load environment variables from .env file
 load_dotenv()
 
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+DB_NAME = 'jobmate_db'
+
+# Connection pool (per server process) and timeouts; unset = PyMongo default
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_MAX_IDLE_TIME_MS = os.getenv('MONGO_MAX_IDLE_TIME_MS')
+MONGO_WAIT_QUEUE_TIMEOUT_MS = os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS')
+MONGO_CONNECT_TIMEOUT_MS = os.getenv('MONGO_CONNECT_TIMEOUT_MS')
+MONGO_SOCKET_TIMEOUT_MS = os.getenv('MONGO_SOCKET_TIMEOUT_MS')
+MONGO_SERVER_SELECTION_TIMEOUT_MS = os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS')
+
+# Wire compression in order of preference, e.g. "zstd,snappy,zlib"
+# (zstd needs the zstandard package, snappy needs python-snappy)
+MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', '')
+
+# e.g. "majority" / "local"; write concern "majority" or a number of nodes
+MONGO_READ_CONCERN = os.getenv('MONGO_READ_CONCERN')
+MONGO_WRITE_CONCERN = os.getenv('MONGO_WRITE_CONCERN')
+
+# Python module each compressor needs (zlib is built in)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def client_options() -> dict:
+    """MongoClient keyword arguments from the MONGO_* environment variables."""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+    }
+    for name, value in (
+        ("maxIdleTimeMS", MONGO_MAX_IDLE_TIME_MS),
+        ("waitQueueTimeoutMS", MONGO_WAIT_QUEUE_TIMEOUT_MS),
+        ("connectTimeoutMS", MONGO_CONNECT_TIMEOUT_MS),
+        ("socketTimeoutMS", MONGO_SOCKET_TIMEOUT_MS),
+        ("serverSelectionTimeoutMS", MONGO_SERVER_SELECTION_TIMEOUT_MS),
+    ):
+        if value:
+            options[name] = int(value)
+
+    compressors = []
+    for name in (c.strip().lower() for c in MONGO_COMPRESSORS.split(",") if c.strip()):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module):
+            compressors.append(name)
+        else:
+            print(f"MongoDB compressor '{name}' is not available, skipping it")
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+
+def database_options() -> dict:
+    """Read/write concern keyword arguments for MongoClient.get_database."""
+    options = {}
+    if MONGO_READ_CONCERN:
+        options["read_concern"] = ReadConcern(MONGO_READ_CONCERN)
+    if MONGO_WRITE_CONCERN:
+        w = MONGO_WRITE_CONCERN
+        options["write_concern"] = WriteConcern(w=int(w) if w.isdigit() else w)
+    return options
+
+
 class Database:
     # Singleton instance variables
     _instance = None
     _client = None
     _db = None
+    # Process that created the client: a forked worker (e.g. gunicorn
+    # --preload) must not reuse its parent's connections
+    _pid = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         # Ensure only one instance of Database is created
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
-            cls._initialize()
         return cls._instance
 
     @classmethod
     def _initialize(cls):
-        # Load MongoDB connection details
-        MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
-        DB_NAME = 'jobmate_db'
-        
-        try:
-            # Connect to MongoDB using the provided URI
-            cls._client = MongoClient(MONGO_URI)
-            cls._db = cls._client[DB_NAME]
-
-            # Test connection by pinging the server
-            cls._client.admin.command('ping')
-            print("Successfully connected to MongoDB!")
-        except Exception as e:
-            # Log and raise error if connection fails
-            print(f"Error connecting to MongoDB: {e}")
-            raise
+        from utils.metrics import MongoPoolMetrics
+
+        # MongoClient connects in the background, so this never blocks on the
+        # network; the first query waits for server selection instead
+        options = client_options()
+        cls._client = MongoClient(
+            MONGO_URI,
+            event_listeners=[MongoPoolMetrics(options["maxPoolSize"])],
+            **options,
+        )
+        cls._db = cls._client.get_database(DB_NAME, **database_options())
+        cls._pid = os.getpid()
 
     @classmethod
     def get_db(cls):
-        # Return database instance (initialize if not already connected)
-        if cls._db is None:
-            cls._initialize()
+        # Return database instance (created on first use in each process)
+        if cls._db is None or cls._pid != os.getpid():
+            with cls._lock:
+                if cls._db is None or cls._pid != os.getpid():
+                    cls._initialize()
         return cls._db
 
     @classmethod
     def close_connection(cls):
-        # Close MongoDB client connection safely
-        if cls._client:
-            cls._client.close()
+        # Close MongoDB client connection safely (only the one this process created)
+        with cls._lock:
+            if cls._client and cls._pid == os.getpid():
+                cls._client.close()
             cls._client = None
             cls._db = None
+            cls._pid = None
+
+# A lock held by another thread at fork time would never be released in the child
+os.register_at_fork(after_in_child=lambda: setattr(Database, "_lock", threading.Lock()))
 
-# Create a global database instance
+# Create a global database instance (no connection until get_db is called)
 db_instance = Database()
 
 def get_db():
@@ -0,0 +1,351 @@
+"""
+Schema migrations: versioned, idempotent changes to the MongoDB schema
+(indexes first of all). Applied versions are recorded in the
+`schema_migrations` collection, so each one runs once per database.
+
+Migrations run once when gunicorn starts, in the master process before any
+worker is forked (unless MIGRATE_ON_STARTUP=false), or from the CLI:
+    python -m config.migrations status    # applied and pending versions
+    python -m config.migrations migrate   # apply pending versions
+    python -m config.migrations verify    # explain the hot queries, check they use an index
+
+A run holds a lease document in `schema_migrations`, so two processes (say
+two instances deploying at once) never apply migrations at the same time.
+The lease is renewed before each migration and taken over once it expires
+(a holder that died), so MIGRATION_LOCK_SECONDS must outlast the slowest
+single migration.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "true").lower() == "true"
+MIGRATIONS_COLLECTION = "schema_migrations"
+MIGRATION_LOCK_ID = "lock"
+MIGRATION_LOCK_SECONDS = int(os.getenv("MIGRATION_LOCK_SECONDS", "900"))
+
+# (version, description, function), in version order
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    """Register a migration function. Versions must be added in increasing order."""
+    def register(func):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, "migration versions must increase"
+        MIGRATIONS.append((version, description, func))
+        return func
+    return register
+
+
+# -------------------------------
+# Migrations
+# -------------------------------
+@migration(1, "Indexes for per-user queries, content hashes and TTL collections")
+def _initial_indexes(db):
+    from utils.cover_letter_cache import CACHE_COLLECTION
+    from utils.pdf_extraction import PDF_PAGE_CACHE_COLLECTION, PDF_PAGE_CACHE_TTL_SECONDS
+    from utils.rate_limiter import RATE_LIMIT_COLLECTION
+
+    # Job history list (newest first) and the per-URL lookup on save. Items
+    # without a URL are never merged, so only string URLs must be unique.
+    db.job_history.create_index([("user_id", ASCENDING), ("created_at", DESCENDING)])
+    _merge_duplicate_history(db)
+    db.job_history.create_index(
+        [("user_id", ASCENDING), ("url", ASCENDING)],
+        unique=True,
+        partialFilterExpression={"url": {"$type": "string"}},
+    )
+
+    # Letter versions per history item
+    db.cover_letters.create_index([("history_id", ASCENDING), ("version", ASCENDING)])
+
+    db.users.create_index("google_id", unique=True, sparse=True)
+
+    db.user_resume.create_index("user_id")
+    db.user_resume.create_index("content_hash")
+    db.user_resume.create_index("resume_file")
+
+    # Let MongoDB expire old cache and rate limit entries on its own
+    db[CACHE_COLLECTION].create_index("expires_at", expireAfterSeconds=0)
+    db[RATE_LIMIT_COLLECTION].create_index("expires_at", expireAfterSeconds=0)
+    db[PDF_PAGE_CACHE_COLLECTION].create_index("updated_at", expireAfterSeconds=PDF_PAGE_CACHE_TTL_SECONDS)
+
+
+def _merge_duplicate_history(db):
+    """
+    Concurrent saves could create two history items for the same user + URL.
+    Keep the oldest, move the other items' letters onto it and renumber them.
+    """
+    groups = db.job_history.aggregate([
+        {"$match": {"url": {"$type": "string"}}},
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {"_id": {"user_id": "$user_id", "url": "$url"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ], allowDiskUse=True)
+
+    for group in groups:
+        keep, duplicates = group["ids"][0], group["ids"][1:]
+        db.cover_letters.update_many({"history_id": {"$in": duplicates}}, {"$set": {"history_id": keep}})
+        db.job_history.delete_many({"_id": {"$in": duplicates}})
+
+        letters = db.cover_letters.find({"history_id": keep}, {"_id": 1}).sort([("created_at", 1), ("_id", 1)])
+        for version, letter in enumerate(letters, start=1):
+            db.cover_letters.update_one({"_id": letter["_id"]}, {"$set": {"version": version}})
+        print(f"Merged {len(duplicates)} duplicate history item(s) into {keep}")
+
+
+@migration(2, "Backfill job_history.letter_count from existing letter versions")
+def _backfill_letter_count(db):
+    # save_generation takes the next version from an atomic $inc of
+    # letter_count, so it must start at the highest version already stored.
+    # Saves seed an item themselves if they reach it first; this does the rest.
+    ops = [
+        UpdateOne({"_id": row["_id"], "letter_count": {"$exists": False}}, {"$set": {"letter_count": row["count"]}})
+        for row in db.cover_letters.aggregate([
+            {"$group": {"_id": "$history_id", "count": {"$max": "$version"}}},
+        ], allowDiskUse=True)
+        if row["_id"] is not None
+    ]
+    for start in range(0, len(ops), 1000):
+        db.job_history.bulk_write(ops[start:start + 1000], ordered=False)
+    db.job_history.update_many({"letter_count": {"$exists": False}}, {"$set": {"letter_count": 0}})
+
+
+@migration(3, "Listing indexes that cover the keyset pagination sort keys")
+def _pagination_indexes(db):
+    # Pages continue after (created_at, _id) / (version, _id); with _id in the
+    # index the sort needs no in-memory stage. The old indexes are prefixes.
+    db.job_history.create_index([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)])
+    db.cover_letters.create_index([("history_id", ASCENDING), ("version", ASCENDING), ("_id", ASCENDING)])
+    for collection, name in (("job_history", "user_id_1_created_at_-1"), ("cover_letters", "history_id_1_version_1")):
+        if name in db[collection].index_information():
+            db[collection].drop_index(name)
+
+
+@migration(4, "Materialized unique_jobs view for the job board")
+def _unique_jobs_view(db):
+    from utils.unique_jobs import UNIQUE_JOBS_COLLECTION, rebuild_unique_jobs
+
+    # $out replaces the collection but keeps its indexes, so build it first
+    rebuild_unique_jobs(db)
+    db[UNIQUE_JOBS_COLLECTION].create_index([("last_seen", DESCENDING), ("_id", DESCENDING)])
+
+
+@migration(5, "TTL index that deletes old generation jobs")
+def _generation_job_ttl(db):
+    from utils.generation_jobs import JOB_TTL_SECONDS, JOBS_COLLECTION
+
+    db[JOBS_COLLECTION].create_index("created_at", expireAfterSeconds=JOB_TTL_SECONDS)
+
+
+@migration(6, "Reference counts for resume files shared by identical uploads")
+def _resume_blob_refs(db):
+    from utils.resume_store import RESUME_BLOBS_COLLECTION
+
+    # Files uploaded before the counts existed. An upload that stored a new
+    # file meanwhile already has its count, so only missing ones are added.
+    ops = [
+        UpdateOne({"_id": row["_id"]}, {"$setOnInsert": {"refs": row["refs"]}}, upsert=True)
+        for row in db.user_resume.aggregate([
+            {"$match": {"resume_file": {"$ne": None}}},
+            {"$group": {"_id": "$resume_file", "refs": {"$sum": 1}}},
+        ], allowDiskUse=True)
+    ]
+    for start in range(0, len(ops), 1000):
+        db[RESUME_BLOBS_COLLECTION].bulk_write(ops[start:start + 1000], ordered=False)
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+class MigrationLocked(Exception):
+    """Another process holds the migration lease."""
+
+
+@contextmanager
+def migration_lock(db, lease_seconds: int = MIGRATION_LOCK_SECONDS):
+    """
+    Hold the migration lease for the duration of the block. Yields a function
+    that renews it; renewing raises MigrationLocked if another process has
+    taken the lease over in the meantime.
+
+    Raises:
+        MigrationLocked: another process holds an unexpired lease
+    """
+    collection = db[MIGRATIONS_COLLECTION]
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def renew():
+        now = datetime.utcnow()
+        try:
+            # Matches our own lease or an expired one; otherwise the upsert
+            # collides with the holder's document
+            collection.update_one(
+                {"_id": MIGRATION_LOCK_ID, "$or": [{"owner": owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=lease_seconds)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            raise MigrationLocked("Another process is applying schema migrations")
+
+    renew()
+    try:
+        yield renew
+    finally:
+        collection.delete_one({"_id": MIGRATION_LOCK_ID, "owner": owner})
+
+
+def applied_versions(db) -> set[int]:
+    return {doc["_id"] for doc in db[MIGRATIONS_COLLECTION].find({"_id": {"$ne": MIGRATION_LOCK_ID}}, {"_id": 1})}
+
+
+def current_version(db) -> int:
+    """Highest applied schema version (0 for a new database)."""
+    return max(applied_versions(db), default=0)
+
+
+def migrate(db, target: int | None = None) -> list[int]:
+    """
+    Apply every pending migration up to `target` (default: all), in order,
+    under the migration lease. A failing migration stops the run and is not
+    recorded, so it is retried next time.
+
+    Returns:
+        list[int]: Versions applied by this call
+
+    Raises:
+        MigrationLocked: another process is migrating
+    """
+    applied = []
+    with migration_lock(db) as renew:
+        # Read under the lease: the previous holder may have just finished
+        done = applied_versions(db)
+        for version, description, func in MIGRATIONS:
+            if version in done or (target is not None and version > target):
+                continue
+            renew()
+            start = time.perf_counter()
+            func(db)
+            try:
+                db[MIGRATIONS_COLLECTION].insert_one({
+                    "_id": version,
+                    "description": description,
+                    "applied_at": datetime.utcnow(),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                })
+            except DuplicateKeyError:
+                # Our lease ran out mid-migration and the next holder applied it too
+                pass
+            applied.append(version)
+            print(f"Applied schema migration {version}: {description}")
+    return applied
+
+
+def run_startup_migrations() -> None:
+    """
+    Migrate on server startup (gunicorn's on_starting hook, or app.py run
+    directly). Failures are logged; the server still starts.
+    """
+    if not MIGRATE_ON_STARTUP:
+        return
+    try:
+        from config.database import get_db
+        migrate(get_db())
+    except MigrationLocked:
+        print("Schema migrations are being applied by another process; skipping")
+    except Exception as e:
+        print(f"Schema migration failed: {e}")
+
+
+# -------------------------------
+# Query plan verification
+# -------------------------------
+# (name, collection, filter, sort) for the queries on the request path
+_ID = ObjectId()
+HOT_QUERIES = [
+    ("history page", "job_history", {"user_id": _ID}, [("created_at", -1), ("_id", -1)]),
+    ("history by url", "job_history", {"user_id": _ID, "url": "https://example.com/job"}, None),
+    ("letters page", "cover_letters", {"history_id": _ID, "user_id": _ID}, [("version", 1), ("_id", 1)]),
+    ("letter by version", "cover_letters", {"history_id": _ID, "user_id": _ID, "version": 1}, None),
+    ("user by google id", "users", {"google_id": "0"}, None),
+    ("resume by user", "user_resume", {"user_id": _ID}, [("_id", -1)]),
+    ("resume by content hash", "user_resume", {"content_hash": "0"}, None),
+    ("resume file references", "user_resume", {"resume_file": _ID}, None),
+    ("unique jobs page", "unique_jobs", {}, [("last_seen", -1), ("_id", -1)]),
+]
+
+
+def verify_indexes(db) -> list[dict]:
+    """
+    Explain each hot query and report the winning plan.
+
+    Returns:
+        list[dict]: {"query", "collection", "plan", "ok"} per query, where
+        plan is e.g. "IXSCAN user_id_1_created_at_-1__id_-1" or "COLLSCAN"
+    """
+    report = []
+    for name, collection, query, sort in HOT_QUERIES:
+        command = {"find": collection, "filter": query, "limit": 1}
+        if sort:
+            command["sort"] = dict(sort)
+        explained = db.command("explain", command, verbosity="queryPlanner")
+        stages = list(_plan_stages(explained["queryPlanner"]["winningPlan"]))
+        indexes = [stage["indexName"] for stage in stages if stage.get("stage") == "IXSCAN"]
+        report.append({
+            "query": name,
+            "collection": collection,
+            "plan": f"IXSCAN {', '.join(indexes)}" if indexes else " > ".join(s["stage"] for s in stages),
+            "ok": bool(indexes) or any(stage.get("stage") == "IDHACK" for stage in stages),
+        })
+    return report
+
+
+def _plan_stages(plan: dict):
+    # Slot-based engine plans wrap the classic plan tree
+    plan = plan.get("queryPlan", plan)
+    yield plan
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            yield from _plan_stages(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["status", "migrate", "verify"])
+    parser.add_argument("--target", type=int, help="migrate: stop at this version")
+    args = parser.parse_args()
+
+    from config.database import get_db
+    db = get_db()
+
+    if args.command == "migrate":
+        try:
+            applied = migrate(db, args.target)
+        except MigrationLocked as e:
+            sys.exit(f"{e}; try again once it has finished")
+        print(f"Schema version {current_version(db)} ({len(applied)} migration(s) applied)")
+    elif args.command == "status":
+        done = applied_versions(db)
+        for version, description, _ in MIGRATIONS:
+            print(f"{version:>4}  {'applied' if version in done else 'pending':<8} {description}")
+        print(f"Schema version {current_version(db)}")
+    else:
+        report = verify_indexes(db)
+        for row in report:
+            print(f"{'ok ' if row['ok'] else 'BAD'}  {row['collection']:<14} {row['query']:<24} {row['plan']}")
+        if not all(row["ok"] for row in report):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
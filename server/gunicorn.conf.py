@@ -0,0 +1,45 @@
+"""
+Gunicorn settings (used by the Dockerfile: gunicorn -c gunicorn.conf.py app:app).
+
+Prometheus metrics run in multiprocess mode: every worker writes its samples
+to PROMETHEUS_MULTIPROC_DIR and /metrics merges them, so any worker can
+answer a scrape with totals for the whole server.
+
+Schema migrations run here, once in the master before any worker starts, so
+workers import the app without touching the database.
+"""
+
+import glob
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = 200
+
+# Must be set before workers import prometheus_client
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    from config.database import Database
+    from config.migrations import run_startup_migrations
+
+    run_startup_migrations()
+    # Workers open their own connections; don't fork this one
+    Database.close_connection()
+
+    # Samples left over from a previous run (or written by the migrations
+    # above) would be added to the new totals
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight counts)
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,60 +1,110 @@
-from flask import jsonify, request
-from utils.job_cleaner import trim_html
+from flask import jsonify, request, Response, stream_with_context
+from utils.job_postings import get_or_clean_job_posting
 from utils.jwt_utils import validate_token
 from utils.cover_letter_generator import (
-    generate_cover_letter,
+    MAX_JOB_POSTING_CHARS,
+    stream_cover_letter,
     validate_inputs,
-    get_supported_tones
+    get_supported_tones,
+    clean_response
 )
+from utils.cover_letter_cache import (
+    make_cache_key,
+    get_cached_cover_letter,
+    store_cover_letter,
+    get_cache_stats
+)
+from utils.generation_jobs import (
+    generation_args,
+    run_generation,
+    run_generation_batch,
+    record_generation,
+    enqueue_generation_job,
+    get_generation_job
+)
+from utils.prompt_compressor import compress_prompt_inputs
+from utils.resume_digest import DIGEST_VERSION, build_resume_digest
+from utils.resume_processing import FAILED, PENDING, PROCESSING, resume_status
+from utils.llm_client import LLMUnavailableError, LLMTimeoutError
+from utils.rate_limiter import check_rate_limit, max_rate_limit_cost
+from utils.metrics import timed_stage
 from config.database import get_db
 from bson.objectid import ObjectId
-from datetime import datetime
-import os, re
+import json
+import math
+import os
 
 JWT_SECRET = os.getenv("JWT_SECRET", "your-256-bit-secret")
 JWT_ALGORITHM = "HS256"
+# Maximum number of postings accepted by /api/cover-letter/batch
+BATCH_MAX_POSTINGS = int(os.getenv("BATCH_MAX_POSTINGS", "20"))
+# Largest request body read by the generation endpoints, checked before any
+# JSON or HTML parsing. Batches have their own, not per-posting, limit: the
+# whole body is held in memory and parsed at once.
+COVER_LETTER_MAX_BODY_BYTES = int(os.getenv("COVER_LETTER_MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+BATCH_MAX_BODY_BYTES = int(os.getenv("BATCH_MAX_BODY_BYTES", str(4 * 1024 * 1024)))
+# What to do with a posting whose cleaned text is over MAX_JOB_POSTING_CHARS:
+# "reject" (400) or "truncate" (keep the first MAX_JOB_POSTING_CHARS characters).
+# A request can ask for truncation itself with "truncateJobDescription": true.
+JOB_DESCRIPTION_OVERFLOW = os.getenv("JOB_DESCRIPTION_OVERFLOW", "reject").lower()
 __all__ = ["validate_token", "JWT_SECRET", "JWT_ALGORITHM"]
 
 
 def init_cover_letter_routes(app):
 
-    @app.route("/api/cover-letter", methods=["POST"])
-    def cover_letter():
-        """
-        Generate a cover letter using Gemini AI based on job posting and user's resume.
-        """
-        db = get_db()
-
-        # ---------------- AUTH ----------------
+    # Get current user id from Authorization header
+    def _authenticate():
         try:
             token = request.headers.get("Authorization")
             if not token:
-                return jsonify({"error": "Missing authorization token"}), 401
+                return None, ("Missing authorization token", 401)
 
-            auth_token = validate_token(token.removeprefix("Bearer ").strip())
-            user_id = auth_token["id"]
+            with timed_stage("validate_token"):
+                auth_token = validate_token(token.removeprefix("Bearer ").strip())
+            return auth_token["id"], None
         except Exception as e:
-            return jsonify({"error": f"Authentication failed: {str(e)}"}), 401
+            return None, (f"Authentication failed: {str(e)}", 401)
 
-        # ---------------- INPUT VALIDATION ----------------
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+    # Per-user and global generation limits ("batch" scope for batches).
+    # Returns a 429 response, or None if the request may proceed.
+    def _rate_limited(db, user_id, cost=1, scope="user"):
+        with timed_stage("rate_limit"):
+            retry_after = check_rate_limit(db, user_id, cost, scope)
+        if retry_after is None:
+            return None
+        retry_after = max(1, math.ceil(retry_after))
+        return jsonify({
+            "error": "Too many cover letter requests. Please slow down and try again shortly.",
+            "retryAfter": retry_after,
+        }), 429, {"Retry-After": str(retry_after)}
 
-        raw_description = data.get("jobDescription")
-        if not raw_description:
-            return jsonify({"error": "Missing jobDescription field"}), 400
+    # Read and parse the JSON body without ever holding more than max_bytes
+    # of it (the Content-Length header can be missing or wrong).
+    # Returns (data, error).
+    def _read_json_body(max_bytes=COVER_LETTER_MAX_BODY_BYTES):
+        too_large = (f"Request body is too large. Maximum is {max_bytes // 1024} KB.", 413)
+        if request.content_length is not None and request.content_length > max_bytes:
+            return None, too_large
+
+        body = request.stream.read(max_bytes + 1)
+        if len(body) > max_bytes:
+            return None, too_large
+        if not body:
+            return None, None
 
         try:
-            clean_job_description = trim_html(raw_description)
-        except Exception as e:
-            return jsonify({"error": f"Failed to process job description: {str(e)}"}), 400
+            return json.loads(body), None
+        except ValueError:
+            return None, ("Request body must be valid JSON", 400)
 
-        # ---------------- FETCH USER & RESUME ----------------
+    # Load the user's profile fields, latest resume text and its digest.
+    # Returns ((user_info, resume_text, resume_digest), error).
+    def _load_user_and_resume(db, user_id):
         try:
-            user = db.users.find_one({"_id": ObjectId(user_id)})
+            with timed_stage("load_user"):
+                user = db.users.find_one({"_id": ObjectId(user_id)})
             if not user:
-                return jsonify({"error": "User not found"}), 404
+                return None, ("User not found", 404)
 
             user_info = {
                 "name": user.get("name"),
@@ -66,141 +116,441 @@ def init_cover_letter_routes(app):
 
             resume_id = user.get("latest_resume_id")
             if not resume_id:
-                return jsonify({
-                    "error": "No resume uploaded. Please upload your resume before generating a cover letter."
-                }), 400
+                return None, (
+                    "No resume uploaded. Please upload your resume before generating a cover letter.",
+                    400
+                )
 
-            resume_doc = db.user_resume.find_one({"_id": ObjectId(resume_id)})
-            if not resume_doc or "resume_text" not in resume_doc:
-                return jsonify({"error": "Resume text not found in database"}), 404
+            with timed_stage("load_resume"):
+                resume_doc = db.user_resume.find_one({"_id": ObjectId(resume_id)})
+            if not resume_doc:
+                return None, ("Resume text not found in database", 404)
 
-            resume_text = resume_doc["resume_text"]
+            # Uploaded resumes are read in the background (utils/resume_processing.py)
+            status, error = resume_status(resume_doc)
+            if status in (PENDING, PROCESSING):
+                return None, ("Your resume is still being processed. Please try again in a moment.", 409)
+            if status == FAILED:
+                return None, (error or "Your resume could not be read. Please upload it again.", 422)
+            if "resume_text" not in resume_doc:
+                return None, ("Resume text not found in database", 404)
+
+            # Resumes uploaded before digests existed (or with an older
+            # digest format) get one built now and saved for next time
+            resume_digest = resume_doc.get("resume_digest")
+            if not resume_digest or resume_digest.get("version") != DIGEST_VERSION:
+                with timed_stage("resume_digest"):
+                    resume_digest = build_resume_digest(resume_doc["resume_text"])
+                try:
+                    db.user_resume.update_one(
+                        {"_id": resume_doc["_id"]},
+                        {"$set": {"resume_digest": resume_digest}}
+                    )
+                except Exception as e:
+                    print(f"Failed to store resume digest: {e}")
+
+            return (user_info, resume_doc["resume_text"], resume_digest), None
 
         except Exception as e:
-            return jsonify({"error": f"Error fetching resume: {str(e)}"}), 500
+            return None, (f"Error fetching resume: {str(e)}", 500)
+
+    # Clean one posting (or reuse the shared cleaned copy) and validate it
+    # against the resume. Returns (generation context, error).
+    def _build_generation_context(db, data, user_info, resume_text, resume_digest):
+        raw_description = data.get("jobDescription")
+        if not raw_description:
+            return None, ("Missing jobDescription field", 400)
+
+        # Cleaning stops once the text budget is used up, so an oversized
+        # posting costs no more than a maximum-length one
+        try:
+            job_posting_id, clean_job_description, truncated = get_or_clean_job_posting(
+                db, raw_description, data.get("url"), max_chars=MAX_JOB_POSTING_CHARS
+            )
+        except Exception as e:
+            return None, (f"Failed to process job description: {str(e)}", 400)
+
+        if truncated and not (
+            JOB_DESCRIPTION_OVERFLOW == "truncate" or data.get("truncateJobDescription")
+        ):
+            return None, ("Job posting is too long. Please provide a shorter description.", 400)
 
-        # ---------------- CHECK INPUTS ----------------
         is_valid, error_message = validate_inputs(clean_job_description, resume_text)
         if not is_valid:
-            return jsonify({"error": error_message}), 400
+            return None, (error_message, 400)
 
         tone = data.get("tone", "professional")
-        user_prompt = data.get("userPrompt", "")
-        job_title = data.get("jobTitle")
-        company_name = data.get("companyName")
-        job_url = data.get("url")
-        location = data.get("location")
-
         if tone not in get_supported_tones():
-            return jsonify({
-                "error": f"Invalid tone '{tone}'. Supported tones: {', '.join(get_supported_tones())}"
-            }), 400
+            return None, (
+                f"Invalid tone '{tone}'. Supported tones: {', '.join(get_supported_tones())}",
+                400
+            )
 
-                # ---------------- GENERATE COVER LETTER ----------------
-        try:
-            cover_letter_markdown = generate_cover_letter(
-                user_info=user_info,
-                job_posting=clean_job_description,
-                resume=resume_text,
-                tone=tone,
-                user_prompt=user_prompt,
-                job_title=job_title,
-                company_name=company_name
+        # Only the compressed text goes into the prompt; the full cleaned
+        # description is still returned to the client. The resume side starts
+        # from the compact digest built at upload time.
+        with timed_stage("compress_prompt"):
+            prompt_job_posting, prompt_resume, compression = compress_prompt_inputs(
+                clean_job_description, resume_digest["compact_text"] or resume_text
             )
-            print(cover_letter_markdown)
-
-            try:
-                db = get_db()
-                user_obj_id = ObjectId(user_id)
-                job_url = data.get("url")
-                location = data.get("location")
-
-                # Detect source from URL
-                source = None
-                if job_url:
-                    import re
-
-                    match = re.search(r"https?://([^/]+)/?", job_url)
-                    if match:
-                        source = match.group(1)
-
-                # Find existing history for this user + job URL
-                existing_history = None
-                if job_url:
-                    existing_history = db.job_history.find_one(
-                        {"user_id": user_obj_id, "url": job_url}
-                    )
 
-                if existing_history:
-                    history_id = existing_history["_id"]
-                    # Update basic info in case it changed
-                    db.job_history.update_one(
-                        {"_id": history_id},
-                        {
-                            "$set": {
-                                "job_title": job_title,
-                                "company_name": company_name,
-                                "location": location,
-                                "source": source,
-                                "tone": tone,
-                            }
-                        },
-                    )
-                else:
-                    history_doc = {
-                        "user_id": user_obj_id,
-                        "job_title": job_title,
-                        "company_name": company_name,
-                        "location": location,
-                        "url": job_url,
-                        "source": source,
-                        "status": "Applied",
-                        "tone": tone,
-                        "created_at": datetime.utcnow(),
-                    }
-                    result = db.job_history.insert_one(history_doc)
-                    history_id = result.inserted_id
-
-                # Save this cover letter as a new version
-                existing_versions = db.cover_letters.count_documents(
-                    {"history_id": history_id}
-                )
-                version_number = existing_versions + 1
+        return {
+            "user_info": user_info,
+            "clean_job_description": clean_job_description,
+            "job_description_truncated": truncated,
+            "job_posting_id": job_posting_id,
+            "job_posting": prompt_job_posting,
+            "resume": prompt_resume,
+            "resume_digest": {
+                "summary": resume_digest["summary"],
+                "skills": resume_digest["skills"],
+            },
+            "compression": compression,
+            "tone": tone,
+            "user_prompt": data.get("userPrompt", ""),
+            "job_title": data.get("jobTitle"),
+            "company_name": data.get("companyName"),
+            "job_url": data.get("url"),
+            "location": data.get("location"),
+        }, None
 
-                letter_doc = {
-                    "history_id": history_id,
-                    "user_id": user_obj_id,
-                    "markdown": cover_letter_markdown,
-                    "tone": tone,
-                    "user_prompt": user_prompt,
-                    "created_at": datetime.utcnow(),
-                    "version": version_number,
-                }
+    # Everything needed to generate a single letter.
+    # Returns (generation context, error).
+    def _prepare_generation(db, user_id, data):
+        # ---------------- INPUT VALIDATION ----------------
+        if not data:
+            return None, ("No data provided", 400)
+
+        if not data.get("jobDescription"):
+            return None, ("Missing jobDescription field", 400)
 
-                db.cover_letters.insert_one(letter_doc)
+        # ---------------- FETCH USER & RESUME ----------------
+        loaded, error = _load_user_and_resume(db, user_id)
+        if error:
+            return None, error
 
-            except Exception as history_error:
-                print(f"Failed to save job history / letter versions: {history_error}")
+        # ---------------- CHECK INPUTS ----------------
+        return _build_generation_context(db, data, *loaded)
+
+    # Response body for a finished letter (blocking response and the stream's
+    # done event). result is run_generation's result.
+    def _letter_payload(ctx, user_id, result):
+        return {
+            "markdown": result["markdown"],
+            "clean_job_description": ctx["clean_job_description"],
+            "jobDescriptionTruncated": ctx["job_description_truncated"],
+            "url": ctx["job_url"],
+            "user_id": user_id,
+            "jobTitle": ctx["job_title"],
+            "companyName": ctx["company_name"],
+            "location": ctx["location"],
+            "tone": ctx["tone"],
+            "cached": result["cacheTier"] is not None,
+            "cacheTier": result["cacheTier"],
+            "promptTokens": ctx["compression"],
+            "historyId": result["historyId"],
+            "version": result["version"]
+        }
+
+    @app.route("/api/cover-letter", methods=["POST"])
+    def cover_letter():
+        """
+        Generate a cover letter using Gemini AI based on job posting and user's resume.
+        """
+        db = get_db()
+
+        # ---------------- AUTH ----------------
+        user_id, error = _authenticate()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        data, error = _read_json_body()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        ctx, error = _prepare_generation(db, user_id, data)
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        # Charged only once the request is known to be valid
+        limited = _rate_limited(db, user_id)
+        if limited:
+            return limited
+
+        # ---------------- GENERATE COVER LETTER (OR SERVE FROM CACHE) ----------------
+        try:
+            result = run_generation(db, user_id, ctx, skip_cache=bool(data.get("skipCache")))
+            print(result["markdown"])
 
             # ---------------- RESPONSE ----------------
-            return jsonify({
-                "markdown": cover_letter_markdown,
-                "clean_job_description": clean_job_description,
-                "url": data.get("url"),
-                "user_id": user_id,
-                "jobTitle": job_title,
-                "companyName": company_name,
-                "location": data.get("location"),
-                "tone": tone,
-                "historyId": str(history_id) if 'history_id' in locals() else None,
-                "version": version_number if 'version_number' in locals() else None
-            }), 200
+            return jsonify(_letter_payload(ctx, user_id, result)), 200
 
+        except LLMUnavailableError as e:
+            # Upstream slow or unhealthy: tell the client when to come back
+            code = 504 if isinstance(e, LLMTimeoutError) else 503
+            retry_after = max(1, math.ceil(e.retry_after or 1))
+            return jsonify({"error": str(e)}), code, {"Retry-After": str(retry_after)}
         except Exception as e:
             return jsonify({"error": f"Failed to generate cover letter: {str(e)}"}), 500
-        
+
+    # ---------------- STREAMING (SERVER-SENT EVENTS) ----------------
+    @app.route("/api/cover-letter/stream", methods=["POST"])
+    def cover_letter_stream():
+        """
+        Same input as /api/cover-letter, but streams the letter as it is generated.
+        Events:
+          - chunk: {"text": "..."} raw Markdown pieces, in order
+          - done:  the same body /api/cover-letter returns
+          - error: {"error": "..."} if generation fails mid-stream
+        """
+        db = get_db()
+
+        user_id, error = _authenticate()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        data, error = _read_json_body()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        ctx, error = _prepare_generation(db, user_id, data)
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        limited = _rate_limited(db, user_id)
+        if limited:
+            return limited
+
+        cache_key = make_cache_key(**generation_args(ctx))
+        cached_markdown, cache_tier = None, None
+        if not data.get("skipCache"):
+            cached_markdown, cache_tier = get_cached_cover_letter(cache_key, db)
+
+        def _sse(event, payload):
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+        def _events():
+            if cached_markdown is not None:
+                markdown = cached_markdown
+                yield _sse("chunk", {"text": markdown})
+            else:
+                parts = []
+                try:
+                    for text in stream_cover_letter(**generation_args(ctx)):
+                        parts.append(text)
+                        yield _sse("chunk", {"text": text})
+                except LLMUnavailableError as e:
+                    yield _sse("error", {"error": str(e), "retryAfter": math.ceil(e.retry_after or 1)})
+                    return
+                except Exception as e:
+                    yield _sse("error", {"error": f"Failed to generate cover letter: {str(e)}"})
+                    return
+
+                markdown = clean_response("".join(parts))
+                store_cover_letter(cache_key, markdown, db)
+
+            # Persist only once the full letter is known
+            history_id, version_number = record_generation(db, user_id, ctx, markdown)
+
+            yield _sse("done", _letter_payload(ctx, user_id, {
+                "markdown": markdown,
+                "cacheTier": cache_tier,
+                "historyId": str(history_id) if history_id else None,
+                "version": version_number,
+            }))
+
+        return Response(
+            stream_with_context(_events()),
+            mimetype="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                # Stop reverse proxies from buffering the stream
+                "X-Accel-Buffering": "no",
+            },
+        )
+
+    # ---------------- BATCH GENERATION ----------------
+    @app.route("/api/cover-letter/batch", methods=["POST"])
+    def cover_letter_batch():
+        """
+        Generate cover letters for several postings in one request.
+        Body:
+          {
+            "postings": [ { same fields as /api/cover-letter }, ... ],
+            "tone": default tone, "userPrompt": default prompt (optional),
+            "concurrency": max parallel generations (optional, capped by the server)
+          }
+        Returns one result per posting, in order; a failed posting does not fail the batch.
+        Letters are saved with one bulk history write, so a single generation
+        for the same job finishing at the same moment may get the same
+        version number as a letter from the batch.
+        """
+        db = get_db()
+
+        user_id, error = _authenticate()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        data, error = _read_json_body(BATCH_MAX_BODY_BYTES)
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+
+        postings = data.get("postings")
+        if not isinstance(postings, list) or not postings:
+            return jsonify({"error": "postings must be a non-empty list"}), 400
+        # Each posting counts as one generation, so a batch can't be bigger
+        # than a user's batch rate limit burst
+        max_postings = min(BATCH_MAX_POSTINGS, max_rate_limit_cost(db, "batch") or BATCH_MAX_POSTINGS)
+        if len(postings) > max_postings:
+            return jsonify({"error": f"Too many postings. Maximum is {max_postings} per batch."}), 400
+
+        # User and resume are shared by every posting: load them once
+        loaded, error = _load_user_and_resume(db, user_id)
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        results = [None] * len(postings)
+        contexts, positions = [], []
+        for i, posting in enumerate(postings):
+            if not isinstance(posting, dict):
+                results[i] = {"error": "Each posting must be an object"}
+                continue
+
+            posting = {
+                "tone": data.get("tone", "professional"),
+                "userPrompt": data.get("userPrompt", ""),
+                **posting,
+            }
+            ctx, error = _build_generation_context(db, posting, *loaded)
+            if error:
+                results[i] = {"error": error[0]}
+                continue
+
+            contexts.append(ctx)
+            positions.append(i)
+
+        try:
+            concurrency = int(data.get("concurrency") or len(contexts) or 1)
+        except (TypeError, ValueError):
+            return jsonify({"error": "concurrency must be an integer"}), 400
+
+        # Only postings that passed validation are charged
+        if contexts:
+            limited = _rate_limited(db, user_id, cost=len(contexts), scope="batch")
+            if limited:
+                return limited
+
+        generated = run_generation_batch(
+            db, user_id, contexts, concurrency=concurrency, skip_cache=bool(data.get("skipCache"))
+        )
+
+        for i, ctx, result in zip(positions, contexts, generated):
+            if "error" not in result:
+                result.update({
+                    "url": ctx["job_url"],
+                    "jobTitle": ctx["job_title"],
+                    "companyName": ctx["company_name"],
+                    "location": ctx["location"],
+                    "tone": ctx["tone"],
+                    "cached": result["cacheTier"] is not None,
+                    "jobDescriptionTruncated": ctx["job_description_truncated"],
+                    "promptTokens": ctx["compression"],
+                })
+            results[i] = result
+
+        for i, result in enumerate(results):
+            result["index"] = i
+
+        failed = sum(1 for result in results if "error" in result)
+        return jsonify({
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        }), 200
+
+    # ---------------- ASYNC GENERATION JOBS ----------------
+    @app.route("/api/cover-letter/jobs", methods=["POST"])
+    def create_cover_letter_job():
+        """
+        Same input as /api/cover-letter, but returns 202 with a job id right away.
+        The letter is generated by a background worker; poll
+        GET /api/cover-letter/jobs/<job_id> for the result.
+        """
+        db = get_db()
+
+        user_id, error = _authenticate()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        data, error = _read_json_body()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        ctx, error = _prepare_generation(db, user_id, data)
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        limited = _rate_limited(db, user_id)
+        if limited:
+            return limited
+
+        try:
+            job_id = enqueue_generation_job(db, user_id, ctx, skip_cache=bool(data.get("skipCache")))
+        except Exception as e:
+            return jsonify({"error": f"Failed to queue cover letter job: {str(e)}"}), 500
+
+        status_url = f"/api/cover-letter/jobs/{job_id}"
+        return jsonify({
+            "jobId": job_id,
+            "status": "queued",
+            "statusUrl": status_url,
+        }), 202, {"Location": status_url}
+
+    @app.route("/api/cover-letter/jobs/<job_id>", methods=["GET"])
+    def get_cover_letter_job(job_id):
+        """
+        Return a generation job's status: queued, running, done or failed.
+        When done, "result" holds markdown, historyId and version.
+        """
+        db = get_db()
+
+        user_id, error = _authenticate()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        try:
+            job = get_generation_job(db, job_id, user_id)
+        except Exception as e:
+            return jsonify({"error": f"Failed to fetch job: {str(e)}"}), 500
+
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        return jsonify(job), 200
+
     # ---------------- SUPPORTED TONES ----------------
     @app.route("/api/cover-letter/tones", methods=["GET"])
     def get_tones():
         """Return supported tone options."""
         return jsonify({"tones": get_supported_tones()}), 200
+
+    # ---------------- CACHE STATS ----------------
+    @app.route("/api/cover-letter/cache/stats", methods=["GET"])
+    def get_cover_letter_cache_stats():
+        """Return cover letter cache hit/miss counters for this worker."""
+        return jsonify({"cache": get_cache_stats()}), 200
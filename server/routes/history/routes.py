@@ -1,11 +1,43 @@
 from flask import jsonify, request, Response
 from config.database import get_db
 from utils.jwt_utils import validate_token
+from utils.job_postings import get_job_posting
+from utils.pagination import InvalidPageRequest, keyset_page, parse_page_args
+from utils.unique_jobs import get_unique_jobs_page, record_job_removed
 from bson.objectid import ObjectId
 from datetime import datetime
 from io import StringIO
 import csv
 
+# Listing orders; the trailing _id keeps keyset pagination stable on ties
+HISTORY_SORT = [("created_at", -1), ("_id", -1)]
+LETTER_SORT = [("version", 1), ("_id", 1)]
+
+# Only the fields each response uses
+HISTORY_FIELDS = {
+    "job_title": 1, "company_name": 1, "location": 1, "url": 1, "source": 1,
+    "status": 1, "tone": 1, "job_posting_id": 1, "created_at": 1,
+}
+LETTER_SUMMARY_FIELDS = {"version": 1, "tone": 1, "user_prompt": 1, "created_at": 1}
+LETTER_FIELDS = {**LETTER_SUMMARY_FIELDS, "markdown": 1}
+
+
+def _letter_json(doc: dict, with_markdown: bool = True) -> dict:
+    created_at = doc.get("created_at")
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+
+    letter = {
+        "id": str(doc["_id"]),
+        "version": doc.get("version"),
+        "tone": doc.get("tone"),
+        "userPrompt": doc.get("user_prompt", ""),
+        "createdAt": created_at,
+    }
+    if with_markdown:
+        letter["markdown"] = doc.get("markdown", "")
+    return letter
+
 
 def init_history_routes(app):
 
@@ -30,7 +62,8 @@ def init_history_routes(app):
     @app.route("/api/history", methods=["GET"])
     def get_history():
         """
-        Return the current user's job application history.
+        Return one page of the current user's job application history, newest first.
+        Query: ?limit=<n>&after=<nextCursor from the previous page>
         """
         db = get_db()
 
@@ -40,14 +73,22 @@ def init_history_routes(app):
             return jsonify({"error": msg}), code
 
         try:
-            cursor = (
-                db.job_history
-                .find({"user_id": ObjectId(user_id)})
-                .sort("created_at", -1)
+            limit, after = parse_page_args(request.args)
+        except InvalidPageRequest as e:
+            return jsonify({"error": str(e)}), 400
+
+        try:
+            docs, next_cursor = keyset_page(
+                db.job_history,
+                {"user_id": ObjectId(user_id)},
+                HISTORY_SORT,
+                limit,
+                after,
+                projection=HISTORY_FIELDS,
             )
 
             history = []
-            for doc in cursor:
+            for doc in docs:
                 created_at = doc.get("created_at")
                 if isinstance(created_at, datetime):
                     created_at = created_at.isoformat()
@@ -61,10 +102,11 @@ def init_history_routes(app):
                     "source": doc.get("source"),
                     "status": doc.get("status", "Applied"),
                     "tone": doc.get("tone"),
+                    "jobPostingId": doc.get("job_posting_id"),
                     "createdAt": created_at
                 })
 
-            return jsonify({"history": history}), 200
+            return jsonify({"history": history, "nextCursor": next_cursor}), 200
 
         except Exception as e:
             return jsonify({"error": f"Failed to fetch history: {str(e)}"}), 500
@@ -73,7 +115,10 @@ def init_history_routes(app):
     @app.route("/api/history/<history_id>/letters", methods=["GET"])
     def get_history_letters(history_id):
         """
-        Return all saved cover letter versions for a given job history item.
+        Return one page of the saved cover letter versions for a job history
+        item, oldest first.
+        Query: ?limit=<n>&after=<nextCursor>&summary=true (omit the letter
+        bodies; fetch one with /api/history/<history_id>/letters/<version>)
         """
         db = get_db()
 
@@ -83,34 +128,88 @@ def init_history_routes(app):
             return jsonify({"error": msg}), code
 
         try:
-            cursor = (
-                db.cover_letters
-                .find({
-                    "history_id": ObjectId(history_id),
-                    "user_id": ObjectId(user_id)
-                })
-                .sort("created_at", 1)
+            limit, after = parse_page_args(request.args)
+        except InvalidPageRequest as e:
+            return jsonify({"error": str(e)}), 400
+        summary = request.args.get("summary", "").lower() == "true"
+
+        try:
+            docs, next_cursor = keyset_page(
+                db.cover_letters,
+                {"history_id": ObjectId(history_id), "user_id": ObjectId(user_id)},
+                LETTER_SORT,
+                limit,
+                after,
+                projection=LETTER_SUMMARY_FIELDS if summary else LETTER_FIELDS,
             )
 
-            letters = []
-            for doc in cursor:
-                created_at = doc.get("created_at")
-                if isinstance(created_at, datetime):
-                    created_at = created_at.isoformat()
+            letters = [_letter_json(doc, with_markdown=not summary) for doc in docs]
+            return jsonify({"letters": letters, "nextCursor": next_cursor}), 200
 
-                letters.append({
-                    "id": str(doc["_id"]),
-                    "version": doc.get("version"),
-                    "tone": doc.get("tone"),
-                    "userPrompt": doc.get("user_prompt", ""),
-                    "markdown": doc.get("markdown", ""),
-                    "createdAt": created_at,
-                })
+        except Exception as e:
+            return jsonify({"error": f"Failed to fetch letter versions: {str(e)}"}), 500
+
+    # GET /api/history/<history_id>/letters/<version>  -> One cover letter version
+    @app.route("/api/history/<history_id>/letters/<int:version>", methods=["GET"])
+    def get_history_letter(history_id, version):
+        """
+        Return a single saved cover letter version, including its body.
+        """
+        db = get_db()
 
-            return jsonify({"letters": letters}), 200
+        user_id, error = _get_user_id_from_request()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        try:
+            doc = db.cover_letters.find_one(
+                {"history_id": ObjectId(history_id), "user_id": ObjectId(user_id), "version": version},
+                LETTER_FIELDS,
+            )
+            if not doc:
+                return jsonify({"error": "Letter version not found"}), 404
+
+            return jsonify({"letter": _letter_json(doc)}), 200
 
         except Exception as e:
-            return jsonify({"error": f"Failed to fetch letter versions: {str(e)}"}), 500
+            return jsonify({"error": f"Failed to fetch letter version: {str(e)}"}), 500
+
+    # GET /api/history/<history_id>/posting  -> Cleaned job description
+    @app.route("/api/history/<history_id>/posting", methods=["GET"])
+    def get_history_posting(history_id):
+        """
+        Return the cleaned job description a history item was generated from.
+        The text is shared between users in the job_postings collection.
+        """
+        db = get_db()
+
+        user_id, error = _get_user_id_from_request()
+        if error:
+            msg, code = error
+            return jsonify({"error": msg}), code
+
+        try:
+            doc = db.job_history.find_one(
+                {"_id": ObjectId(history_id), "user_id": ObjectId(user_id)},
+                {"job_posting_id": 1}
+            )
+            if not doc:
+                return jsonify({"error": "History item not found"}), 404
+
+            posting = get_job_posting(db, doc["job_posting_id"]) if doc.get("job_posting_id") else None
+            if not posting:
+                return jsonify({"error": "Job description not stored for this item"}), 404
+
+            return jsonify({
+                "id": history_id,
+                "jobPostingId": posting["_id"],
+                "url": posting.get("url"),
+                "description": posting.get("clean_text", ""),
+            }), 200
+
+        except Exception as e:
+            return jsonify({"error": f"Failed to fetch job description: {str(e)}"}), 500
 
     # PATCH /api/history/<history_id>/status  -> Mark Applied / Not Applied
     @app.route("/api/history/<history_id>/status", methods=["PATCH"])
@@ -166,13 +265,16 @@ def init_history_routes(app):
 
         try:
             # Ensure the history entry belongs to this user
-            result = db.job_history.delete_one(
-                {"_id": ObjectId(history_id), "user_id": ObjectId(user_id)}
+            deleted = db.job_history.find_one_and_delete(
+                {"_id": ObjectId(history_id), "user_id": ObjectId(user_id)},
+                projection={"job_title": 1, "url": 1},
             )
 
-            if result.deleted_count == 0:
+            if deleted is None:
                 return jsonify({"error": "History item not found"}), 404
 
+            record_job_removed(db, deleted.get("job_title"), deleted.get("url"))
+
             # Cascade delete associated cover letters (if any)
             db.cover_letters.delete_many(
                 {"history_id": ObjectId(history_id), "user_id": ObjectId(user_id)}
@@ -200,8 +302,8 @@ def init_history_routes(app):
         try:
             cursor = (
                 db.job_history
-                .find({"user_id": ObjectId(user_id)})
-                .sort("created_at", -1)
+                .find({"user_id": ObjectId(user_id)}, HISTORY_FIELDS)
+                .sort(HISTORY_SORT)
             )
 
             output = StringIO()
@@ -248,12 +350,14 @@ def init_history_routes(app):
         except Exception as e:
             return jsonify({"error": f"Failed to export history: {str(e)}"}), 500
 
-    # GET /api/history/unique-jobs  -> Get all unique job titles and links
+    # GET /api/history/unique-jobs?limit=&after=  -> Page of unique job titles and links
     @app.route("/api/history/unique-jobs", methods=["GET"])
     def get_unique_jobs():
         """
-        Return all unique job titles and links across all jobs.
-        Returns a dictionary mapping job titles to their links.
+        Return unique job titles and links across all jobs, most recently
+        saved first, from the materialized unique_jobs view.
+        Returns a dictionary mapping job titles to their links, and the cursor
+        for the next page (null on the last page).
         Requires user authentication (user_id must be provided).
         """
         db = get_db()
@@ -264,21 +368,15 @@ def init_history_routes(app):
             return jsonify({"error": msg}), code
 
         try:
-            cursor = (
-                db.job_history
-                .find({})
-            )
-
-            unique_jobs = {}
-            for doc in cursor:
-                job_title = doc.get("job_title")
-                url = doc.get("url")
-                
-                # Only add if both job_title and url exist
-                if job_title and url:
-                    unique_jobs[job_title] = url
+            limit, after = parse_page_args(request.args)
+        except InvalidPageRequest as e:
+            return jsonify({"error": str(e)}), 400
 
-            return jsonify({"unique_jobs": unique_jobs}), 200
+        try:
+            unique_jobs, next_cursor = get_unique_jobs_page(db, limit, after)
+            return jsonify({"unique_jobs": unique_jobs, "nextCursor": next_cursor}), 200
 
+        except InvalidPageRequest as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": f"Failed to fetch unique jobs: {str(e)}"}), 500
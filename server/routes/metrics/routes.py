@@ -0,0 +1,13 @@
+from flask import Response
+from utils.metrics import render_metrics, METRICS_ENABLED
+
+
+def init_metrics_routes(app):
+    if not METRICS_ENABLED:
+        return
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus scrape endpoint (text exposition format)"""
+        body, content_type = render_metrics()
+        return Response(body, mimetype=None, content_type=content_type)
@@ -3,10 +3,20 @@ from config.database import get_db
 from utils.jwt_utils import validate_token
 from bson.objectid import ObjectId
 import gridfs
-from utils.files_utils import extract_text_from_file
-import io
+from utils.resume_digest import DIGEST_VERSION, build_resume_digest
+from utils.file_response import gridfs_file_response, not_modified
+from utils.resume_processing import FAILED, PENDING, READY, enqueue_resume_processing, resume_status
+from utils.resume_store import (
+    acquire_resume_file,
+    find_resume_by_hash,
+    is_same_file,
+    register_resume_file,
+    release_resume,
+)
+from utils.upload_spool import RESUME_MAX_BYTES, RESUME_MAX_REQUEST_BYTES, SpooledUpload, UploadTooLarge
+from utils.metrics import timed_stage
+from datetime import datetime
 from utils.user_utils import check_attention_needed
-from flask import send_file
 from bson import ObjectId
 from werkzeug.utils import secure_filename
 import mimetypes
@@ -48,6 +58,18 @@ def sniff_mime(file_bytes: bytes, fallback: str | None) -> str:
         return fallback
     return mimetypes.guess_type("x." + "bin")[0] or ""
 
+def _resume_info(resume_doc: dict) -> dict:
+    """Public view of a user_resume document (text is None until processing finishes)."""
+    status, error = resume_status(resume_doc)
+    return {
+        "file_name": resume_doc["file_name"],
+        "text": resume_doc.get("resume_text"),
+        "id": str(resume_doc["_id"]),
+        "skills": (resume_doc.get("resume_digest") or {}).get("skills", []),
+        "status": status,
+        "error": error,
+    }
+
 def init_profile_routes(app):
     @app.route('/api/profile', methods=['GET'])
     def profile():
@@ -82,11 +104,7 @@ def init_profile_routes(app):
             if "latest_resume_id" in user and user["latest_resume_id"]:
                 latest_resume = db.user_resume.find_one({"_id": ObjectId(user["latest_resume_id"])})
             if latest_resume:
-                user["resume"] = {
-                    "file_name": latest_resume["file_name"],
-                    "text": latest_resume["resume_text"],
-                    "id": str(latest_resume["_id"]),
-                }
+                user["resume"] = _resume_info(latest_resume)
             else:
                 user["resume"] = None
 
@@ -165,27 +183,116 @@ def init_profile_routes(app):
         payload = validate_token(token.removeprefix("Bearer ").strip())
         user_id = payload.get("id")
 
-        # Find user and their latest resume
-        user = db.users.find_one({"_id": ObjectId(user_id)})
-        if not user or "latest_resume_id" not in user:
+        # Only the metadata needed to answer a conditional request
+        resume = db.user_resume.find_one(
+            {"user_id": ObjectId(user_id)},
+            {"file_name": 1, "resume_file": 1, "content_hash": 1},
+            sort=[("_id", -1)],
+        )
+        if not resume or not resume.get("resume_file"):
             return jsonify({"error": "No resume found"}), 404
 
-        resume = db.user_resume.find_one({"_id": user["latest_resume_id"]})
-        if not resume:
-            return jsonify({"error": "Resume not found"}), 404
+        # Files are immutable; resumes stored before content hashing use the file id
+        etag = resume.get("content_hash") or str(resume["resume_file"])
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
 
-        # Fetch actual file contents from GridFS
-        grid_out = fs.get(resume["resume_file"])
-        return send_file(
-            grid_out,
-            download_name=resume["file_name"],
-            as_attachment=True,
-            mimetype=grid_out.content_type
-        )
+        try:
+            return gridfs_file_response(fs, resume["resume_file"], etag, resume["file_name"])
+        except gridfs.errors.NoFile:
+            return jsonify({"error": "Resume not found"}), 404
     
     # -------------------------------
     # Upload / Replace resume
     # -------------------------------
+    # Everything after the upload has been spooled: validate, store, queue extraction.
+    def _save_resume(db, fs, user_id, filename, content_type, upload):
+        # Detect MIME type from content or fallback
+        detected_mime = sniff_mime(upload.head, content_type)
+        if not any(detected_mime.startswith(prefix) for prefix in ALLOWED_MIME_PREFIXES):
+            return jsonify({"error": f"Unsupported MIME type: {detected_mime}"}), 400
+
+        existing_resume = db.user_resume.find_one({"user_id": ObjectId(user_id)})
+        file_id = None
+
+        # Same file as the current resume: nothing to do, unless reading it failed
+        if is_same_file(existing_resume, upload.sha256, filename):
+            if resume_status(existing_resume)[0] != FAILED:
+                user = db.users.find_one({"_id": ObjectId(user_id)})
+                return _resume_response(user, existing_resume, "Resume unchanged", 200)
+            file_id = existing_resume["resume_file"]
+
+        # Same file stored and read before (by anyone): reuse its text and GridFS file
+        with timed_stage("resume_dedup_lookup"):
+            stored = find_resume_by_hash(db, upload.sha256, filename)
+
+        now = datetime.utcnow()
+        resume_data = {
+            "user_id": ObjectId(user_id),
+            "file_name": filename,
+            "content_hash": upload.sha256,
+            "status": PENDING,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if stored:
+            file_id = stored["resume_file"]
+            resume_digest = stored.get("resume_digest")
+            if not resume_digest or resume_digest.get("version") != DIGEST_VERSION:
+                with timed_stage("resume_digest"):
+                    resume_digest = build_resume_digest(stored["resume_text"])
+            resume_data.update({
+                "status": READY,
+                "resume_text": stored["resume_text"],
+                "resume_digest": resume_digest,
+            })
+
+        # Reuse the stored file only if it is not being deleted right now
+        if file_id is not None and not acquire_resume_file(db, file_id):
+            file_id = None
+
+        # Save new resume file into GridFS (read from the spool chunk by chunk)
+        if file_id is None:
+            with timed_stage("gridfs_put"), upload.open() as file:
+                file_id = fs.put(
+                    file, filename=filename, content_type=detected_mime or content_type, sha256=upload.sha256
+                )
+            register_resume_file(db, file_id)
+        resume_data["resume_file"] = file_id
+
+        # Save resume metadata into separate collection
+        resume_data["_id"] = db.user_resume.insert_one(resume_data).inserted_id
+
+        # Update user record with latest resume ID and attention flag
+        update_fields = {"latest_resume_id": resume_data["_id"]}
+        user = db.users.find_one({"_id": ObjectId(user_id)})
+        user.update(update_fields)
+        update_fields["attention_needed"] = check_attention_needed(user)
+        db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_fields})
+        user.update(update_fields)
+
+        # Remove the previous resume (its file only if nothing else uses it)
+        if existing_resume:
+            release_resume(db, fs, existing_resume)
+
+        if resume_data["status"] == READY:
+            return _resume_response(user, resume_data, "Resume uploaded successfully", 201)
+
+        # Text extraction (used later for cover letter prompts, etc.) and the
+        # digest run in the background; clients poll GET /api/profile
+        enqueue_resume_processing(db, resume_data["_id"])
+        return _resume_response(user, resume_data, "Resume uploaded, processing", 202)
+
+    def _resume_response(user, resume_doc, message, status):
+        user["_id"] = str(user["_id"])
+        for k, v in list(user.items()):
+            if isinstance(v, ObjectId):
+                user[k] = str(v)
+        user["resume"] = _resume_info(resume_doc)
+        return jsonify({"message": message, "user": user}), status
+
     @app.route('/api/profile/resume', methods=['POST'])
     def upload_resume():
         db = get_db()
@@ -199,6 +306,11 @@ def init_profile_routes(app):
         payload = validate_token(token.removeprefix("Bearer ").strip())
         user_id = payload.get("id")
 
+        # Refuse an oversized upload before werkzeug parses the multipart body
+        # (bodies without a Content-Length are cut off by MAX_CONTENT_LENGTH)
+        if request.content_length is not None and request.content_length > RESUME_MAX_REQUEST_BYTES:
+            return jsonify({"error": f"File is too large. Maximum is {RESUME_MAX_BYTES // (1024 * 1024)} MB."}), 413
+
         # Get uploaded file from form-data
         up = request.files.get("file")
         if not up:
@@ -209,73 +321,17 @@ def init_profile_routes(app):
         if not is_allowed_extension(filename):
             return jsonify({"error": "Unsupported file type. Only .pdf, .doc, .docx, .txt allowed."}), 400
 
-        # Read file bytes once (for mime sniff and text extraction)
-        raw = up.read()
-        if not raw:
+        # Copy the file out of the request in chunks (hashing and keeping the
+        # head for MIME sniffing on the way); large files go to a temp file
+        try:
+            upload = SpooledUpload(up.stream)
+        except UploadTooLarge as e:
+            return jsonify({"error": str(e)}), 413
+        if not upload.size:
             return jsonify({"error": "Empty file"}), 400
 
-        # Detect MIME type from content or fallback
-        detected_mime = sniff_mime(raw, up.content_type)
-        if not any(detected_mime.startswith(prefix) for prefix in ALLOWED_MIME_PREFIXES):
-            return jsonify({"error": f"Unsupported MIME type: {detected_mime}"}), 400
-
-        # Extract resume text (this is used later for cover letter prompts, etc.)
-        file_buf = io.BytesIO(raw)
-        resume_text = extract_text_from_file(file_buf, filename)
-
-        # If extractor says unsupported, stop here
-        if resume_text.strip() in {"[Unsupported file type]"}:
-            return jsonify({"error": "Unsupported file type"}), 400
-
-        # For PDF/DOC/DOCX we expect non-empty extracted text
-        if filename.lower().endswith((".pdf", ".doc", ".docx")) and not resume_text.strip():
-            return jsonify({"error": "Could not extract text. Please upload a text-based PDF/DOCX."}), 422
-
-        # Reset pointer before saving to GridFS
-        file_buf.seek(0)
-
-        # If user already has a resume, remove old file + metadata
-        existing_resume = db.user_resume.find_one({"user_id": ObjectId(user_id)})
-        if existing_resume:
-            try:
-                fs.delete(existing_resume["resume_file"])
-            except Exception:
-                # If file missing in GridFS, still delete DB record
-                pass
-            db.user_resume.delete_one({"_id": existing_resume["_id"]})
-
-        # Save new resume file into GridFS
-        file_id = fs.put(file_buf, filename=filename, content_type=detected_mime or up.content_type)
-
-        # Save resume metadata into separate collection
-        resume_data = {
-            "user_id": ObjectId(user_id),
-            "file_name": filename,
-            "resume_text": resume_text,
-            "resume_file": file_id,
-        }
-        resume_id = db.user_resume.insert_one(resume_data).inserted_id
-
-        # Update user record with latest resume ID and attention flag
-        update_fields = {"latest_resume_id": resume_id}
-        user = db.users.find_one({"_id": ObjectId(user_id)})
-        user.update(update_fields)
-        update_fields["attention_needed"] = check_attention_needed(user)
-        db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_fields})
-
-        # Build clean response
-        user.update(update_fields)
-        user["_id"] = str(user["_id"])
-        for k, v in list(user.items()):
-            if isinstance(v, ObjectId):
-                user[k] = str(v)
-        user["resume"] = {
-            "file_name": filename,
-            "text": resume_text,
-            "id": str(resume_id),
-        }
-
-        return jsonify({"message": "Resume uploaded successfully", "user": user}), 201
+        with upload:
+            return _save_resume(db, fs, user_id, filename, up.content_type, upload)
 
     @app.route('/api/profile/resume', methods=['DELETE'])
     def delete_resume():
@@ -299,11 +355,8 @@ def init_profile_routes(app):
 
         resume = db.user_resume.find_one({"_id": ObjectId(resume_id)})
         if resume:
-            try:
-                fs.delete(resume["resume_file"])
-            except Exception:
-                pass
-            db.user_resume.delete_one({"_id": resume["_id"]})
+            # The file may be shared with identical uploads by other users
+            release_resume(db, fs, resume)
 
         # Remove resume reference from user and recompute attention flag
         db.users.update_one(
@@ -0,0 +1,78 @@
+# test_cover_letter_cache.py
+
+import time
+from unittest.mock import MagicMock
+from utils.ttl_cache import TTLCache
+from utils.cover_letter_cache import (
+    make_cache_key,
+    get_cached_cover_letter,
+    store_cover_letter,
+    clear_memory_cache
+)
+
+SAMPLE_USER_INFO = {
+    "name": "John Doe",
+    "email": "john@example.com",
+    "city": "New York",
+    "postal_code": "10001",
+    "country": "USA"
+}
+
+def _key(**overrides):
+    args = {
+        "user_info": SAMPLE_USER_INFO,
+        "job_posting": "Python developer wanted",
+        "resume": "John Doe resume",
+        "tone": "professional",
+        "user_prompt": "",
+    }
+    args.update(overrides)
+    return make_cache_key(**args)
+
+def test_cache_key_is_stable():
+    """Same inputs produce the same key"""
+    assert _key() == _key()
+
+def test_cache_key_changes_with_inputs():
+    """Any input that shapes the letter changes the key"""
+    base = _key()
+    assert _key(tone="formal") != base
+    assert _key(user_prompt="Mention Django") != base
+    assert _key(resume="Jane Doe resume") != base
+    assert _key(user_info={**SAMPLE_USER_INFO, "city": "Boston"}) != base
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Oldest untouched entry is evicted when full"""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_ttl_cache_expires_entries():
+    """Entries are dropped after their TTL"""
+    cache = TTLCache(max_size=2, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_memory_tier_hit():
+    """A stored letter is served from the in-process tier"""
+    clear_memory_cache()
+    key = _key(job_posting="Memory tier posting")
+    assert get_cached_cover_letter(key) == (None, None)
+    store_cover_letter(key, "Letter body")
+    assert get_cached_cover_letter(key) == ("Letter body", "memory")
+
+def test_mongo_tier_hit_promotes_to_memory():
+    """A Mongo hit is returned and then served from memory"""
+    clear_memory_cache()
+    key = _key(job_posting="Mongo tier posting")
+    db = MagicMock()
+    db.__getitem__.return_value.find_one.return_value = {"markdown": "Shared letter"}
+
+    assert get_cached_cover_letter(key, db) == ("Shared letter", "mongo")
+    assert get_cached_cover_letter(key, db) == ("Shared letter", "memory")
@@ -7,8 +7,9 @@ from utils.cover_letter_generator import (
     generate_cover_letter,
     validate_inputs,
     get_supported_tones,
-    _clean_response
+    clean_response
 )
+from utils.llm_backends import GeminiBackend
 
 # Test data
 SAMPLE_USER_INFO = {
@@ -50,13 +51,13 @@ def test_get_supported_tones():
     assert len(tones) > 0
     assert "professional" in tones
 
-@patch('utils.cover_letter_generator.model')
-def test_generate_cover_letter_success(mock_model):
+@patch('utils.cover_letter_generator.get_backend')
+def test_generate_cover_letter_success(mock_get_backend):
     """Test successful cover letter generation"""
-    # Mock the Gemini model response
-    mock_response = MagicMock()
-    mock_response.text = "Generated cover letter content"
-    mock_model.generate_content.return_value = mock_response
+    # Mock the model backend response
+    mock_backend = MagicMock()
+    mock_backend.generate.return_value = "Generated cover letter content"
+    mock_get_backend.return_value = mock_backend
 
     # Test with minimal required fields
     result = generate_cover_letter(
@@ -66,14 +67,14 @@ def test_generate_cover_letter_success(mock_model):
     )
     
     assert result == "Generated cover letter content"
-    mock_model.generate_content.assert_called_once()
+    mock_backend.generate.assert_called_once()
 
-@patch('utils.cover_letter_generator.model')
-def test_generate_cover_letter_with_optional_fields(mock_model):
+@patch('utils.cover_letter_generator.get_backend')
+def test_generate_cover_letter_with_optional_fields(mock_get_backend):
     """Test cover letter generation with all optional fields"""
-    mock_response = MagicMock()
-    mock_response.text = "Generated formal cover letter"
-    mock_model.generate_content.return_value = mock_response
+    mock_backend = MagicMock()
+    mock_backend.generate.return_value = "Generated formal cover letter"
+    mock_get_backend.return_value = mock_backend
 
     result = generate_cover_letter(
         user_info=SAMPLE_USER_INFO,
@@ -86,7 +87,7 @@ def test_generate_cover_letter_with_optional_fields(mock_model):
     )
     
     assert result == "Generated formal cover letter"
-    mock_model.generate_content.assert_called_once()
+    mock_backend.generate.assert_called_once()
 
 @patch.dict('os.environ', {}, clear=True)
 def test_generate_cover_letter_missing_api_key():
@@ -95,7 +96,8 @@ def test_generate_cover_letter_missing_api_key():
         generate_cover_letter(
             user_info=SAMPLE_USER_INFO,
             job_posting=SAMPLE_JOB_POSTING,
-            resume=SAMPLE_RESUME
+            resume=SAMPLE_RESUME,
+            backend=GeminiBackend()
         )
     assert "Gemini API not configured" in str(excinfo.value)
 
@@ -109,4 +111,4 @@ def test_clean_response():
     ]
     
     for input_text, expected in test_cases:
-        assert _clean_response(input_text) == expected
\ No newline at end of file
+        assert clean_response(input_text) == expected
\ No newline at end of file
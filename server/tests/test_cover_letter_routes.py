@@ -0,0 +1,55 @@
+# test_cover_letter_routes.py
+
+from unittest.mock import MagicMock
+
+import pytest
+from bson.objectid import ObjectId
+from flask import Flask
+
+import routes.cover_letter.routes as cover_letter_routes
+from utils.rate_limiter import MemoryBucketStore, RateLimiter, set_rate_limiter
+from utils.resume_digest import DIGEST_VERSION
+
+USER_ID = ObjectId()
+HEADERS = {"Authorization": "Bearer token"}
+
+@pytest.fixture
+def db(monkeypatch):
+    db = MagicMock()
+    db.users.find_one.return_value = {"_id": USER_ID, "name": "Jane", "latest_resume_id": ObjectId()}
+    db.user_resume.find_one.return_value = {
+        "_id": ObjectId(),
+        "resume_text": "Jane Doe, Python developer",
+        "resume_digest": {"version": DIGEST_VERSION, "compact_text": "", "summary": "", "skills": []},
+    }
+    monkeypatch.setattr(cover_letter_routes, "get_db", lambda: db)
+    monkeypatch.setattr(cover_letter_routes, "validate_token", lambda token: {"id": str(USER_ID)})
+    monkeypatch.setattr(cover_letter_routes, "get_or_clean_job_posting",
+                        lambda db, raw, url, max_chars: (None, raw, False))
+    monkeypatch.setattr(cover_letter_routes, "validate_inputs", lambda job, resume: (True, ""))
+    return db
+
+@pytest.fixture
+def client(db):
+    # Default limits, kept in memory
+    set_rate_limiter(RateLimiter(MemoryBucketStore()))
+    app = Flask(__name__)
+    cover_letter_routes.init_cover_letter_routes(app)
+    yield app.test_client()
+    set_rate_limiter(None)
+
+def test_batch_of_ten_is_accepted_under_default_limits(client, monkeypatch):
+    monkeypatch.setattr(cover_letter_routes, "run_generation_batch", lambda db, user_id, contexts, **kw: [
+        {"markdown": "Dear Hiring Manager", "cacheTier": None, "historyId": None, "version": None}
+        for _ in contexts
+    ])
+    postings = [{"jobDescription": f"Backend developer {i}", "url": f"https://example.com/{i}"} for i in range(10)]
+
+    response = client.post("/api/cover-letter/batch", json={"postings": postings}, headers=HEADERS)
+    assert response.status_code == 200
+    assert [item["markdown"] for item in response.get_json()["results"]] == ["Dear Hiring Manager"] * 10
+
+def test_malformed_job_id_is_not_found(client, db):
+    response = client.get("/api/cover-letter/jobs/not-an-id", headers=HEADERS)
+    assert response.status_code == 404
+    db["generation_jobs"].find_one.assert_not_called()
@@ -0,0 +1,72 @@
+# test_database.py
+
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+import config.database as database
+from config.database import Database, client_options, database_options
+from utils.metrics import MongoPoolMetrics
+
+@pytest.fixture
+def fresh_database():
+    """No client yet; whatever the test creates is closed afterwards"""
+    Database.close_connection()
+    yield Database
+    Database.close_connection()
+
+def test_client_is_created_on_first_use_and_per_process(fresh_database):
+    """Nothing connects at import; a forked process gets its own client"""
+    assert Database._client is None
+
+    db = database.get_db()
+    assert database.get_db() is db
+    client = Database._client
+
+    Database._pid = -1  # as seen from a forked child
+    assert database.get_db() is not db
+    assert Database._client is not client
+    client.close()
+
+def test_client_options_from_environment(monkeypatch, capsys):
+    monkeypatch.setattr(database, "MONGO_MAX_POOL_SIZE", 20)
+    monkeypatch.setattr(database, "MONGO_MAX_IDLE_TIME_MS", "60000")
+    monkeypatch.setattr(database, "MONGO_SOCKET_TIMEOUT_MS", None)
+    monkeypatch.setattr(database, "MONGO_COMPRESSORS", "lz4, zlib")
+
+    options = client_options()
+    assert options["maxPoolSize"] == 20
+    assert options["maxIdleTimeMS"] == 60000
+    assert "socketTimeoutMS" not in options
+    # Unknown or uninstalled compressors are dropped with a warning
+    assert options["compressors"] == "zlib"
+    assert "lz4" in capsys.readouterr().out
+
+def test_database_options(monkeypatch):
+    monkeypatch.setattr(database, "MONGO_READ_CONCERN", "majority")
+    monkeypatch.setattr(database, "MONGO_WRITE_CONCERN", "2")
+    options = database_options()
+    assert options["read_concern"].level == "majority"
+    assert options["write_concern"].document == {"w": 2}
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_pool_metrics_track_checkouts():
+    listener = MongoPoolMetrics(max_pool_size=10)
+    event = SimpleNamespace(address=("db", 27017), connection_id=1, reason="timeout")
+    checked_out = _sample("jobmate_mongo_pool_checked_out")
+    waits = _sample("jobmate_mongo_pool_wait_seconds_count")
+    failures = _sample("jobmate_mongo_pool_checkout_failures_total", reason="timeout")
+
+    listener.connection_check_out_started(event)
+    listener.connection_checked_out(event)
+    assert _sample("jobmate_mongo_pool_checked_out") == checked_out + 1
+    listener.connection_checked_in(event)
+    assert _sample("jobmate_mongo_pool_checked_out") == checked_out
+
+    listener.connection_check_out_started(event)
+    listener.connection_check_out_failed(event)
+    assert _sample("jobmate_mongo_pool_checkout_failures_total", reason="timeout") == failures + 1
+    assert _sample("jobmate_mongo_pool_wait_seconds_count") == waits + 2
@@ -0,0 +1,97 @@
+# test_extraction_pool.py
+
+import os
+import time
+
+import pytest
+
+import utils.extraction_pool as extraction_pool
+from utils.extraction_pool import (
+    ExtractionBusy,
+    ExtractionError,
+    ExtractionPool,
+    ExtractionTimeout,
+    extract_resume_text,
+)
+from utils.pdf_extraction import clear_memory_cache
+
+# Worker functions must be importable by the spawned worker processes
+
+def _sleepy_extract(file, filename, max_pages):
+    time.sleep(30)
+    return "never"
+
+def _crashing_extract(file, filename, max_pages):
+    os._exit(1)
+
+def _greedy_extract(file, filename, max_pages):
+    return "x" * (1024 * 1024 * 1024)
+
+def _failing_extract(file, filename, max_pages):
+    raise ValueError("bad file")
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(workers=1, timeout=5, queue_timeout=0.2, memory_mb=512, max_pages=2)
+    yield pool
+    pool.shutdown()
+
+def test_extracts_text_in_worker_and_reuses_it(pool):
+    """Text comes back from the worker; the worker stays up for the next file"""
+    assert pool.extract(b"Jane Doe\n\n  Python developer  \n", "resume.txt") == "Jane Doe\nPython developer"
+    worker = pool._idle[0]
+    assert pool.extract(b"Second", "resume.txt") == "Second"
+    assert pool._idle == [worker]
+
+def test_timeout_kills_the_worker_and_recovers(pool):
+    """An overrunning file is cancelled; the next file gets a fresh worker"""
+    pool.timeout = 0.5
+    started = time.monotonic()
+    with pytest.raises(ExtractionTimeout):
+        pool.extract(b"%PDF", "resume.pdf", func=_sleepy_extract)
+    assert time.monotonic() - started < 5
+    assert pool._idle == []
+
+    pool.timeout = 5
+    assert pool.extract(b"After timeout", "resume.txt") == "After timeout"
+
+def test_busy_pool_sheds_new_work(pool):
+    """With every worker taken, callers give up after the queue wait"""
+    pool._slots.acquire()
+    try:
+        with pytest.raises(ExtractionBusy) as excinfo:
+            pool.extract(b"text", "resume.txt")
+        assert excinfo.value.retry_after > 0
+    finally:
+        pool._slots.release()
+
+@pytest.mark.parametrize("func", [_crashing_extract, _failing_extract, _greedy_extract])
+def test_worker_failures_are_extraction_errors(pool, func):
+    """Crashes, exceptions and the memory limit all surface as ExtractionError"""
+    with pytest.raises(ExtractionError):
+        pool.extract(b"%PDF", "resume.pdf", func=func)
+    assert pool.extract(b"Still works", "resume.txt") == "Still works"
+
+class _SlowPagesPool:
+    """Stands in for the pool: every page range takes 0.2s"""
+    workers, max_pages, timeout = 1, 30, 0.5
+
+    def __init__(self):
+        self.timeouts = []
+
+    def extract(self, source, filename, func, args, timeout=None):
+        self.timeouts.append(timeout)
+        time.sleep(0.2)
+        return {"page_count": 20, "pages": {i: f"page {i}" for i in args[0]}}
+
+def test_pdf_time_limit_covers_the_whole_file(monkeypatch):
+    """Page ranges share one deadline instead of each getting the full limit"""
+    clear_memory_cache()
+    fake = _SlowPagesPool()
+    monkeypatch.setattr(extraction_pool, "get_extraction_pool", lambda: fake)
+
+    with pytest.raises(ExtractionTimeout):
+        extract_resume_text(b"%PDF", "resume.pdf", content_hash="slow-pages")
+    assert len(fake.timeouts) == 3
+    assert fake.timeouts == sorted(fake.timeouts, reverse=True)
+    assert fake.timeouts[0] <= 0.5
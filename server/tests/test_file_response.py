@@ -0,0 +1,73 @@
+# test_file_response.py
+
+import io
+
+import pytest
+
+from flask import Flask
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+
+from utils.file_response import gridfs_file_response, not_modified
+
+DATA = bytes(range(256)) * 400
+
+class _GridOut(io.BytesIO):
+    """Seekable stand-in for gridfs.GridOut that records how much was read"""
+    content_type = "application/pdf"
+    length = len(DATA)
+
+    def __init__(self):
+        super().__init__(DATA)
+        self.bytes_read = 0
+
+    def read(self, n=-1):
+        out = super().read(n)
+        self.bytes_read += len(out)
+        return out
+
+class _FS:
+    def __init__(self):
+        self.grid_out = _GridOut()
+
+    def get(self, file_id):
+        return self.grid_out
+
+app = Flask(__name__)
+
+def _download(headers=None):
+    fs = _FS()
+    with app.test_request_context("/api/profile/resume", headers=headers or {}):
+        response = not_modified("abc") or gridfs_file_response(fs, "f1", "abc", "resume.pdf")
+        body = b"".join(response.response) if response.status_code != 304 else b""
+    return response, body, fs.grid_out
+
+def test_full_download_has_etag_and_cache_headers():
+    response, body, _ = _download()
+    assert response.status_code == 200
+    assert body == DATA
+    assert response.headers["ETag"] == '"abc"'
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert "private" in response.headers["Cache-Control"]
+    assert "filename=resume.pdf" in response.headers["Content-Disposition"]
+
+def test_matching_etag_returns_304_without_touching_gridfs():
+    response, _, grid_out = _download({"If-None-Match": '"abc"'})
+    assert response.status_code == 304
+    assert grid_out.bytes_read == 0
+
+def test_range_reads_only_the_requested_bytes():
+    """The file is seeked to the start; one read buffer is enough for 100 bytes"""
+    response, body, grid_out = _download({"Range": "bytes=50000-50099"})
+    assert response.status_code == 206
+    assert body == DATA[50000:50100]
+    assert response.headers["Content-Range"] == f"bytes 50000-50099/{len(DATA)}"
+    assert grid_out.bytes_read <= 8192
+
+def test_stale_if_range_sends_the_whole_file():
+    response, body, _ = _download({"Range": "bytes=0-9", "If-Range": '"old"'})
+    assert response.status_code == 200
+    assert body == DATA
+
+def test_unsatisfiable_range():
+    with pytest.raises(RequestedRangeNotSatisfiable):
+        _download({"Range": f"bytes={len(DATA) + 10}-"})
@@ -0,0 +1,58 @@
+# test_generation_jobs.py
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from bson.objectid import ObjectId
+
+import utils.generation_jobs as generation_jobs
+from utils.generation_jobs import get_generation_job
+
+def _db(job):
+    db = MagicMock()
+    db["generation_jobs"].find_one.return_value = job
+    return db
+
+def _job(status, age_seconds):
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "status": status,
+        "result": None,
+        "error": None,
+        "created_at": now - timedelta(seconds=age_seconds),
+        "updated_at": now - timedelta(seconds=age_seconds),
+    }
+
+def test_stale_job_is_marked_failed():
+    """A job its worker lost is failed in the database, not only in the response"""
+    job = _job("running", generation_jobs.JOB_STALE_SECONDS + 60)
+    db = _db(job)
+
+    status = get_generation_job(db, str(job["_id"]), str(ObjectId()))
+    assert status["status"] == "failed" and "expired" in status["error"]
+    assert status["finishedAt"]
+
+    query, update = db["generation_jobs"].update_one.call_args[0]
+    assert query["_id"] == job["_id"] and query["status"] == {"$in": ["queued", "running"]}
+    assert update["$set"]["status"] == "failed"
+    assert update["$unset"] == {"params": ""}
+
+def test_running_job_is_left_alone():
+    job = _job("running", 5)
+    db = _db(job)
+    assert get_generation_job(db, str(job["_id"]), str(ObjectId()))["status"] == "running"
+    db["generation_jobs"].update_one.assert_not_called()
+
+def test_finished_job_drops_its_params(monkeypatch):
+    """Params (user info, resume text) are only kept while the job is pending"""
+    monkeypatch.setattr(generation_jobs, "run_generation", lambda *a, **kw: {"markdown": "letter"})
+    job_id = ObjectId()
+    db = MagicMock()
+    db["generation_jobs"].find_one_and_update.return_value = {"_id": job_id, "user_id": ObjectId(), "params": {}}
+
+    generation_jobs._run_job(db, job_id)
+    query, update = db["generation_jobs"].update_one.call_args[0]
+    assert query == {"_id": job_id, "status": "running"}
+    assert update["$set"]["status"] == "done"
+    assert update["$unset"] == {"params": ""}
@@ -0,0 +1,137 @@
+# test_history_utils.py
+
+from unittest.mock import MagicMock
+
+from bson.objectid import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from utils.history_utils import save_generation, save_generations_bulk
+
+USER_ID = str(ObjectId())
+
+def _db(previous):
+    """find_one_and_update returns the history item as it was before the upsert"""
+    db = MagicMock()
+    db.job_history.find_one_and_update.return_value = previous
+    return db
+
+def _letter_count_update(update):
+    return update[0]["$set"]["letter_count"]
+
+def test_save_generation_takes_version_from_history_counter():
+    """One atomic upsert per letter; the incremented counter is the version"""
+    db = _db({"_id": "h1", "letter_count": 3})
+    assert save_generation(db, USER_ID, "md", "formal", job_url="https://jobs/1") == ("h1", 4)
+
+    query, update = db.job_history.find_one_and_update.call_args[0]
+    assert query == {"user_id": ObjectId(USER_ID), "url": "https://jobs/1"}
+    assert _letter_count_update(update)["$cond"][2] == {"$add": ["$letter_count", 1]}
+    assert db.job_history.find_one_and_update.call_args[1]["upsert"] is True
+    assert db.cover_letters.insert_one.call_args[0][0]["version"] == 4
+    db.cover_letters.count_documents.assert_not_called()
+    db["unique_jobs"].update_one.assert_not_called()
+
+def test_save_generation_without_url_always_creates_history():
+    db = _db(None)
+    history_id, version = save_generation(db, USER_ID, "md", "formal")
+    query, _ = db.job_history.find_one_and_update.call_args[0]
+    assert list(query) == ["_id"]
+    assert (history_id, version) == (query["_id"], 1)
+
+def test_save_generation_retries_lost_upsert_race():
+    """The unique (user_id, url) index rejects the second insert; retry matches it"""
+    db = _db(None)
+    db.job_history.find_one_and_update.side_effect = [
+        DuplicateKeyError("E11000"), {"_id": "h1", "letter_count": 1}
+    ]
+    assert save_generation(db, USER_ID, "md", "formal", job_url="https://jobs/1") == ("h1", 2)
+
+def test_user_input_is_not_read_as_field_paths():
+    db = _db({"_id": "h1", "letter_count": 1})
+    save_generation(db, USER_ID, "md", "formal", job_title="$100k role", job_url="https://jobs/1")
+    update = db.job_history.find_one_and_update.call_args[0][1]
+    assert update[0]["$set"]["job_title"] == {"$literal": "$100k role"}
+
+def test_legacy_item_is_seeded_from_its_letters():
+    """An item saved before letter_count continues after its last stored version"""
+    db = _db({"_id": "h1"})
+    db.cover_letters.find_one.return_value = {"version": 7}
+    db.job_history.find_one_and_update.side_effect = [{"_id": "h1"}, {"_id": "h1", "letter_count": 8}]
+
+    assert save_generation(db, USER_ID, "md", "formal", job_url="https://jobs/1") == ("h1", 8)
+    db.job_history.update_one.assert_called_once_with(
+        {"_id": "h1", "letter_count": None}, {"$set": {"letter_count": 7}}
+    )
+    assert db.job_history.find_one_and_update.call_args[0][1] == {"$inc": {"letter_count": 1}}
+    db["unique_jobs"].update_one.assert_not_called()
+
+def _bulk_db(docs, upserted=None):
+    db = MagicMock()
+    db.job_history.find.return_value = docs
+    db.job_history.bulk_write.return_value.upserted_ids = upserted or {}
+    return db
+
+def test_bulk_versions_follow_letter_count():
+    db = _bulk_db([
+        {"_id": "h1", "url": "https://jobs/1", "letter_count": 5},
+        {"_id": "h2", "url": "https://jobs/2", "letter_count": 1},
+    ])
+    letters = [
+        {"markdown": "a", "tone": "t", "job_url": "https://jobs/1"},
+        {"markdown": "b", "tone": "t", "job_url": "https://jobs/2"},
+        {"markdown": "c", "tone": "t", "job_url": "https://jobs/1"},
+        {"markdown": "d", "tone": "t"},
+    ]
+    results = save_generations_bulk(db, USER_ID, letters)
+
+    assert [r[1] for r in results[:3]] == [4, 1, 5]
+    assert [r[0] for r in results[:3]] == ["h1", "h2", "h1"]
+    assert results[3][1] == 1
+    ops = db.job_history.bulk_write.call_args[0][0]
+    incs = [_letter_count_update(op._doc)["$cond"][2]["$add"][1] for op in ops if hasattr(op, "_filter")]
+    assert sorted(incs) == [1, 2]
+
+def test_bulk_counts_only_upserted_items_as_new_jobs():
+    db = _bulk_db(
+        [
+            {"_id": "h1", "url": "https://jobs/1", "letter_count": 1},
+            {"_id": "h2", "url": "https://jobs/2", "letter_count": 4, "job_title": "Old"},
+        ],
+        upserted={1: "h1"},
+    )
+    save_generations_bulk(db, USER_ID, [
+        {"markdown": "a", "tone": "t", "job_title": "New", "job_url": "https://jobs/1"},
+        {"markdown": "b", "tone": "t", "job_title": "Old", "job_url": "https://jobs/2"},
+    ])
+    query, _ = db["unique_jobs"].update_one.call_args[0]
+    assert db["unique_jobs"].update_one.call_count == 1
+    assert query == {"_id": {"job_title": "New", "url": "https://jobs/1"}}
+
+def test_bulk_seeds_legacy_items():
+    db = _bulk_db([{"_id": "h1", "url": "https://jobs/1"}])
+    db.cover_letters.find_one.return_value = {"version": 2}
+    db.job_history.find_one_and_update.return_value = {"_id": "h1", "letter_count": 4}
+    results = save_generations_bulk(db, USER_ID, [
+        {"markdown": "a", "tone": "t", "job_url": "https://jobs/1"},
+        {"markdown": "b", "tone": "t", "job_url": "https://jobs/1"},
+    ])
+    assert results == [("h1", 3), ("h1", 4)]
+
+def test_created_item_is_added_to_unique_jobs():
+    db = _db(None)
+    db.job_history.find_one.return_value = {"_id": "h9"}
+    result = save_generation(db, USER_ID, "md", "formal", job_title="Engineer", job_url="https://jobs/1")
+
+    assert result == ("h9", 1)
+    query, _ = db["unique_jobs"].update_one.call_args[0]
+    assert query == {"_id": {"job_title": "Engineer", "url": "https://jobs/1"}}
+
+def test_retitled_item_moves_in_unique_jobs():
+    """A changed title uncounts the old (title, url) pair and counts the new one"""
+    db = _db({"_id": "h1", "letter_count": 1, "job_title": "Engineer"})
+    save_generation(db, USER_ID, "md", "formal", job_title="Senior Engineer", job_url="https://jobs/1")
+
+    removed = db["unique_jobs"].update_one.call_args_list[0][0]
+    added = db["unique_jobs"].update_one.call_args_list[1][0]
+    assert removed == ({"_id": {"job_title": "Engineer", "url": "https://jobs/1"}}, {"$inc": {"count": -1}})
+    assert added[0] == {"_id": {"job_title": "Senior Engineer", "url": "https://jobs/1"}}
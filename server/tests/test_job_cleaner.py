@@ -0,0 +1,107 @@
+# test_job_cleaner.py
+
+import random
+import warnings
+
+import pytest
+
+from benchmarks.corpus import make_posting_html
+from utils.job_cleaner import iter_tokens, trim_html, trim_html_capped, trim_html_legacy
+
+# Shapes that exercise the legacy pipeline's quirks
+EDGE_CASES = [
+    "<div><h1>Backend Developer</h1><p>Build <b>Flask</b> APIs.</p></div>",
+    "<style>.a{color:red} p {x:y}</style><p>Hi &amp; bye &lt;b&gt; &nbsp;x</p>",
+    "<div>a<script>var x = 1; if (a<b) {y()}</script>b</div>",
+    "<p>a<!-- comment -->b</p><!-- never closed",
+    "<p>{a</p><p>b}c</p><p>x{unclosed</p>",
+    "a &#123;q&#125; b &#x41;&eacute;&notit; &amp AT&T",
+    "<nav>Home</nav><div>Jobs</div><section>About</section><span>x</span>",
+    "<!DOCTYPE html><![CDATA[cd]]><?php echo 1 ?><p>1 < 2 and 3 > 2</p>",
+    "<p class='c' title=\"x\">q</p><BR/>x </ y> z <p>unterminated <b",
+]
+
+# A tag still open at the end of the input
+TRAILING_FRAGMENTS = [
+    "<p>Apply now</p><a href='https://example.com/apply'",
+    "<p>Apply now</p></DIV",
+    "<p>Apply now</p><br/",
+    "<p>Apply now</p><b class='a>b'",
+    "<p>{Apply} now <span style={x}",
+]
+
+@pytest.fixture(autouse=True)
+def _quiet_bs4():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+@pytest.mark.parametrize("html", EDGE_CASES)
+def test_matches_legacy_pipeline(html):
+    """Single-pass output is identical to the old pipeline"""
+    assert trim_html(html) == trim_html_legacy(html)
+
+@pytest.mark.parametrize("html", TRAILING_FRAGMENTS)
+def test_trailing_fragment_matches_legacy(html):
+    """An unterminated tag at the end is dropped, or kept as '<name' text, like before"""
+    assert trim_html(html) == trim_html_legacy(html)
+    assert trim_html_capped(html, 1000)[0] == trim_html(html)
+
+def test_stray_table_text_stays_in_place():
+    """
+    Known difference: text in a <table> outside any cell keeps its position,
+    where the old HTML5 parser moved it in front of the table
+    """
+    html = "<table><tr><td>Salary</td></tr>Remote</table>Apply"
+    assert trim_html(html) == "SalaryRemoteApply"
+    assert trim_html_legacy(html) == "RemoteSalaryApply"
+
+@pytest.mark.parametrize("site", ["generic", "linkedin", "indeed", "workday", "greenhouse", "lever"])
+def test_matches_legacy_on_corpus(site):
+    """Full-size postings from the benchmark corpus give the same text"""
+    html = make_posting_html(random.Random(7), 40, site)
+    assert trim_html(html) == trim_html_legacy(html)
+
+def test_trim_html_output():
+    """Tags dropped, entities decoded, whitespace collapsed"""
+    html = "<div>\n  <h2>Role</h2>\n<p>Python &amp; Flask</p>\n</div>"
+    assert trim_html(html) == "Role Python & Flask"
+
+def test_iter_tokens_kinds():
+    """The tokenizer reports tags, text and comments with lowercased names"""
+    tokens = list(iter_tokens('<DIV id="a>b">hi</div><!-- c -->'))
+    assert [(kind, name) for kind, name, _ in tokens] == [
+        ("start", "div"), ("text", ""), ("end", "div"), ("comment", "")
+    ]
+
+def test_unterminated_tags_stay_linear():
+    """Many '<' with no closing '>' are handled quickly"""
+    assert trim_html("a<b " * 20000) == "a"
+    assert trim_html("a <1 " * 20000).startswith("a <1 a <1")
+
+@pytest.mark.parametrize("max_chars", [1, 5, 12, 500, 10**6])
+def test_capped_is_prefix_of_full_text(max_chars):
+    """The capped text is the start of trim_html's text, cut at the budget"""
+    html = make_posting_html(random.Random(3), 20, "linkedin")
+    full = trim_html(html)
+    text, truncated = trim_html_capped(html, max_chars)
+    assert text == full[:max_chars].rstrip()
+    assert truncated == (len(full) > max_chars)
+
+def test_capped_stops_reading_early(monkeypatch):
+    """Only the markup needed for the budget is tokenized"""
+    import utils.job_cleaner as job_cleaner
+
+    consumed = 0
+    real_iter_tokens = job_cleaner.iter_tokens
+
+    def counting_iter_tokens(html):
+        nonlocal consumed
+        for token in real_iter_tokens(html):
+            consumed += 1
+            yield token
+
+    monkeypatch.setattr(job_cleaner, "iter_tokens", counting_iter_tokens)
+    text, truncated = trim_html_capped("<p>word word word</p>" * 200000, 100)
+    assert truncated and len(text) == 100
+    assert consumed < 50
@@ -0,0 +1,87 @@
+# test_job_extractors.py
+
+from pathlib import Path
+
+import pytest
+
+from utils.job_extractors import iter_description_candidates, site_for_url
+from utils.job_postings import clean_job_html
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+
+# fixture file -> (job URL, extractor expected to find the description)
+PAGES = {
+    "linkedin.html": ("https://www.linkedin.com/jobs/view/4102", "linkedin"),
+    "indeed.html": ("https://ca.indeed.com/viewjob?jk=4102", "indeed"),
+    "workday.html": ("https://example.wd3.myworkdayjobs.com/en-US/careers/job/4102", "workday"),
+    "greenhouse.html": ("https://boards.greenhouse.io/example/jobs/4102", "greenhouse"),
+    "lever.html": ("https://jobs.lever.co/example/4102", "lever"),
+    "generic.html": ("https://careers.example.com/jobs/4102", "generic"),
+    "linkedin_empty_container.html": ("https://www.linkedin.com/jobs/view/4102", "page"),
+}
+
+def _load(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_extracts_only_the_description(name):
+    """Description kept; nav, sidebar, footer and scripts dropped"""
+    url, expected = PAGES[name]
+    text, truncated, extractor = clean_job_html(_load(name), url)
+
+    assert extractor == expected
+    assert not truncated
+    assert text.startswith("About the role We are looking for a Backend Developer")
+    assert "Python & REST APIs." in text
+    for chrome in ["Sign in", "Similar jobs", "Privacy Policy", "jobId", "Show more"]:
+        assert chrome not in text
+
+def test_site_for_url_matches_host_and_subdomains():
+    """Hosts match exactly or as a parent domain, never as a substring"""
+    assert site_for_url("https://www.linkedin.com/jobs/view/1").name == "linkedin"
+    assert site_for_url("https://jobs.lever.co/acme/1").name == "lever"
+    assert site_for_url("https://notlinkedin.com/jobs/1") is None
+    assert site_for_url("not a url") is None
+    assert site_for_url(None) is None
+
+def test_nested_containers_keep_their_content():
+    """The container ends at its own closing tag, not the first nested one"""
+    html = (
+        "<div id='jobDescriptionText'><div><p>First part</p></div><p>Second part</p></div>"
+        "<div>Similar jobs</div>"
+    )
+    name, tokens = next(iter_description_candidates(html, "https://indeed.com/viewjob"))
+    text = "".join(raw for kind, _, raw in tokens if kind == "text")
+    assert name == "indeed"
+    assert text == "First partSecond part"
+
+def test_value_outside_a_tag_is_ignored():
+    """The container name in text or scripts does not count as the container"""
+    html = "<p>see jobDescriptionText</p><script>var id = 'jobDescriptionText';</script><main>Body</main>"
+    names = [name for name, _ in iter_description_candidates(html, "https://indeed.com/viewjob")]
+    assert names == ["generic", "page", "full"]
+
+def test_meta_description_is_not_a_container():
+    """A schema.org <meta itemprop="description"> has no end tag; the real container is used"""
+    html = (
+        "<head><meta itemprop='description' content='Short summary'></head>"
+        "<body><div itemprop='description'><p>Full description</p></div>"
+        "<footer>Privacy Policy</footer></body>"
+    )
+    name, tokens = next(iter_description_candidates(html, "https://careers.example.com/jobs/1"))
+    text = "".join(raw for kind, _, raw in tokens if kind == "text")
+    assert name == "generic"
+    assert text == "Full description"
+
+def test_meta_description_alone_falls_back():
+    """With only the <meta>, the generic tags and the page without chrome are used"""
+    html = "<meta itemprop='description' content='Summary'><main>Body</main><footer>Privacy Policy</footer>"
+    name, tokens = next(iter_description_candidates(html, "https://careers.example.com/jobs/1"))
+    assert name == "generic"
+    assert "".join(raw for kind, _, raw in tokens if kind == "text") == "Body"
+
+def test_unknown_page_falls_back_to_full_text():
+    """Short pages with no container keep all of their text"""
+    text, _, extractor = clean_job_html("<div>Short posting</div>", "https://example.com/1")
+    assert extractor == "full"
+    assert text == "Short posting"
@@ -0,0 +1,82 @@
+# test_job_postings.py
+
+from unittest.mock import MagicMock
+
+from utils.job_postings import (
+    clear_memory_cache,
+    get_or_clean_job_posting,
+    posting_key,
+)
+
+SAMPLE_HTML = "<div><h1>Backend Developer</h1><p>Build Flask &amp; MongoDB APIs.</p></div>"
+SAMPLE_URL = "https://www.linkedin.com/jobs/view/1"
+
+def _db(find_result=None):
+    collection = MagicMock()
+    collection.find_one.return_value = find_result
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return db, collection
+
+def test_posting_key_depends_on_url_and_html():
+    """Same URL + HTML gives the same id; any change gives a new one"""
+    key = posting_key(SAMPLE_HTML, SAMPLE_URL)
+    assert key == posting_key(SAMPLE_HTML, SAMPLE_URL)
+    assert key != posting_key(SAMPLE_HTML + " ", SAMPLE_URL)
+    assert key != posting_key(SAMPLE_HTML, SAMPLE_URL + "?x=1")
+
+def test_first_sight_cleans_and_stores():
+    """A new posting is cleaned and upserted once"""
+    clear_memory_cache()
+    db, collection = _db(find_result=None)
+
+    posting_id, text, truncated = get_or_clean_job_posting(db, SAMPLE_HTML, SAMPLE_URL)
+
+    assert text == "Backend DeveloperBuild Flask & MongoDB APIs."
+    assert posting_id == posting_key(SAMPLE_HTML, SAMPLE_URL)
+    update = collection.update_one.call_args[0][1]["$setOnInsert"]
+    assert update["clean_text"] == text
+    assert update["url"] == SAMPLE_URL
+
+def test_memory_then_mongo_hits_skip_cleaning():
+    """Repeat postings come from the LRU, then from the shared collection"""
+    clear_memory_cache()
+    db, collection = _db(find_result=None)
+    get_or_clean_job_posting(db, SAMPLE_HTML, SAMPLE_URL)
+
+    # Served from memory: no Mongo calls at all
+    collection.reset_mock()
+    get_or_clean_job_posting(db, SAMPLE_HTML, SAMPLE_URL)
+    collection.find_one.assert_not_called()
+
+    # Another worker (empty LRU) reads the stored text
+    clear_memory_cache()
+    db, collection = _db(find_result={"clean_text": "stored text"})
+    posting_id, text, truncated = get_or_clean_job_posting(db, SAMPLE_HTML, SAMPLE_URL)
+    assert text == "stored text"
+    collection.update_one.assert_not_called()
+
+def test_store_failure_still_returns_text():
+    """Mongo errors never block cleaning"""
+    clear_memory_cache()
+    db, collection = _db()
+    collection.find_one.side_effect = Exception("down")
+    collection.update_one.side_effect = Exception("down")
+
+    posting_id, text, truncated = get_or_clean_job_posting(db, SAMPLE_HTML, SAMPLE_URL)
+    assert posting_id is None
+    assert "Backend Developer" in text
+
+def test_text_budget_cuts_and_stores_flag():
+    """Over-budget postings come back cut to max_chars and flagged"""
+    clear_memory_cache()
+    db, collection = _db(find_result=None)
+    posting_id, text, truncated = get_or_clean_job_posting(db, SAMPLE_HTML, SAMPLE_URL, max_chars=17)
+
+    assert text == "Backend Developer"
+    assert truncated is True
+    assert posting_id == posting_key(SAMPLE_HTML, SAMPLE_URL, 17)
+    assert collection.update_one.call_args[0][1]["$setOnInsert"]["truncated"] is True
+
+    # The untruncated text is stored separately
+    assert posting_id != posting_key(SAMPLE_HTML, SAMPLE_URL)
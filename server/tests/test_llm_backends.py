@@ -0,0 +1,82 @@
+# test_llm_backends.py
+
+import time
+import pytest
+from unittest.mock import patch
+from utils.llm_backends import (
+    FakeBackend,
+    GeminiBackend,
+    LLMBackendError,
+    create_backend,
+    get_backend,
+    set_backend
+)
+from utils.cover_letter_generator import generate_cover_letter, stream_cover_letter
+
+SAMPLE_USER_INFO = {
+    "name": "John Doe",
+    "email": "john@example.com",
+    "city": "New York",
+    "postal_code": "10001",
+    "country": "USA"
+}
+
+SAMPLE_JOB_POSTING = "We are looking for a skilled Python developer with experience in web development."
+SAMPLE_RESUME = "John Doe\nPython Developer\n5+ years of experience"
+
+def test_fake_backend_is_deterministic():
+    """Same prompt gives the same letter, different prompts differ"""
+    backend = FakeBackend()
+    assert backend.generate("prompt a") == backend.generate("prompt a")
+    assert backend.generate("prompt a") != backend.generate("prompt b")
+
+def test_fake_backend_stream_matches_generate():
+    """Streamed chunks join to the full letter"""
+    backend = FakeBackend(chunk_size=7)
+    chunks = list(backend.stream("prompt"))
+    assert len(chunks) > 1
+    assert all(len(c) <= 7 for c in chunks)
+    assert "".join(chunks) == backend.generate("prompt")
+
+def test_fake_backend_latency():
+    """Configured latency is applied"""
+    backend = FakeBackend(latency_ms=30)
+    start = time.perf_counter()
+    backend.generate("prompt")
+    assert time.perf_counter() - start >= 0.03
+
+def test_fake_backend_failure_rate():
+    """failure_rate=1 always fails with a retryable error"""
+    backend = FakeBackend(failure_rate=1.0, seed=1)
+    with pytest.raises(LLMBackendError) as excinfo:
+        backend.generate("prompt")
+    assert excinfo.value.retryable
+
+def test_backend_selected_from_environment():
+    """LLM_BACKEND picks the implementation"""
+    with patch.dict('os.environ', {"LLM_BACKEND": "fake"}):
+        assert isinstance(create_backend(), FakeBackend)
+    with patch.dict('os.environ', {"LLM_BACKEND": "gemini"}):
+        assert isinstance(create_backend(), GeminiBackend)
+
+def test_injected_backend_used_by_generator():
+    """set_backend makes the generator use the injected backend"""
+    fake = FakeBackend()
+    set_backend(fake)
+    try:
+        assert get_backend() is fake
+        letter = generate_cover_letter(
+            user_info=SAMPLE_USER_INFO,
+            job_posting=SAMPLE_JOB_POSTING,
+            resume=SAMPLE_RESUME
+        )
+        streamed = "".join(stream_cover_letter(
+            user_info=SAMPLE_USER_INFO,
+            job_posting=SAMPLE_JOB_POSTING,
+            resume=SAMPLE_RESUME
+        ))
+        assert letter.startswith("Dear Hiring Manager")
+        assert streamed.strip() == letter
+        assert fake.calls == 2
+    finally:
+        set_backend(None)
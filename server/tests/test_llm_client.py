@@ -0,0 +1,156 @@
+# test_llm_client.py
+
+import time
+import threading
+import pytest
+from utils.llm_backends import LLMBackend, LLMBackendError, FakeBackend
+from utils.llm_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+    ResilientBackend
+)
+
+class ScriptedBackend(LLMBackend):
+    """Backend whose calls follow a script of delays and failures"""
+    name = "scripted"
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self._lock:
+            step = self.script[min(self.calls, len(self.script) - 1)]
+            self.calls += 1
+        delay, error = step
+        time.sleep(delay)
+        if error:
+            raise error
+        return f"letter {self.calls}"
+
+def _client(backend, **kwargs):
+    options = {"retry_base_delay": 0.001, "retry_max_delay": 0.002, "timeout_seconds": 1}
+    options.update(kwargs)
+    return ResilientBackend(backend, **options)
+
+def test_retries_retryable_errors():
+    """A transient failure is retried and the call succeeds"""
+    backend = ScriptedBackend([(0, LLMBackendError("busy", retryable=True)), (0, None)])
+    assert _client(backend).generate("prompt") == "letter 2"
+    assert backend.calls == 2
+
+def test_does_not_retry_permanent_errors():
+    """Non-retryable errors surface immediately"""
+    backend = ScriptedBackend([(0, ValueError("bad prompt"))])
+    with pytest.raises(ValueError):
+        _client(backend).generate("prompt")
+    assert backend.calls == 1
+
+def test_deadline_exceeded():
+    """A call slower than its deadline raises LLMTimeoutError"""
+    backend = ScriptedBackend([(0.5, None)])
+    with pytest.raises(LLMTimeoutError):
+        _client(backend, timeout_seconds=0.05, max_retries=0).generate("prompt")
+
+def test_circuit_opens_and_fails_fast():
+    """After repeated failures the breaker rejects calls without calling upstream"""
+    backend = FakeBackend(failure_rate=1.0)
+    client = _client(backend, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, recovery_seconds=60))
+    for _ in range(2):
+        with pytest.raises(LLMBackendError):
+            client.generate("prompt")
+    calls = backend.calls
+    with pytest.raises(CircuitOpenError) as excinfo:
+        client.generate("prompt")
+    assert backend.calls == calls
+    assert excinfo.value.retry_after > 0
+
+def test_circuit_half_open_recovers():
+    """After the recovery period one trial call closes the breaker"""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.01)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+def test_permanent_error_leaves_breaker_open():
+    """A request error during the half-open trial does not close the breaker"""
+    backend = ScriptedBackend([(0, ValueError("bad prompt")), (0, None)])
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.01)
+    client = _client(backend, max_retries=0, breaker=breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    with pytest.raises(ValueError):
+        client.generate("prompt")
+    assert breaker.state != "closed"
+    # The trial slot was freed, so the next trial can still run
+    assert client.generate("prompt") == "letter 2"
+    assert breaker.state == "closed"
+
+def test_abandoned_stream_frees_half_open_trial():
+    """Closing the stream during the half-open trial lets the next trial through"""
+    class SlowStream(LLMBackend):
+        def stream(self, prompt):
+            yield "Dear "
+            yield "Hiring Manager"
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.01)
+    client = _client(SlowStream(), breaker=breaker)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    chunks = client.stream("prompt")
+    assert next(chunks) == "Dear "
+    chunks.close()
+
+    assert breaker.state != "closed"
+    assert "".join(client.stream("prompt")) == "Dear Hiring Manager"
+    assert breaker.state == "closed"
+
+def test_busy_call_threads_fail_fast():
+    """Calls abandoned at their deadline hold their thread; new calls fail instead of queueing"""
+    backend = ScriptedBackend([(0.3, None), (0, None)])
+    client = _client(backend, timeout_seconds=0.05, max_retries=0, call_threads=1)
+    with pytest.raises(LLMTimeoutError):
+        client.generate("prompt")
+
+    start = time.perf_counter()
+    with pytest.raises(LLMUnavailableError):
+        client.generate("prompt")
+    assert time.perf_counter() - start < 0.1
+    assert backend.calls == 1
+
+    time.sleep(0.35)
+    assert client.generate("prompt") == "letter 2"
+
+def test_hedged_request_beats_slow_call():
+    """When the first call is slower than p95, a hedge call returns first"""
+    backend = ScriptedBackend([(0.5, None), (0.01, None)])
+    client = _client(backend, hedge=True, hedge_min_samples=1)
+    client.latencies.record(0.02)
+
+    start = time.perf_counter()
+    assert client.generate("prompt") == "letter 2"
+    assert time.perf_counter() - start < 0.4
+
+def test_stream_retries_before_first_chunk():
+    """Streams are retried only if nothing was delivered yet"""
+    class FlakyStream(LLMBackend):
+        calls = 0
+        def stream(self, prompt):
+            self.calls += 1
+            if self.calls == 1:
+                raise LLMBackendError("busy", retryable=True)
+            yield "Dear "
+            yield "Hiring Manager"
+
+    backend = FlakyStream()
+    assert "".join(_client(backend).stream("prompt")) == "Dear Hiring Manager"
+    assert backend.calls == 2
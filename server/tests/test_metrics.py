@@ -0,0 +1,49 @@
+# test_metrics.py
+
+from flask import Flask
+from prometheus_client import REGISTRY
+
+from utils.metrics import instrument_app, render_metrics, timed_stage
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_timed_stage_context_manager_and_decorator():
+    """Both forms record one observation per call"""
+    before = _sample("jobmate_stage_seconds_count", {"stage": "test_stage"})
+
+    with timed_stage("test_stage"):
+        pass
+
+    @timed_stage("test_stage")
+    def work():
+        return 42
+
+    assert work() == 42
+    assert work() == 42
+    assert _sample("jobmate_stage_seconds_count", {"stage": "test_stage"}) == before + 3
+
+def test_requests_counted_by_route_template():
+    """Requests are labelled with the route rule, not the raw path"""
+    app = Flask(__name__)
+    instrument_app(app)
+
+    @app.route("/items/<item_id>")
+    def item(item_id):
+        return item_id
+
+    labels = {"route": "/items/<item_id>", "method": "GET", "status": "200"}
+    before = _sample("jobmate_http_requests_total", labels)
+
+    client = app.test_client()
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert _sample("jobmate_http_requests_total", labels) == before + 2
+    assert _sample("jobmate_http_requests_in_flight", {}) == 0
+
+def test_render_metrics_text_format():
+    """The exposition includes the stage histogram"""
+    body, content_type = render_metrics()
+    assert content_type.startswith("text/plain")
+    assert b"jobmate_stage_seconds_bucket" in body
@@ -0,0 +1,91 @@
+# test_migrations.py
+
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import config.migrations as migrations
+from config.migrations import MigrationLocked, migrate, verify_indexes
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Two throwaway migrations in place of the real ones"""
+    calls = []
+    monkeypatch.setattr(migrations, "MIGRATIONS", [
+        (1, "first", lambda db: calls.append(1)),
+        (2, "second", lambda db: calls.append(2)),
+    ])
+    return calls
+
+def _db(applied):
+    db = MagicMock()
+    db["schema_migrations"].find.return_value = [{"_id": v} for v in applied]
+    return db
+
+def test_migrate_applies_pending_versions_in_order(registry):
+    db = _db([])
+    assert migrate(db) == [1, 2]
+    assert registry == [1, 2]
+    recorded = [c[0][0]["_id"] for c in db["schema_migrations"].insert_one.call_args_list]
+    assert recorded == [1, 2]
+
+def test_migrate_skips_applied_and_stops_at_target(registry):
+    assert migrate(_db([1])) == [2]
+    assert migrate(_db([]), target=1) == [1]
+    assert registry == [2, 1]
+
+def test_failed_migration_is_not_recorded(monkeypatch):
+    def broken(db):
+        raise RuntimeError("index build failed")
+    monkeypatch.setattr(migrations, "MIGRATIONS", [(1, "broken", broken)])
+    db = _db([])
+    with pytest.raises(RuntimeError):
+        migrate(db)
+    db["schema_migrations"].insert_one.assert_not_called()
+
+def test_migrate_holds_the_lease_and_releases_it(registry):
+    db = _db([])
+    migrate(db)
+    lock = db["schema_migrations"]
+    # Taken once up front and renewed before each migration
+    assert lock.update_one.call_count == 3
+    lease = lock.update_one.call_args[0][1]["$set"]
+    lock.delete_one.assert_called_once_with({"_id": "lock", "owner": lease["owner"]})
+
+def test_migrate_skips_when_another_process_holds_the_lease(registry):
+    db = _db([])
+    db["schema_migrations"].update_one.side_effect = DuplicateKeyError("lock")
+    with pytest.raises(MigrationLocked):
+        migrate(db)
+    assert registry == []
+    db["schema_migrations"].insert_one.assert_not_called()
+    db["schema_migrations"].delete_one.assert_not_called()
+
+def test_lost_lease_stops_the_run(registry):
+    db = _db([])
+    db["schema_migrations"].update_one.side_effect = [None, None, DuplicateKeyError("lock")]
+    with pytest.raises(MigrationLocked):
+        migrate(db)
+    assert registry == [1]
+
+def test_verify_indexes_reads_classic_and_sbe_plans(monkeypatch):
+    monkeypatch.setattr(migrations, "HOT_QUERIES", [
+        ("indexed", "job_history", {}, None),
+        ("sbe", "cover_letters", {}, None),
+        ("scan", "users", {}, None),
+    ])
+    plans = {
+        "job_history": {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {
+            "stage": "IXSCAN", "indexName": "user_id_1_created_at_-1"}}},
+        "cover_letters": {"queryPlan": {"stage": "FETCH", "inputStage": {
+            "stage": "IXSCAN", "indexName": "history_id_1_version_1"}}},
+        "users": {"stage": "COLLSCAN"},
+    }
+    db = MagicMock()
+    db.command.side_effect = lambda _, cmd, **kw: {"queryPlanner": {"winningPlan": plans[cmd["find"]]}}
+
+    report = {row["query"]: row for row in verify_indexes(db)}
+    assert report["indexed"]["plan"] == "IXSCAN user_id_1_created_at_-1" and report["indexed"]["ok"]
+    assert report["sbe"]["ok"]
+    assert report["scan"]["plan"] == "COLLSCAN" and not report["scan"]["ok"]
@@ -0,0 +1,58 @@
+# test_pagination.py
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from bson.objectid import ObjectId
+
+from utils.pagination import InvalidPageRequest, decode_cursor, encode_cursor, keyset_page, parse_page_args
+
+SORT = [("created_at", -1), ("_id", -1)]
+
+def _collection(docs):
+    collection = MagicMock()
+    collection.find.return_value.sort.return_value.limit.return_value = docs
+    return collection
+
+def test_cursor_round_trip_keeps_bson_types():
+    values = [datetime(2026, 1, 2, 3, 4, 5), ObjectId()]
+    assert decode_cursor(encode_cursor(values)) == values
+
+def test_parse_page_args():
+    assert parse_page_args({}, default=50) == (50, None)
+    assert parse_page_args({"limit": "1000"}, maximum=200)[0] == 200
+    for bad in ({"limit": "0"}, {"limit": "ten"}, {"after": "not-a-cursor"}):
+        with pytest.raises(InvalidPageRequest):
+            parse_page_args(bad)
+
+def test_first_page_fetches_one_extra_document():
+    """limit + 1 documents read; the extra one only signals a next page"""
+    docs = [{"_id": ObjectId(), "created_at": datetime(2026, 1, d)} for d in (3, 2, 1)]
+    collection = _collection(docs)
+
+    page, cursor = keyset_page(collection, {"user_id": 1}, SORT, 2, projection={"job_title": 1})
+
+    assert page == docs[:2]
+    assert decode_cursor(cursor) == [docs[1]["created_at"], docs[1]["_id"]]
+    query, projection = collection.find.call_args[0]
+    assert query == {"user_id": 1}
+    assert projection == {"job_title": 1, "created_at": 1, "_id": 1}
+    collection.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+
+def test_next_page_continues_after_cursor():
+    last = [datetime(2026, 1, 2), ObjectId()]
+    collection = _collection([])
+
+    page, cursor = keyset_page(collection, {"user_id": 1}, SORT, 2, after=last)
+
+    assert page == [] and cursor is None
+    query = collection.find.call_args[0][0]
+    assert query == {"$and": [{"user_id": 1}, {"$or": [
+        {"created_at": {"$lt": last[0]}},
+        {"created_at": last[0], "_id": {"$lt": last[1]}},
+    ]}]}
+
+def test_cursor_for_another_sort_is_rejected():
+    with pytest.raises(InvalidPageRequest):
+        keyset_page(_collection([]), {}, SORT, 2, after=[1])
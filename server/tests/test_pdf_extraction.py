@@ -0,0 +1,88 @@
+# test_pdf_extraction.py
+
+import hashlib
+import io
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.corpus import make_resume_pdf
+from utils.files_utils import extract_pdf_pages, extract_text_from_file
+from utils.pdf_extraction import clear_memory_cache, extract_pdf_text
+
+@pytest.fixture
+def pdf():
+    clear_memory_cache()
+    return make_resume_pdf(random.Random(1), 12)
+
+def _key(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _runner(data, calls):
+    """Run chunks in this process, recording which pages each one asked for"""
+    def run(pages):
+        calls.append(list(pages))
+        return extract_pdf_pages(io.BytesIO(data), "resume.pdf", pages)
+    return run
+
+def test_same_text_as_serial_extraction(pdf):
+    """Chunked, parallel extraction gives exactly the serial text"""
+    calls = []
+    text = extract_pdf_text(_key(pdf), _runner(pdf, calls), workers=3, chunk_pages=2, max_chars=10**9)
+
+    assert text == extract_text_from_file(io.BytesIO(pdf), "resume.pdf")
+    # First chunk alone (learns the page count), then waves of 3 chunks
+    assert calls[0] == [0, 1]
+    assert sorted(page for chunk in calls for page in chunk) == list(range(12))
+
+def test_stops_at_character_budget(pdf):
+    """No chunks are started once the budget is met; text is cut to it"""
+    calls = []
+    text = extract_pdf_text(_key(pdf), _runner(pdf, calls), workers=1, chunk_pages=2, max_chars=3000)
+
+    assert len(text) == 3000
+    assert extract_text_from_file(io.BytesIO(pdf), "resume.pdf").startswith(text)
+    assert max(page for chunk in calls for page in chunk) < 6
+
+def test_max_pages_caps_the_pages_read(pdf):
+    """Pages past max_pages are never extracted"""
+    calls = []
+    extract_pdf_text(_key(pdf), _runner(pdf, calls), chunk_pages=2, max_pages=3, max_chars=10**9)
+    assert sorted(page for chunk in calls for page in chunk) == [0, 1, 2]
+
+def test_cached_pages_are_not_extracted_again(pdf):
+    """Re-extraction only runs the pages that were not done before"""
+    calls = []
+    first = extract_pdf_text(_key(pdf), _runner(pdf, calls), chunk_pages=2, max_chars=3000)
+    done = {page for chunk in calls for page in chunk}
+
+    calls.clear()
+    again = extract_pdf_text(_key(pdf), _runner(pdf, calls), chunk_pages=2, max_chars=3000)
+    assert again == first
+    assert calls == []
+
+    # A bigger budget only extracts the remaining pages
+    extract_pdf_text(_key(pdf), _runner(pdf, calls), chunk_pages=2, max_chars=10**9)
+    assert sorted(page for chunk in calls for page in chunk) == sorted(set(range(12)) - done)
+
+def test_pages_are_stored_and_read_back_from_mongo(pdf):
+    """Another process (empty memory cache) reuses the stored pages"""
+    collection = MagicMock()
+    collection.find_one.return_value = None
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+
+    text = extract_pdf_text(_key(pdf), _runner(pdf, []), chunk_pages=4, max_chars=10**9, db=db)
+    update = collection.update_one.call_args[0][1]["$set"]
+    assert update["page_count"] == 12
+    assert set(update) >= {f"pages.{i}" for i in range(12)}
+
+    clear_memory_cache()
+    collection.find_one.return_value = {
+        "page_count": 12,
+        "pages": {key.split(".")[1]: value for key, value in update.items() if key.startswith("pages.")},
+    }
+    calls = []
+    assert extract_pdf_text(_key(pdf), _runner(pdf, calls), max_chars=10**9, db=db) == text
+    assert calls == []
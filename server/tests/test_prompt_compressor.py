@@ -0,0 +1,62 @@
+# test_prompt_compressor.py
+
+from utils.prompt_compressor import compress_prompt_inputs, estimate_tokens
+
+SAMPLE_JOB_POSTING = (
+    "We are hiring a backend developer to build Python and Flask APIs. "
+    "You will design MongoDB schemas and write tests with pytest. "
+    "We are an equal opportunity employer. "
+    "We use cookies to improve your experience. "
+    "Our benefits include medical, dental and vision insurance. "
+    "You will design MongoDB schemas and write tests with pytest."
+)
+
+SAMPLE_RESUME = "\n".join([
+    "John Doe",
+    "john@example.com",
+    "SKILLS",
+    "Python, Flask, MongoDB, pytest",
+    "INTERESTS",
+    "Gardening, painting, travelling, cooking, birdwatching",
+    "EXPERIENCE",
+    "Built Flask APIs backed by MongoDB",
+    "Built Flask APIs backed by MongoDB",
+])
+
+def test_estimate_tokens():
+    """Token estimate grows with text length"""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("a" * 400) == 100
+
+def test_boilerplate_and_duplicates_removed():
+    """EEO, cookie and benefits sentences plus repeats are dropped"""
+    job, resume, stats = compress_prompt_inputs(SAMPLE_JOB_POSTING, SAMPLE_RESUME)
+    assert "equal opportunity" not in job
+    assert "cookies" not in job
+    assert "dental" not in job
+    assert job.count("MongoDB schemas") == 1
+    assert resume.count("Built Flask APIs") == 1
+    assert stats["total_after"] < stats["total_before"]
+
+def test_budget_keeps_relevant_resume_sections():
+    """Under a tight budget the header and matching sections survive"""
+    job, resume, stats = compress_prompt_inputs(SAMPLE_JOB_POSTING, SAMPLE_RESUME, token_budget=60)
+    assert resume.startswith("John Doe")
+    assert "Python, Flask, MongoDB, pytest" in resume
+    assert "Gardening" not in resume
+    assert stats["total_after"] <= 60
+
+def test_duties_on_boilerplate_topics_are_kept():
+    """Only boilerplate wording is dropped, not duties that mention the same topics"""
+    duties = [
+        "Experience securing HTTP cookies and sessions.",
+        "Run background checks on new vendors.",
+        "Administer PTO requests and employee benefits.",
+        "Build the apply now flow for our careers site.",
+        "Update our privacy policy for GDPR.",
+    ]
+    job, _, _ = compress_prompt_inputs(" ".join(duties + ["Apply now!"]), "Resume")
+    for duty in duties:
+        assert duty in job
+    assert "Apply now!" not in job
@@ -0,0 +1,108 @@
+# test_rate_limiter.py
+
+import threading
+import time
+
+import pytest
+
+from utils.rate_limiter import (
+    AdmissionController,
+    MemoryBucketStore,
+    OverloadedError,
+    RateLimiter,
+    RateLimitExceeded,
+)
+
+def test_user_bucket_allows_burst_then_limits():
+    """A user can burst up to capacity, then gets a retry-after"""
+    limiter = RateLimiter(MemoryBucketStore(), user_per_minute=60, user_burst=3, global_per_minute=600, global_burst=100)
+    for _ in range(3):
+        limiter.check("u1")
+
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.check("u1")
+    assert exc.value.scope == "user"
+    assert 0 < exc.value.retry_after <= 1.0
+
+    # Other users have their own bucket
+    limiter.check("u2")
+
+def test_global_bucket_limits_all_users():
+    """The shared bucket caps the total across users"""
+    limiter = RateLimiter(MemoryBucketStore(), user_per_minute=60, user_burst=5, global_per_minute=60, global_burst=2)
+    limiter.check("a")
+    limiter.check("b")
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.check("c")
+    assert exc.value.scope == "global"
+
+def test_bucket_refills_over_time():
+    """Tokens come back at the configured rate"""
+    store = MemoryBucketStore()
+    assert store.take("k", capacity=1, rate=50, cost=1)[0]
+    assert not store.take("k", capacity=1, rate=50, cost=1)[0]
+    time.sleep(0.05)
+    assert store.take("k", capacity=1, rate=50, cost=1)[0]
+
+def test_cost_above_capacity_is_refused():
+    """A batch larger than the burst size could bypass the limit, so it is refused"""
+    limiter = RateLimiter(MemoryBucketStore(), user_per_minute=60, user_burst=3, global_per_minute=600, global_burst=100)
+    assert limiter.max_cost() == 3
+    with pytest.raises(ValueError):
+        limiter.check("u1", cost=10)
+    limiter.check("u1", cost=3)
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("u1")
+
+def test_batches_spend_their_own_bucket():
+    """A batch can be bigger than the single-letter burst and doesn't use it up"""
+    limiter = RateLimiter(MemoryBucketStore(), user_per_minute=60, user_burst=3, batch_per_minute=60,
+                          batch_burst=10, global_per_minute=600, global_burst=100)
+    assert limiter.max_cost("batch") == 10
+    limiter.check("u1", cost=10, scope="batch")
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.check("u1", scope="batch")
+    assert exc.value.scope == "batch"
+    limiter.check("u1", cost=3)
+
+def test_default_limits_fit_a_full_batch():
+    """The default batch burst admits BATCH_MAX_POSTINGS postings at once"""
+    from routes.cover_letter.routes import BATCH_MAX_POSTINGS
+    limiter = RateLimiter(MemoryBucketStore())
+    assert limiter.max_cost("batch") >= BATCH_MAX_POSTINGS
+    limiter.check("u1", cost=10, scope="batch")
+
+def test_global_rejection_gives_user_tokens_back():
+    """Turned away by the shared bucket, the user keeps their quota"""
+    store = MemoryBucketStore()
+    limiter = RateLimiter(store, user_per_minute=0, user_burst=2, global_per_minute=0, global_burst=1)
+    limiter.check("a")
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.check("b")
+    assert exc.value.scope == "global"
+    assert store.take("user:b", capacity=2, rate=0, cost=2)[0]
+
+def test_admission_sheds_after_timeout():
+    """Callers past the in-flight cap wait briefly, then are shed"""
+    admission = AdmissionController(max_in_flight=1, timeout_seconds=0.05)
+    release = threading.Event()
+
+    def hold_slot():
+        with admission.slot():
+            release.wait(1)
+
+    holder = threading.Thread(target=hold_slot)
+    holder.start()
+    time.sleep(0.02)
+
+    with pytest.raises(OverloadedError) as exc:
+        with admission.slot():
+            pass
+    assert exc.value.retry_after >= 1
+    assert admission.rejected == 1
+
+    release.set()
+    holder.join()
+    with admission.slot():
+        assert admission.in_flight == 1
+    assert admission.in_flight == 0
@@ -0,0 +1,108 @@
+# test_resume_digest.py
+
+from utils.resume_digest import (
+    DIGEST_VERSION,
+    build_resume_digest,
+    normalize_skills,
+    split_sections,
+)
+from utils.cover_letter_generator import _build_prompt
+
+SAMPLE_RESUME = "\n".join([
+    "Jane Smith",
+    "jane.smith@example.com | (555) 123-4567 | linkedin.com/in/janesmith",
+    "SUMMARY",
+    "Backend developer focused on APIs and data pipelines.",
+    "TECHNICAL SKILLS",
+    "Languages: Python, JS, TypeScript; Frameworks: Flask, ReactJS",
+    "Postgres | mongo | k8s",
+    "EXPERIENCE",
+    "Software Developer, Acme Corp (2022 - Present)",
+    "- Built Flask APIs deployed with Docker on AWS",
+    "- Built Flask APIs deployed with Docker on AWS",
+    "EDUCATION",
+    "B.Sc. Computer Science, Centennial College",
+    "INTERESTS",
+    "Hiking, chess",
+])
+
+def test_split_sections():
+    """Lines are grouped under canonical section names in order"""
+    names = [name for name, _ in split_sections(SAMPLE_RESUME)]
+    assert names == ["contact", "summary", "skills", "experience", "education", "interests"]
+
+def test_normalize_skills():
+    """Aliases map to canonical names and duplicates are dropped"""
+    skills = normalize_skills("Languages: Python, JS, py; Postgres | mongo | k8s")
+    assert skills == ["Python", "JavaScript", "PostgreSQL", "MongoDB", "Kubernetes"]
+
+def test_build_resume_digest():
+    """Digest holds contact info, skills, summary and a compact text"""
+    digest = build_resume_digest(SAMPLE_RESUME)
+
+    assert digest["version"] == DIGEST_VERSION
+    assert digest["contact"]["name"] == "Jane Smith"
+    assert digest["contact"]["email"] == "jane.smith@example.com"
+    assert "linkedin.com/in/janesmith" in digest["contact"]["links"]
+
+    # Skills mentioned only in experience bullets are picked up too
+    for skill in ["Python", "React", "PostgreSQL", "Docker", "AWS"]:
+        assert skill in digest["skills"]
+
+    assert "Most recent role: Software Developer, Acme Corp" in digest["summary"]
+    assert digest["compact_text"].count("Built Flask APIs") == 1
+    assert "Hiking" not in digest["compact_text"]
+    assert len(digest["compact_text"]) < len(SAMPLE_RESUME)
+
+def test_prompt_includes_digest():
+    """The prompt carries the candidate snapshot when a digest is given"""
+    digest = build_resume_digest(SAMPLE_RESUME)
+    user_info = {"name": "Jane", "email": "j@e.com", "city": "", "postal_code": "", "country": ""}
+    prompt = _build_prompt(
+        job_posting="Job", user_info=user_info, resume=digest["compact_text"],
+        tone="professional", user_prompt="", context="", current_date="today",
+        resume_digest=digest
+    )
+    assert "CANDIDATE SNAPSHOT" in prompt
+    assert "Key skills: Python" in prompt
+
+    prompt = _build_prompt(
+        job_posting="Job", user_info=user_info, resume="Resume",
+        tone="professional", user_prompt="", context="", current_date="today"
+    )
+    assert "CANDIDATE SNAPSHOT" not in prompt
+
+def test_resume_without_headings_is_kept_whole():
+    """Unrecognized layouts fall back to the full text rather than losing it"""
+    resume = "\n".join([
+        "John Doe",
+        "john@example.com",
+        "Backend developer with six years of Python and Flask experience.",
+        "Led the rewrite of the billing service at Initech.",
+        "Mentored four junior developers and ran code reviews.",
+    ])
+    digest = build_resume_digest(resume)
+    for line in resume.splitlines():
+        assert line in digest["compact_text"]
+    assert "Python" in digest["skills"]
+
+def test_all_caps_employers_stay_in_experience():
+    """Employer names in capitals are not mistaken for section headings"""
+    resume = "\n".join([
+        "JANE SMITH",
+        "jane@example.com",
+        "EXPERIENCE",
+        "ACME CORP",
+        "- Built payment APIs in Python",
+        "IBM CANADA",
+        "- Maintained the internal build system",
+        "EDUCATION",
+        "B.Sc. Computer Science",
+    ])
+    names = [name for name, _ in split_sections(resume)]
+    assert names == ["contact", "experience", "education"]
+
+    digest = build_resume_digest(resume)
+    assert digest["contact"]["name"] == "JANE SMITH"
+    assert "IBM CANADA" in digest["sections"]["experience"]
+    assert "Maintained the internal build system" in digest["compact_text"]
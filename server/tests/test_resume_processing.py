@@ -0,0 +1,58 @@
+# test_resume_processing.py
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import utils.resume_processing as resume_processing
+from utils.extraction_pool import ExtractionTimeout
+from utils.resume_processing import process_resume, resume_status
+
+TEXT = "Jane Doe\nSkills\nPython, Flask, MongoDB\nExperience\nBuilt APIs at Acme"
+
+@pytest.fixture
+def db():
+    db = MagicMock()
+    db.user_resume.find_one_and_update.return_value = {"_id": "r1", "file_name": "resume.pdf"}
+    return db
+
+def _recorded(db):
+    """The $set written when processing finished"""
+    query, update = db.user_resume.update_one.call_args[0]
+    assert query == {"_id": "r1", "status": "processing"}
+    return update["$set"]
+
+def test_resume_status_of_old_and_stale_documents():
+    """Resumes from before background processing are ready; lost ones fail"""
+    assert resume_status({"resume_text": "x"}) == ("ready", None)
+    stale = {"status": "processing", "updated_at": datetime.utcnow() - timedelta(hours=1)}
+    assert resume_status(stale)[0] == "failed"
+    fresh = {"status": "pending", "updated_at": datetime.utcnow()}
+    assert resume_status(fresh) == ("pending", None)
+
+def test_process_resume_stores_text_and_digest(db, monkeypatch):
+    monkeypatch.setattr(resume_processing, "_extract", lambda db, doc: TEXT)
+    assert process_resume(db, "r1") == "ready"
+
+    claim, _ = db.user_resume.find_one_and_update.call_args[0]
+    assert claim == {"_id": "r1", "status": "pending"}
+    update = _recorded(db)
+    assert update["resume_text"] == TEXT
+    assert "Python" in update["resume_digest"]["skills"]
+
+def test_process_resume_records_failures(db, monkeypatch):
+    def timeout(db, doc):
+        raise ExtractionTimeout("too slow")
+    monkeypatch.setattr(resume_processing, "_extract", timeout)
+
+    assert process_resume(db, "r1") == "failed"
+    update = _recorded(db)
+    assert "too long" in update["error"]
+    assert "resume_text" not in update
+
+def test_process_resume_runs_once(db):
+    """A resume that is no longer pending is left alone"""
+    db.user_resume.find_one_and_update.return_value = None
+    assert process_resume(db, "r1") is None
+    db.user_resume.update_one.assert_not_called()
@@ -0,0 +1,94 @@
+# test_resume_store.py
+
+from unittest.mock import MagicMock
+
+from utils.resume_store import (
+    acquire_resume_file,
+    find_resume_by_hash,
+    is_same_file,
+    register_resume_file,
+    release_resume,
+)
+
+class FakeBlobs:
+    """resume_blobs with the atomic $inc semantics the store relies on"""
+    def __init__(self):
+        self.refs = {}
+
+    def insert_one(self, doc):
+        self.refs[doc["_id"]] = doc["refs"]
+
+    def find_one_and_update(self, query, update, **kwargs):
+        file_id = query["_id"]
+        if file_id not in self.refs or ("refs" in query and self.refs[file_id] <= 0):
+            return None
+        self.refs[file_id] += update["$inc"]["refs"]
+        return {"_id": file_id, "refs": self.refs[file_id]}
+
+    def delete_one(self, query):
+        if self.refs.get(query["_id"], 1) <= 0:
+            del self.refs[query["_id"]]
+
+def _db_with_blobs(*file_ids):
+    db, blobs = MagicMock(), FakeBlobs()
+    db.__getitem__.side_effect = lambda name: blobs
+    for file_id in file_ids:
+        register_resume_file(db, file_id)
+    return db, blobs
+
+def test_is_same_file_needs_hash_and_extension():
+    """The same bytes under another extension extract differently"""
+    doc = {"content_hash": "abc", "file_name": "resume.pdf"}
+    assert is_same_file(doc, "abc", "cv.PDF")
+    assert not is_same_file(doc, "abc", "resume.txt")
+    assert not is_same_file(doc, "def", "resume.pdf")
+    assert not is_same_file(None, "abc", "resume.pdf")
+
+def test_find_resume_by_hash_skips_other_extensions():
+    db = MagicMock()
+    db.user_resume.find.return_value.limit.return_value = [
+        {"file_name": "a.txt", "resume_text": "x", "resume_file": 1},
+        {"file_name": "b.pdf", "resume_text": "y", "resume_file": 2},
+    ]
+    assert find_resume_by_hash(db, "abc", "resume.pdf")["resume_file"] == 2
+    assert db.user_resume.find.call_args[0][0] == {"content_hash": "abc"}
+
+def test_release_keeps_files_still_in_use():
+    """A GridFS file shared with another resume is not deleted"""
+    db, blobs = _db_with_blobs("f1")
+    fs = MagicMock()
+    assert acquire_resume_file(db, "f1")
+    release_resume(db, fs, {"_id": "r1", "resume_file": "f1"})
+
+    db.user_resume.delete_one.assert_called_once_with({"_id": "r1"})
+    fs.delete.assert_not_called()
+    assert blobs.refs == {"f1": 1}
+
+def test_release_deletes_last_reference():
+    db, blobs = _db_with_blobs("f1")
+    fs = MagicMock()
+    release_resume(db, fs, {"_id": "r1", "resume_file": "f1"})
+    fs.delete.assert_called_once_with("f1")
+    assert blobs.refs == {}
+
+def test_upload_racing_the_last_release_gets_no_reference():
+    """
+    A dedup hit found before another user's release deleted the file can't
+    take a reference afterwards, so the upload stores its own copy.
+    """
+    db, _ = _db_with_blobs("f1")
+    fs = MagicMock()
+    db.user_resume.find.return_value.limit.return_value = [
+        {"file_name": "a.pdf", "resume_text": "x", "resume_file": "f1"},
+    ]
+    stored = find_resume_by_hash(db, "abc", "resume.pdf")          # upload: dedup hit
+    release_resume(db, fs, {"_id": "r1", "resume_file": "f1"})      # other user: last release
+    fs.delete.assert_called_once_with("f1")
+    assert not acquire_resume_file(db, stored["resume_file"])      # upload: must store again
+
+def test_release_leaves_untracked_files():
+    """Files from before the counts existed are never deleted by a release"""
+    db, _ = _db_with_blobs()
+    fs = MagicMock()
+    release_resume(db, fs, {"_id": "r1", "resume_file": "legacy"})
+    fs.delete.assert_not_called()
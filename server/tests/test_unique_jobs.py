@@ -0,0 +1,94 @@
+# test_unique_jobs.py
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+import utils.unique_jobs as unique_jobs
+from utils.unique_jobs import (
+    get_unique_jobs_page,
+    rebuild_unique_jobs,
+    record_job_added,
+    record_job_removed,
+)
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    unique_jobs._page_cache.clear()
+    yield
+    unique_jobs._page_cache.clear()
+
+def _view(db):
+    return db[unique_jobs.UNIQUE_JOBS_COLLECTION]
+
+def test_added_job_upserts_its_count():
+    db = MagicMock()
+    seen = datetime(2025, 1, 1)
+    record_job_added(db, "Engineer", "https://jobs/1", seen)
+
+    query, update = _view(db).update_one.call_args[0]
+    assert query == {"_id": {"job_title": "Engineer", "url": "https://jobs/1"}}
+    assert update["$inc"] == {"count": 1}
+    assert update["$max"] == {"last_seen": seen}
+    assert _view(db).update_one.call_args[1]["upsert"] is True
+
+def test_jobs_without_title_or_url_are_not_counted():
+    db = MagicMock()
+    record_job_added(db, None, "https://jobs/1")
+    record_job_removed(db, "Engineer", None)
+    _view(db).update_one.assert_not_called()
+
+def test_removed_job_is_dropped_when_no_history_has_it():
+    db = MagicMock()
+    record_job_removed(db, "Engineer", "https://jobs/1")
+
+    key = {"_id": {"job_title": "Engineer", "url": "https://jobs/1"}}
+    _view(db).update_one.assert_called_once_with(key, {"$inc": {"count": -1}})
+    _view(db).delete_one.assert_called_once_with({**key, "count": {"$lte": 0}})
+
+def test_view_failures_do_not_raise():
+    db = MagicMock()
+    _view(db).update_one.side_effect = RuntimeError("down")
+    record_job_added(db, "Engineer", "https://jobs/1")
+    record_job_removed(db, "Engineer", "https://jobs/1")
+
+def test_rebuild_groups_history_into_the_view():
+    db = MagicMock()
+    _view(db).count_documents.return_value = 3
+    assert rebuild_unique_jobs(db) == 3
+
+    pipeline = db.job_history.aggregate.call_args[0][0]
+    assert pipeline[1]["$group"]["_id"] == {"job_title": "$job_title", "url": "$url"}
+    assert pipeline[-1] == {"$out": unique_jobs.UNIQUE_JOBS_COLLECTION}
+
+def _page_db(docs):
+    db = MagicMock()
+    _view(db).find.return_value.sort.return_value.limit.return_value = docs
+    return db
+
+def test_page_maps_titles_to_most_recent_url():
+    db = _page_db([
+        {"_id": 1, "job_title": "Engineer", "url": "https://jobs/new", "last_seen": 2},
+        {"_id": 2, "job_title": "Engineer", "url": "https://jobs/old", "last_seen": 1},
+        {"_id": 3, "job_title": "Designer", "url": "https://jobs/3", "last_seen": 1},
+    ])
+    jobs, next_cursor = get_unique_jobs_page(db, limit=5)
+    assert jobs == {"Engineer": "https://jobs/new", "Designer": "https://jobs/3"}
+    assert next_cursor is None
+    assert _view(db).find.return_value.sort.call_args[0][0] == unique_jobs.UNIQUE_JOBS_SORT
+
+def test_pages_are_cached_until_the_view_changes():
+    db = _page_db([{"_id": 1, "job_title": "Engineer", "url": "https://jobs/1", "last_seen": 1}])
+    get_unique_jobs_page(db, limit=5)
+    get_unique_jobs_page(db, limit=5)
+    assert _view(db).find.call_count == 1
+
+    record_job_added(db, "Designer", "https://jobs/2")
+    get_unique_jobs_page(db, limit=5)
+    assert _view(db).find.call_count == 2
+
+def test_retitle_without_change_does_nothing():
+    db = MagicMock()
+    unique_jobs.record_job_retitled(db, "Engineer", "Engineer", "https://jobs/1")
+    _view(db).update_one.assert_not_called()
@@ -0,0 +1,59 @@
+# test_upload_spool.py
+
+import hashlib
+import io
+import os
+import tracemalloc
+
+import pytest
+
+from utils.upload_spool import HEAD_BYTES, SpooledUpload, UploadTooLarge
+
+class _ChunkedStream:
+    """Request-like stream that produces `size` bytes without holding them"""
+    def __init__(self, size):
+        self.remaining = size
+
+    def read(self, n):
+        n = min(n, self.remaining)
+        self.remaining -= n
+        return b"x" * n
+
+def test_small_upload_stays_in_memory():
+    """Files under the threshold are never written to disk"""
+    data = b"%PDF-1.4 small resume"
+    with SpooledUpload(io.BytesIO(data), memory_bytes=1024) as upload:
+        assert upload.path is None
+        assert upload.source() == data
+        assert upload.head == data
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        with upload.open() as file:
+            assert file.read() == data
+
+def test_large_upload_goes_to_disk_and_is_deleted():
+    """Bigger files are spooled to a temp file that close() removes"""
+    data = os.urandom(300 * 1024)
+    upload = SpooledUpload(io.BytesIO(data), memory_bytes=64 * 1024)
+    try:
+        assert upload.source() == upload.path
+        assert upload.size == len(data)
+        assert upload.head == data[:HEAD_BYTES]
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        with upload.open() as file:
+            assert file.read() == data
+    finally:
+        upload.close()
+    assert not os.path.exists(upload.path)
+
+def test_too_large_upload_is_rejected():
+    """Reading stops as soon as the size limit is passed"""
+    with pytest.raises(UploadTooLarge):
+        SpooledUpload(_ChunkedStream(2 * 1024 * 1024), max_bytes=1024 * 1024, memory_bytes=1024)
+
+def test_peak_memory_does_not_grow_with_file_size():
+    """Spooling 20 MB holds about one chunk plus the in-memory threshold"""
+    tracemalloc.start()
+    with SpooledUpload(_ChunkedStream(20 * 1024 * 1024), max_bytes=32 * 1024 * 1024, memory_bytes=256 * 1024):
+        _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 1024 * 1024
@@ -0,0 +1,167 @@
+"""
+Cover Letter Cache
+Two-tier, content-addressed cache for generated cover letters:
+an in-process LRU with TTL in front of a MongoDB collection shared by all workers.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from utils.metrics import CACHE_EVENTS, timed_stage
+from utils.ttl_cache import TTLCache
+
+CACHE_ENABLED = os.getenv("COVER_LETTER_CACHE_ENABLED", "true").lower() == "true"
+CACHE_TTL_SECONDS = int(os.getenv("COVER_LETTER_CACHE_TTL_SECONDS", "86400"))
+CACHE_MAX_ENTRIES = int(os.getenv("COVER_LETTER_CACHE_MAX_ENTRIES", "512"))
+CACHE_COLLECTION = "cover_letter_cache"
+
+# Bump when the prompt template changes so old letters are not served
+CACHE_KEY_VERSION = 2
+
+_memory_cache = TTLCache(max_size=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS)
+
+_stats_lock = threading.Lock()
+_stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0, "stores": 0}
+
+
+def make_cache_key(
+    user_info: dict,
+    job_posting: str,
+    resume: str,
+    tone: str,
+    user_prompt: str = "",
+    job_title: str = None,
+    company_name: str = None,
+    resume_digest: dict = None
+) -> str:
+    """
+    Build a SHA-256 key from everything that shapes the generated letter.
+    The current date is part of the key because it is printed in the letter.
+    """
+    payload = {
+        "v": CACHE_KEY_VERSION,
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "job_posting": job_posting,
+        "resume": resume,
+        "tone": tone,
+        "user_prompt": user_prompt or "",
+        "job_title": job_title,
+        "company_name": company_name,
+        "resume_digest": resume_digest,
+        "user_info": {k: user_info.get(k) for k in sorted(user_info)},
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_cached_cover_letter(key: str, db=None) -> tuple[str | None, str | None]:
+    """
+    Look up a cached letter.
+
+    Returns:
+        tuple: (markdown or None, tier that served it: "memory", "mongo" or None)
+    """
+    if not CACHE_ENABLED:
+        return None, None
+
+    markdown = _memory_cache.get(key)
+    if markdown is not None:
+        _record("memory_hits")
+        return markdown, "memory"
+
+    if db is not None:
+        try:
+            with timed_stage("cache_lookup"):
+                doc = db[CACHE_COLLECTION].find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.utcnow()}},
+                    {"markdown": 1}
+                )
+        except Exception as e:
+            # The cache must never break generation
+            print(f"Cover letter cache lookup failed: {e}")
+            doc = None
+
+        if doc and doc.get("markdown"):
+            # Promote to the in-process tier for the next hit
+            _memory_cache.set(key, doc["markdown"])
+            _record("mongo_hits")
+            return doc["markdown"], "mongo"
+
+    _record("misses")
+    return None, None
+
+
+def store_cover_letter(key: str, markdown: str, db=None) -> None:
+    """Store a freshly generated letter in both cache tiers."""
+    if not CACHE_ENABLED or not markdown:
+        return
+
+    _memory_cache.set(key, markdown)
+    _record("stores")
+
+    if db is None:
+        return
+
+    now = datetime.utcnow()
+    try:
+        db[CACHE_COLLECTION].update_one(
+            {"_id": key},
+            {"$set": {
+                "markdown": markdown,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=CACHE_TTL_SECONDS),
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Cover letter cache store failed: {e}")
+
+
+def get_or_generate_cover_letter(generation_args: dict, db=None, skip_cache: bool = False) -> tuple[str, str | None]:
+    """
+    Serve a letter from the cache or generate (and cache) a new one.
+
+    Args:
+        generation_args (dict): Keyword arguments for generate_cover_letter
+        db: MongoDB database for the shared tier (optional)
+        skip_cache (bool): Always call the model, but still refresh the cache
+
+    Returns:
+        tuple: (markdown, cache tier that served it or None if freshly generated)
+    """
+    from utils.cover_letter_generator import generate_cover_letter
+
+    key = make_cache_key(**generation_args)
+    if not skip_cache:
+        markdown, tier = get_cached_cover_letter(key, db)
+        if markdown is not None:
+            return markdown, tier
+
+    markdown = generate_cover_letter(**generation_args)
+    store_cover_letter(key, markdown, db)
+    return markdown, None
+
+
+def get_cache_stats() -> dict:
+    """Return hit/miss counters for this process."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["memory_hits"] + stats["mongo_hits"] + stats["misses"]
+    stats["hit_ratio"] = (
+        (stats["memory_hits"] + stats["mongo_hits"]) / lookups if lookups else 0.0
+    )
+    stats["memory_entries"] = len(_memory_cache)
+    return stats
+
+
+def clear_memory_cache() -> None:
+    _memory_cache.clear()
+
+
+def _record(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+    CACHE_EVENTS.labels(event=counter).inc()
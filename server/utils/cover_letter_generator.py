@@ -1,22 +1,22 @@
 """
 Cover Letter Generation Utility
-Handles AI-powered cover letter generation using Google Gemini API
+Handles AI-powered cover letter generation through the configured LLM backend
+(Google Gemini by default, see utils/llm_backends.py)
 """
 
-import google.generativeai as genai
-import os
 import re
 from datetime import datetime
+from typing import Iterator
 
-# Initialize Gemini
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+from utils.llm_backends import LLMBackend, get_backend
+from utils.llm_client import LLMUnavailableError
+from utils.metrics import record_llm_tokens, timed_stage
+from utils.prompt_compressor import estimate_tokens
+from utils.rate_limiter import llm_admission
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel("gemini-2.5-flash-lite")
-else:
-    model = None
-    print("WARNING: GEMINI_API_KEY not set - cover letter generation will fail")
+# Longest job posting / resume text accepted for generation (characters)
+MAX_JOB_POSTING_CHARS = 50000
+MAX_RESUME_CHARS = 50000
 
 
 def generate_cover_letter(
@@ -26,7 +26,9 @@ def generate_cover_letter(
     tone: str = "professional",
     user_prompt: str = "",
     job_title: str = None,
-    company_name: str = None
+    company_name: str = None,
+    resume_digest: dict = None,
+    backend: LLMBackend = None
 ) -> str:
     """
     Generates an AI-powered cover letter using Gemini.
@@ -38,16 +40,113 @@ def generate_cover_letter(
         user_prompt (str): Additional instructions from the user
         job_title (str, optional): Job title for more context
         company_name (str, optional): Company name for more context
+        resume_digest (dict, optional): Precomputed digest of the resume
+            (see utils/resume_digest.py); adds a skills/summary block to the prompt
+        backend (LLMBackend, optional): Model backend, defaults to get_backend()
     
     Returns:
         str: Generated cover letter in HTML format
         
     Raises:
+        LLMUnavailableError: If the model is overloaded, timing out or unhealthy
         Exception: If Gemini API is not configured or generation fails
     """
-    if not model:
-        raise Exception("Gemini API not configured. Please set GEMINI_API_KEY environment variable.")
+    backend = backend or get_backend()
+    backend.check_configured()
+
+    prompt = _prepare_prompt(
+        user_info=user_info,
+        job_posting=job_posting,
+        resume=resume,
+        tone=tone,
+        user_prompt=user_prompt,
+        job_title=job_title,
+        company_name=company_name,
+        resume_digest=resume_digest
+    )
     
+    try:
+        # Wait briefly for a free model call slot, or shed the request
+        with llm_admission.slot(), timed_stage("llm_generate"):
+            generated_text = backend.generate(prompt).strip()
+        record_llm_tokens(estimate_tokens(prompt), estimate_tokens(generated_text))
+        
+        # Clean up the response (remove markdown code blocks if present)
+        generated_text = clean_response(generated_text)
+        
+        return generated_text
+    except LLMUnavailableError:
+        # Timeouts / open circuit: let callers answer 503/504 with Retry-After
+        raise
+    except Exception as e:
+        raise Exception(f"Gemini API error: {str(e)}")
+
+
+def stream_cover_letter(
+    user_info: dict,
+    job_posting: str,
+    resume: str,
+    tone: str = "professional",
+    user_prompt: str = "",
+    job_title: str = None,
+    company_name: str = None,
+    resume_digest: dict = None,
+    backend: LLMBackend = None
+) -> Iterator[str]:
+    """
+    Streams an AI-powered cover letter from Gemini as it is generated.
+    
+    Takes the same arguments as generate_cover_letter.
+    
+    Yields:
+        str: Raw Markdown text chunks in generation order. Join them and pass
+        the result through clean_response to get the final letter.
+        
+    Raises:
+        LLMUnavailableError: If the model is overloaded, timing out or unhealthy
+        Exception: If Gemini API is not configured or generation fails
+    """
+    backend = backend or get_backend()
+    backend.check_configured()
+
+    prompt = _prepare_prompt(
+        user_info=user_info,
+        job_posting=job_posting,
+        resume=resume,
+        tone=tone,
+        user_prompt=user_prompt,
+        job_title=job_title,
+        company_name=company_name,
+        resume_digest=resume_digest
+    )
+    
+    try:
+        parts = []
+        with llm_admission.slot(), timed_stage("llm_stream"):
+            for chunk in backend.stream(prompt):
+                parts.append(chunk)
+                yield chunk
+        record_llm_tokens(estimate_tokens(prompt), estimate_tokens("".join(parts)))
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise Exception(f"Gemini API error: {str(e)}")
+
+
+def _prepare_prompt(
+    user_info: dict,
+    job_posting: str,
+    resume: str,
+    tone: str,
+    user_prompt: str,
+    job_title: str,
+    company_name: str,
+    resume_digest: dict = None
+) -> str:
+    """
+    Builds the full prompt (job context + current date) shared by the
+    blocking and streaming paths.
+    """
     # Build context string if we have job title or company
     context = ""
     if job_title or company_name:
@@ -68,22 +167,14 @@ def generate_cover_letter(
         tone=tone,
         user_prompt=user_prompt,
         context=context,
-        current_date=current_date
+        current_date=current_date,
+        resume_digest=resume_digest
     )
     
-    try:
-        response = model.generate_content(prompt)
-        generated_text = response.text.strip()
-        
-        # Clean up the response (remove markdown code blocks if present)
-        generated_text = _clean_response(generated_text)
-        
-        return generated_text
-    except Exception as e:
-        raise Exception(f"Gemini API error: {str(e)}")
+    return prompt
 
 
-def _clean_response(text: str) -> str:
+def clean_response(text: str) -> str:
     """
     Removes unwanted code fences or extra whitespace without breaking Markdown structure.
     """
@@ -104,7 +195,8 @@ def _build_prompt(
     tone: str,
     user_prompt: str,
     context: str,
-    current_date: str
+    current_date: str,
+    resume_digest: dict = None
 ) -> str:
     """
     Builds a clean, consistent Markdown prompt for Gemini.
@@ -120,6 +212,16 @@ def _build_prompt(
 
     tone_description = tone_guidelines.get(tone, "professional")
 
+    # Precomputed at upload time, so the model gets the highlights up front
+    # and the resume below can be the compact digest text
+    candidate_snapshot = ""
+    if resume_digest:
+        candidate_snapshot = f"""
+    CANDIDATE SNAPSHOT:
+    {resume_digest.get('summary') or 'None'}
+    Key skills: {', '.join(resume_digest.get('skills') or []) or 'None'}
+"""
+
     prompt = f"""
     You are an expert career writer. Write a professional cover letter in **Markdown format** following the exact structure below. Do not change the structure, only fill in content based on the resume and job posting.
 
@@ -161,7 +263,7 @@ def _build_prompt(
         "postal_code": "{user_info['postal_code']}",
         "country": "{user_info['country']}"
     }}
-
+{candidate_snapshot}
     RESUME:
     {resume}
 
@@ -198,10 +300,10 @@ def validate_inputs(job_posting: str, resume: str) -> tuple[bool, str]:
     if not resume or len(resume.strip()) < 100:
         return False, "Resume is too short or missing. Please upload a valid resume."
     
-    if len(job_posting) > 50000:
+    if len(job_posting) > MAX_JOB_POSTING_CHARS:
         return False, "Job posting is too long. Please provide a shorter description."
     
-    if len(resume) > 50000:
+    if len(resume) > MAX_RESUME_CHARS:
         return False, "Resume is too long. Please provide a more concise resume."
     
     return True, ""
@@ -0,0 +1,264 @@
+"""
+Extraction Pool
+Runs resume text extraction (PyPDF2 / python-docx) in a small pool of worker
+processes instead of the request thread, so a huge or malformed file can't
+pin the web worker's CPU or memory.
+
+Each file gets a wall-clock limit; a worker that overruns it is killed and
+replaced, which also cancels the extraction. Workers run under a memory
+limit (RLIMIT_AS) and only read the first RESUME_EXTRACT_MAX_PAGES pages of
+a PDF. At most RESUME_EXTRACT_WORKERS extractions run at once per server
+process; callers wait RESUME_EXTRACT_QUEUE_SECONDS for a free worker.
+PDFs are split into page ranges that run on several workers at once (see
+utils/pdf_extraction.py).
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no memory limit
+    resource = None
+
+from utils.files_utils import extract_pdf_pages, extract_text_from_file
+from utils.metrics import RESUME_EXTRACTIONS
+from utils.pdf_extraction import extract_pdf_text
+
+RESUME_EXTRACT_POOL_ENABLED = os.getenv("RESUME_EXTRACT_POOL_ENABLED", "true").lower() == "true"
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "2"))
+RESUME_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("RESUME_EXTRACT_TIMEOUT_SECONDS", "20"))
+RESUME_EXTRACT_QUEUE_SECONDS = float(os.getenv("RESUME_EXTRACT_QUEUE_SECONDS", "10"))
+RESUME_EXTRACT_MEMORY_MB = int(os.getenv("RESUME_EXTRACT_MEMORY_MB", "512"))
+RESUME_EXTRACT_MAX_PAGES = int(os.getenv("RESUME_EXTRACT_MAX_PAGES", "30"))
+
+# Workers are started fresh rather than forked from a threaded web worker
+_mp = multiprocessing.get_context("spawn")
+
+
+class ExtractionError(Exception):
+    """Text could not be extracted from the file."""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Extraction ran past its wall-clock limit and was cancelled."""
+
+
+class ExtractionBusy(ExtractionError):
+    """Every worker stayed busy for the whole queue wait."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _worker_main(conn, memory_bytes: int) -> None:
+    """Worker process loop: receive (func, source, filename, args), send back func's result."""
+    if resource is not None and memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+    while True:
+        try:
+            func, source, filename, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            with _open_source(source) as file:
+                result = func(file, filename, *args)
+            conn.send(("ok", result))
+        except MemoryError:
+            # The heap may be in a bad state: report and let the pool replace us
+            conn.send(("fatal", "Resume file needs too much memory to read"))
+            return
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _Worker:
+    def __init__(self, memory_bytes: int):
+        self.conn, child_conn = _mp.Pipe()
+        self.process = _mp.Process(
+            target=_worker_main, args=(child_conn, memory_bytes), name="resume-extract", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Fixed number of extraction worker processes, started on first use."""
+
+    def __init__(
+        self,
+        workers: int = RESUME_EXTRACT_WORKERS,
+        timeout: float = RESUME_EXTRACT_TIMEOUT_SECONDS,
+        queue_timeout: float = RESUME_EXTRACT_QUEUE_SECONDS,
+        memory_mb: int = RESUME_EXTRACT_MEMORY_MB,
+        max_pages: int = RESUME_EXTRACT_MAX_PAGES,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self.max_pages = max_pages
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def extract(self, source: bytes | str, filename: str, func=extract_text_from_file, args: tuple = None,
+                timeout: float = None):
+        """
+        Extract text from an uploaded file in a worker process. source is the
+        file's bytes, or the path of a file the worker reads itself.
+        func must be a module-level function taking (file, filename, *args);
+        args defaults to (max_pages,). timeout is the wall-clock limit for this
+        call (default: the pool's per-file limit).
+
+        Raises:
+            ExtractionTimeout: the file took longer than the wall-clock limit
+            ExtractionBusy: no worker became free within the queue wait
+            ExtractionError: the worker failed or died (e.g. memory limit)
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            RESUME_EXTRACTIONS.labels(result="busy").inc()
+            raise ExtractionBusy("Resume processing is busy. Please try again shortly.", self.timeout)
+
+        worker = None
+        try:
+            worker = self._checkout()
+            worker.conn.send((func, source, filename, args if args is not None else (self.max_pages,)))
+
+            if not worker.conn.poll(self.timeout if timeout is None else timeout):
+                worker.kill()
+                worker = None
+                RESUME_EXTRACTIONS.labels(result="timeout").inc()
+                raise ExtractionTimeout(
+                    f"Resume text extraction took longer than {self.timeout:g} seconds"
+                )
+
+            try:
+                status, result = worker.conn.recv()
+            except (EOFError, OSError):
+                # Killed by the memory limit or crashed outright
+                worker.kill()
+                worker = None
+                RESUME_EXTRACTIONS.labels(result="crashed").inc()
+                raise ExtractionError("Resume file could not be processed")
+
+            if status == "fatal":
+                worker.kill()
+                worker = None
+            if status != "ok":
+                RESUME_EXTRACTIONS.labels(result="failed").inc()
+                raise ExtractionError(result)
+
+            RESUME_EXTRACTIONS.labels(result="ok").inc()
+            return result
+        finally:
+            if worker is not None:
+                self._checkin(worker)
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+                worker.kill()
+        return _Worker(self.memory_bytes)
+
+    def _checkin(self, worker: _Worker) -> None:
+        if not worker.alive():
+            worker.kill()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Create the pool lazily, once per process (safe under gunicorn forks)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ExtractionPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def extract_resume_text(source: bytes | str, filename: str, db=None, content_hash: str = None) -> str:
+    """
+    Extract text from an uploaded resume (bytes or a file path, see
+    utils/upload_spool.py), in the worker pool unless
+    RESUME_EXTRACT_POOL_ENABLED=false. PDF pages are cached in db under
+    content_hash (the SHA-256 of the file).
+    """
+    if content_hash is None:
+        with _open_source(source) as file:
+            content_hash = hashlib.file_digest(file, "sha256").hexdigest()
+
+    if not RESUME_EXTRACT_POOL_ENABLED:
+        if filename.lower().endswith(".pdf"):
+            return extract_pdf_text(
+                content_hash,
+                lambda pages: _extract_pdf_pages_inline(source, filename, pages),
+                max_pages=RESUME_EXTRACT_MAX_PAGES,
+                db=db,
+            )
+        with _open_source(source) as file:
+            return extract_text_from_file(file, filename, RESUME_EXTRACT_MAX_PAGES)
+
+    pool = get_extraction_pool()
+    if filename.lower().endswith(".pdf"):
+        # The per-file limit covers every page range of the file together
+        deadline = time.monotonic() + pool.timeout
+
+        def run_chunk(pages):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                RESUME_EXTRACTIONS.labels(result="timeout").inc()
+                raise ExtractionTimeout(f"Resume text extraction took longer than {pool.timeout:g} seconds")
+            return pool.extract(source, filename, extract_pdf_pages, (pages,), timeout=remaining)
+
+        return extract_pdf_text(
+            content_hash,
+            run_chunk,
+            workers=pool.workers,
+            max_pages=pool.max_pages,
+            db=db,
+        )
+    return pool.extract(source, filename)
+
+
+def _open_source(source: bytes | str):
+    return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+
+def _extract_pdf_pages_inline(source: bytes | str, filename: str, pages: list) -> dict:
+    try:
+        with _open_source(source) as file:
+            return extract_pdf_pages(file, filename, pages)
+    except Exception as e:
+        raise ExtractionError(str(e))
@@ -0,0 +1,52 @@
+"""
+File Response
+Conditional, range-aware downloads of GridFS files. Stored files never change
+(a new upload gets a new file), so the content hash is a strong ETag: a client
+that already has the file gets a 304 before GridFS is touched, and Range
+requests seek to the chunks they need instead of streaming the whole blob.
+"""
+
+import os
+
+from flask import Response, request
+from werkzeug.wsgi import wrap_file
+
+# 0 = the client revalidates on every open (one metadata lookup on a 304)
+RESUME_CACHE_MAX_AGE_SECONDS = int(os.getenv("RESUME_CACHE_MAX_AGE_SECONDS", "0"))
+
+
+def _set_cache_headers(response: Response, etag: str, max_age: int) -> None:
+    response.set_etag(etag)
+    # Private: the file belongs to the signed-in user
+    response.cache_control.private = True
+    if max_age > 0:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+
+
+def not_modified(etag: str, max_age: int = RESUME_CACHE_MAX_AGE_SECONDS) -> Response | None:
+    """A 304 response if the request's If-None-Match already names etag, else None."""
+    if request.method not in ("GET", "HEAD") or not request.if_none_match.contains(etag):
+        return None
+    response = Response(status=304)
+    _set_cache_headers(response, etag, max_age)
+    return response
+
+
+def gridfs_file_response(fs, file_id, etag: str, download_name: str,
+                         max_age: int = RESUME_CACHE_MAX_AGE_SECONDS) -> Response:
+    """
+    Stream a GridFS file as an attachment, honouring If-None-Match, Range and
+    If-Range. GridOut is seekable, so a 206 only reads the chunks in range.
+    """
+    grid_out = fs.get(file_id)
+    response = Response(
+        wrap_file(request.environ, grid_out),
+        mimetype=grid_out.content_type or "application/octet-stream",
+        direct_passthrough=True,
+    )
+    response.content_length = grid_out.length
+    response.headers.set("Content-Disposition", "attachment", filename=download_name)
+    _set_cache_headers(response, etag, max_age)
+    return response.make_conditional(request, accept_ranges=True, complete_length=grid_out.length)
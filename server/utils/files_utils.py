@@ -1,11 +1,15 @@
+from itertools import islice
 from PyPDF2 import PdfReader
 import docx
 
-def extract_text_from_file(file, filename):
+def extract_text_from_file(file, filename, max_pages=None):
     """
     Extracts text content from an uploaded file.
     Supports PDF, DOC/DOCX, and TXT formats.
+    Only the first max_pages pages of a PDF are read (all if None).
     Returns a cleaned string version of the text.
+
+    Uploads run this in a worker process (see utils/extraction_pool.py).
     """
 
     # Get file extension in lowercase
@@ -19,7 +23,8 @@ def extract_text_from_file(file, filename):
         try:
             reader = PdfReader(file)
             # Extract text from each page and join with newlines
-            text = "\n".join(page.extract_text() or "" for page in reader.pages)
+            pages = islice(reader.pages, max_pages)
+            text = "\n".join(page.extract_text() or "" for page in pages)
         except Exception:
             text = "[PDF text could not be extracted]"
 
@@ -54,10 +59,31 @@ def extract_text_from_file(file, filename):
     # Clean extracted text
     # -------------------------------
     # Remove extra whitespace and blank lines for cleaner output
-    text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    text = clean_extracted_text(text)
 
     # Reset file pointer for reuse after reading
     file.seek(0)
 
     # Return cleaned text string
     return text
+
+
+def extract_pdf_pages(file, filename, pages):
+    """
+    Extracts the raw text of selected PDF pages (0-based indexes).
+    Page ranges of one file can be extracted by several processes at once
+    (see utils/pdf_extraction.py). Pages past the end are ignored.
+    Returns {"page_count": total pages, "pages": {index: text}}.
+    """
+    # PdfReader reads the open file as it goes; nothing outlives the call
+    reader = PdfReader(file)
+    page_count = len(reader.pages)
+    return {
+        "page_count": page_count,
+        "pages": {i: reader.pages[i].extract_text() or "" for i in pages if i < page_count},
+    }
+
+
+def clean_extracted_text(text):
+    """Remove extra whitespace and blank lines for cleaner output."""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
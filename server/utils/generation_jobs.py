@@ -0,0 +1,275 @@
+"""
+Generation Jobs
+Runs cover letter generation off the request path: jobs are stored in the
+`generation_jobs` collection and executed by a local pool of worker threads,
+so HTTP workers return immediately and clients poll for the result.
+
+A job's params (user info, resume text, posting) are dropped once it
+finishes, and a TTL index on created_at (migration 5) deletes the whole
+job GENERATION_JOB_TTL_SECONDS after it was submitted.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from bson.objectid import ObjectId
+
+from utils.cover_letter_cache import get_or_generate_cover_letter
+from utils.history_utils import save_generation, save_generations_bulk
+from utils.metrics import timed_stage
+
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+# Jobs still queued/running after this long were lost (e.g. worker restart)
+JOB_STALE_SECONDS = int(os.getenv("GENERATION_JOB_STALE_SECONDS", "600"))
+JOB_TTL_SECONDS = int(os.getenv("GENERATION_JOB_TTL_SECONDS", "86400"))
+JOBS_COLLECTION = "generation_jobs"
+
+# Batch generation: upper bound on concurrent model calls per batch request
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "5"))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def generation_args(ctx: dict) -> dict:
+    """Pick the keyword arguments for generate_cover_letter out of a generation context."""
+    return {
+        "user_info": ctx["user_info"],
+        "job_posting": ctx["job_posting"],
+        "resume": ctx["resume"],
+        "tone": ctx["tone"],
+        "user_prompt": ctx["user_prompt"],
+        "job_title": ctx["job_title"],
+        "company_name": ctx["company_name"],
+        "resume_digest": ctx.get("resume_digest"),
+    }
+
+
+def run_generation(db, user_id, ctx: dict, skip_cache: bool = False) -> dict:
+    """
+    Full generation pipeline: cached or fresh letter, then history + version.
+    History failures are logged and reported as missing ids, never raised.
+
+    Returns:
+        dict: {"markdown", "cacheTier", "historyId", "version"}
+    """
+    markdown, cache_tier = get_or_generate_cover_letter(
+        generation_args(ctx), db, skip_cache=skip_cache
+    )
+    history_id, version_number = record_generation(db, user_id, ctx, markdown)
+
+    return {
+        "markdown": markdown,
+        "cacheTier": cache_tier,
+        "historyId": str(history_id) if history_id else None,
+        "version": version_number,
+    }
+
+
+def record_generation(db, user_id, ctx: dict, markdown: str) -> tuple:
+    """
+    Save a finished letter to job history as a new version.
+    Failures are logged and returned as (None, None) so the letter is still delivered.
+    """
+    try:
+        with timed_stage("save_history"):
+            return save_generation(
+                db,
+                user_id,
+                markdown=markdown,
+                tone=ctx["tone"],
+                user_prompt=ctx["user_prompt"],
+                job_title=ctx["job_title"],
+                company_name=ctx["company_name"],
+                job_url=ctx["job_url"],
+                location=ctx["location"],
+                job_posting_id=ctx.get("job_posting_id"),
+            )
+    except Exception as history_error:
+        print(f"Failed to save job history / letter versions: {history_error}")
+        return None, None
+
+
+def run_generation_batch(
+    db,
+    user_id,
+    contexts: list[dict],
+    concurrency: int = BATCH_MAX_CONCURRENCY,
+    skip_cache: bool = False
+) -> list[dict]:
+    """
+    Generate letters for many postings concurrently, then save them all with
+    bulk writes. At most `concurrency` model calls run at once
+    (capped at BATCH_MAX_CONCURRENCY).
+
+    Returns:
+        list[dict]: One result per context, in order. Successful items look
+        like run_generation's result; failed ones are {"error": "..."}.
+    """
+    if not contexts:
+        return []
+
+    workers = max(1, min(concurrency, BATCH_MAX_CONCURRENCY, len(contexts)))
+    results = [None] * len(contexts)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generation-batch") as pool:
+        futures = {
+            pool.submit(get_or_generate_cover_letter, generation_args(ctx), db, skip_cache): i
+            for i, ctx in enumerate(contexts)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                markdown, cache_tier = future.result()
+                results[i] = {"markdown": markdown, "cacheTier": cache_tier}
+            except Exception as e:
+                results[i] = {"error": f"Failed to generate cover letter: {str(e)}"}
+
+    # ---------------- BULK PERSISTENCE ----------------
+    succeeded = [i for i, result in enumerate(results) if "markdown" in result]
+    saved = [(None, None)] * len(succeeded)
+    try:
+        with timed_stage("save_history_bulk"):
+            saved = save_generations_bulk(db, user_id, [
+                {
+                    "markdown": results[i]["markdown"],
+                    "tone": contexts[i]["tone"],
+                    "user_prompt": contexts[i]["user_prompt"],
+                    "job_title": contexts[i]["job_title"],
+                    "company_name": contexts[i]["company_name"],
+                    "job_url": contexts[i]["job_url"],
+                    "location": contexts[i]["location"],
+                    "job_posting_id": contexts[i].get("job_posting_id"),
+                }
+                for i in succeeded
+            ])
+    except Exception as history_error:
+        print(f"Failed to save job history / letter versions: {history_error}")
+
+    for i, (history_id, version_number) in zip(succeeded, saved):
+        results[i]["historyId"] = str(history_id) if history_id else None
+        results[i]["version"] = version_number
+
+    return results
+
+
+def enqueue_generation_job(db, user_id, ctx: dict, skip_cache: bool = False) -> str:
+    """
+    Store a queued job and hand it to the local worker pool.
+
+    Returns:
+        str: The new job id
+    """
+    now = datetime.utcnow()
+    job_doc = {
+        "user_id": ObjectId(user_id),
+        "status": "queued",
+        # The full cleaned description is only needed for responses
+        "params": {k: v for k, v in ctx.items() if k != "clean_job_description"},
+        "skip_cache": skip_cache,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    job_id = db[JOBS_COLLECTION].insert_one(job_doc).inserted_id
+
+    _get_executor().submit(_run_job, db, job_id)
+    return str(job_id)
+
+
+def get_generation_job(db, job_id: str, user_id) -> dict | None:
+    """
+    Return a job's public status for its owner, or None if not found
+    (including a malformed job_id).
+    Jobs stuck in queued/running past JOB_STALE_SECONDS are marked failed.
+    """
+    if not ObjectId.is_valid(job_id):
+        return None
+    doc = db[JOBS_COLLECTION].find_one(
+        {"_id": ObjectId(job_id), "user_id": ObjectId(user_id)},
+        {"params": 0}
+    )
+    if not doc:
+        return None
+
+    if doc.get("status") in ("queued", "running"):
+        cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        if doc["updated_at"] < cutoff:
+            doc.update(_expire_job(db, doc["_id"], cutoff))
+
+    return {
+        "jobId": str(doc["_id"]),
+        "status": doc.get("status"),
+        "result": doc.get("result"),
+        "error": doc.get("error"),
+        "createdAt": _isoformat(doc.get("created_at")),
+        "finishedAt": _isoformat(doc.get("finished_at")),
+    }
+
+
+def _run_job(db, job_id) -> None:
+    jobs = db[JOBS_COLLECTION]
+
+    # Claim the job so it only ever runs once
+    job = jobs.find_one_and_update(
+        {"_id": job_id, "status": "queued"},
+        {"$set": {"status": "running", "updated_at": datetime.utcnow()}},
+    )
+    if not job:
+        return
+
+    try:
+        result = run_generation(
+            db, job["user_id"], job["params"], skip_cache=job.get("skip_cache", False)
+        )
+        update = {"status": "done", "result": result}
+    except Exception as e:
+        update = {"status": "failed", "error": f"Failed to generate cover letter: {str(e)}"}
+
+    now = datetime.utcnow()
+    update.update({"updated_at": now, "finished_at": now})
+    try:
+        # Not if a poll already gave up on it as stale
+        jobs.update_one({"_id": job_id, "status": "running"}, {"$set": update, "$unset": {"params": ""}})
+    except Exception as e:
+        print(f"Failed to record generation job {job_id}: {e}")
+
+
+def _expire_job(db, job_id, cutoff: datetime) -> dict:
+    """Mark a job lost by its worker as failed (unless it moved on meanwhile); returns the fields set."""
+    now = datetime.utcnow()
+    update = {
+        "status": "failed",
+        "error": "Job expired before completing. Please try again.",
+        "updated_at": now,
+        "finished_at": now,
+    }
+    try:
+        db[JOBS_COLLECTION].update_one(
+            {"_id": job_id, "status": {"$in": ["queued", "running"]}, "updated_at": {"$lt": cutoff}},
+            {"$set": update, "$unset": {"params": ""}},
+        )
+    except Exception as e:
+        print(f"Failed to expire generation job {job_id}: {e}")
+    return update
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the worker pool lazily, once per process (safe under gunicorn forks)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=GENERATION_WORKERS,
+                thread_name_prefix="generation-job"
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
@@ -0,0 +1,279 @@
+from bson.objectid import ObjectId
+from datetime import datetime
+from pymongo import InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+import re
+
+from utils.unique_jobs import record_job_added, record_job_retitled
+
+
+def detect_source(job_url: str | None) -> str | None:
+    """Return the host part of a job URL (e.g. 'www.linkedin.com'), if any."""
+    if not job_url:
+        return None
+    match = re.search(r"https?://([^/]+)/?", job_url)
+    return match.group(1) if match else None
+
+
+def save_generation(
+    db,
+    user_id,
+    markdown: str,
+    tone: str,
+    user_prompt: str = "",
+    job_title: str = None,
+    company_name: str = None,
+    job_url: str = None,
+    location: str = None,
+    job_posting_id: str = None
+) -> tuple:
+    """
+    Record a generated cover letter in the user's job history.
+    Reuses the history item for the same user + job URL and stores the
+    letter as the next version. The cleaned description itself lives in the
+    shared job_postings collection; history keeps its id.
+
+    Two round trips: one atomic upsert of the history item that also
+    increments its letter_count (the new version number), then the letter
+    insert. Concurrent saves for the same job get distinct versions. The
+    first save of a job (and of an item from before letter_count) costs
+    one or two more.
+
+    Returns:
+        tuple: (history_id, version_number)
+    """
+    user_obj_id = ObjectId(user_id)
+    now = datetime.utcnow()
+
+    # Upsert history for this user + job URL (no URL: always a new item)
+    history_filter = {"user_id": user_obj_id, "url": job_url} if job_url else {"_id": ObjectId()}
+    history_update = _history_upsert_pipeline(
+        # Update basic info in case it changed
+        {
+            "job_title": job_title,
+            "company_name": company_name,
+            "location": location,
+            "source": detect_source(job_url),
+            "tone": tone,
+            "job_posting_id": job_posting_id,
+        },
+        {
+            "user_id": user_obj_id,
+            "url": job_url,
+            "status": "Applied",
+            "created_at": now,
+        },
+        letters=1,
+    )
+    try:
+        previous = _upsert_history(db, history_filter, history_update)
+    except DuplicateKeyError:
+        # A concurrent save inserted the same user + URL first; now it matches
+        previous = _upsert_history(db, history_filter, history_update)
+
+    if previous is None:
+        # The upsert created the item
+        history_id = history_filter.get("_id") or db.job_history.find_one(history_filter, {"_id": 1})["_id"]
+        version_number = 1
+        record_job_added(db, job_title, job_url, now)
+    else:
+        history_id = previous["_id"]
+        if previous.get("letter_count") is not None:
+            version_number = previous["letter_count"] + 1
+        else:
+            version_number = _claim_legacy_versions(db, history_id, 1)
+        record_job_retitled(db, previous.get("job_title"), job_title, job_url, previous.get("created_at"))
+
+    # Save this cover letter as a new version
+    letter_doc = {
+        "history_id": history_id,
+        "user_id": user_obj_id,
+        "markdown": markdown,
+        "tone": tone,
+        "user_prompt": user_prompt,
+        "created_at": now,
+        "version": version_number,
+    }
+
+    db.cover_letters.insert_one(letter_doc)
+
+    return history_id, version_number
+
+
+def _history_upsert_pipeline(fields: dict, insert_fields: dict, letters: int) -> list:
+    """
+    Update pipeline for a history upsert: set `fields`, set `insert_fields`
+    on a new item only, and add `letters` to letter_count. An existing item
+    without letter_count (saved before it was introduced and not yet
+    backfilled) is left uncounted for _claim_legacy_versions to seed.
+    """
+    # In one $set stage every "$field" reads the item as it was before the update
+    is_new = {"$eq": [{"$type": "$created_at"}, "missing"]}
+    stage = {name: {"$literal": value} for name, value in fields.items()}
+    for name, value in insert_fields.items():
+        stage[name] = {"$cond": [is_new, {"$literal": value}, f"${name}"]}
+    stage["letter_count"] = {"$cond": [
+        {"$in": [{"$type": "$letter_count"}, ["missing", "null"]]},
+        {"$cond": [is_new, letters, "$$REMOVE"]},
+        {"$add": ["$letter_count", letters]},
+    ]}
+    return [{"$set": stage}]
+
+
+def _upsert_history(db, history_filter: dict, history_update: list) -> dict | None:
+    # The item as it was before this update; None when the upsert created it
+    return db.job_history.find_one_and_update(
+        history_filter,
+        history_update,
+        projection={"letter_count": 1, "job_title": 1, "created_at": 1},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE,
+    )
+
+
+def _claim_legacy_versions(db, history_id, letters: int) -> int:
+    """
+    Start letter_count of an item saved before it existed at its highest
+    stored version (only the first concurrent caller's seed applies), then
+    take `letters` versions after it.
+
+    Returns:
+        int: The first claimed version number
+    """
+    latest = db.cover_letters.find_one({"history_id": history_id}, {"version": 1}, sort=[("version", -1)])
+    db.job_history.update_one(
+        {"_id": history_id, "letter_count": None},
+        {"$set": {"letter_count": (latest or {}).get("version") or 0}},
+    )
+    history = db.job_history.find_one_and_update(
+        {"_id": history_id},
+        {"$inc": {"letter_count": letters}},
+        projection={"letter_count": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    return history["letter_count"] - letters + 1
+
+
+def save_generations_bulk(db, user_id, letters: list[dict]) -> list[tuple]:
+    """
+    Batch version of save_generation: records many letters for one user in a
+    fixed number of round trips (history title lookup, history bulk write
+    that also advances each item's letter_count, history lookup, letter
+    insert_many) instead of two per letter.
+
+    Versions are read back from letter_count after the bulk write, so a
+    single save for the same user + URL landing between those two round
+    trips could share a version number with this batch (callers must
+    tolerate that; see /api/cover-letter/batch).
+
+    Args:
+        letters (list[dict]): save_generation keyword arguments per letter
+            (markdown, tone, user_prompt, job_title, company_name, job_url,
+            location, job_posting_id)
+
+    Returns:
+        list[tuple]: (history_id, version_number) for each letter, in order
+    """
+    if not letters:
+        return []
+
+    user_obj_id = ObjectId(user_id)
+    now = datetime.utcnow()
+
+    # ---------------- JOB HISTORY ----------------
+    history_ops = []
+    url_infos = {}
+    url_counts = {}
+    history_ids = [None] * len(letters)
+    versions = [None] * len(letters)
+    for i, letter in enumerate(letters):
+        job_url = letter.get("job_url")
+        info = {
+            "job_title": letter.get("job_title"),
+            "company_name": letter.get("company_name"),
+            "location": letter.get("location"),
+            "source": detect_source(job_url),
+            "tone": letter["tone"],
+            "job_posting_id": letter.get("job_posting_id"),
+        }
+
+        if not job_url:
+            # No URL to match on: always a new history item
+            history_ids[i] = ObjectId()
+            versions[i] = 1
+            history_ops.append(InsertOne({
+                "_id": history_ids[i],
+                "user_id": user_obj_id,
+                "url": job_url,
+                "status": "Applied",
+                "created_at": now,
+                "letter_count": 1,
+                **info,
+            }))
+            continue
+
+        # Same URL twice in one batch: one upsert, last posting's info wins
+        url_infos[job_url] = info
+        url_counts[job_url] = url_counts.get(job_url, 0) + 1
+
+    for job_url, info in url_infos.items():
+        history_ops.append(UpdateOne(
+            {"user_id": user_obj_id, "url": job_url},
+            _history_upsert_pipeline(
+                info, {"status": "Applied", "created_at": now}, letters=url_counts[job_url]
+            ),
+            upsert=True,
+        ))
+
+    # Titles before this batch, to move retitled jobs in the unique_jobs view
+    previous_titles = {}
+    if url_infos:
+        for doc in db.job_history.find(
+            {"user_id": user_obj_id, "url": {"$in": list(url_infos)}},
+            {"url": 1, "job_title": 1}
+        ):
+            previous_titles[doc["url"]] = doc.get("job_title")
+
+    result = db.job_history.bulk_write(history_ops, ordered=False)
+
+    if url_infos:
+        # This batch's letters take the last url_counts[url] versions
+        next_version = {}
+        created = set(result.upserted_ids.values())
+        for doc in db.job_history.find(
+            {"user_id": user_obj_id, "url": {"$in": list(url_infos)}},
+            {"url": 1, "letter_count": 1, "created_at": 1}
+        ):
+            if doc.get("letter_count") is None:
+                first = _claim_legacy_versions(db, doc["_id"], url_counts[doc["url"]])
+            else:
+                first = doc["letter_count"] - url_counts[doc["url"]] + 1
+            next_version[doc["url"]] = (doc["_id"], first)
+            title = url_infos[doc["url"]]["job_title"]
+            if doc["_id"] in created:
+                record_job_added(db, title, doc["url"], now)
+            elif doc["url"] in previous_titles:
+                record_job_retitled(db, previous_titles[doc["url"]], title, doc["url"], doc.get("created_at"))
+
+        for i, letter in enumerate(letters):
+            job_url = letter.get("job_url")
+            if job_url:
+                history_ids[i], versions[i] = next_version[job_url]
+                next_version[job_url] = (history_ids[i], versions[i] + 1)
+
+    # ---------------- LETTER VERSIONS ----------------
+    letter_docs = []
+    for history_id, version_number, letter in zip(history_ids, versions, letters):
+        letter_docs.append({
+            "history_id": history_id,
+            "user_id": user_obj_id,
+            "markdown": letter["markdown"],
+            "tone": letter["tone"],
+            "user_prompt": letter.get("user_prompt", ""),
+            "created_at": now,
+            "version": version_number,
+        })
+
+    db.cover_letters.insert_many(letter_docs, ordered=False)
+
+    return list(zip(history_ids, versions))
@@ -1,8 +1,182 @@
 from bs4 import BeautifulSoup
+from html import unescape
+from html.entities import html5 as HTML5_ENTITIES
+from typing import Iterator
 import bleach
 import re
 
-def trim_html(job_html: str) -> str:
+# One pass over the markup: every match is a comment, a bogus comment
+# (doctype, CDATA, processing instruction), a tag, or a run of text.
+# Tags may hold quoted attribute values containing ">"; a tag cut off by the
+# end of the input is kept as text.
+_COMMENT = r"(?P<comment><!--(?:-?>|[\s\S]*?--!?>|[\s\S]*))"
+_BOGUS = r"(?P<bogus><[!?][^>]*>?|</>)"
+_TAG = r"""(?P<tag><(?P<close>/)?(?P<name>[a-zA-Z][^\s/>]*+)(?>[^>=]+|=\s*"[^"]*"|=\s*'[^']*'|=)*+>)"""
+_TEXT = r"(?P<text>[^<]+|<)"
+_TOKEN_RE = re.compile("|".join([_COMMENT, _BOGUS, _TAG, _TEXT]))
+# After the last ">" no tag can close, so don't try (keeps "<" runs linear)
+_TAIL_TOKEN_RE = re.compile("|".join([_COMMENT, _BOGUS, _TEXT]))
+# A tag start that never closes runs to the end of the input. The old
+# sanitizer kept "<name" as text if nothing but the name followed, and
+# dropped the rest of the input once attributes (or "/") had started.
+_UNCLOSED_TAG_RE = re.compile(r"</?[a-zA-Z]")
+_UNCLOSED_NAME_RE = re.compile(r"</?([a-zA-Z][^\s/>]*)")
+
+# Block-level tags the old sanitizer stripped; it left a line break in their
+# place (except before the very first tag), so they still separate words
+BREAKING_TAGS = frozenset([
+    "address", "article", "aside", "blockquote", "details", "dialog", "dd", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "header",
+    "hgroup", "main", "nav", "pre", "section",
+])
+
+# Only complete, known references are decoded (same rule bleach applies)
+_ENTITY_RE = re.compile(r"&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);")
+
+
+def trim_html(job_html: str, tokens: Iterator[tuple[str, str, str]] = None) -> str:
+    """
+    Convert a raw HTML job description to normalized plain text.
+    - Drops tags, comments and doctype/CDATA sections.
+    - Decodes character references.
+    - Removes inline CSS/JS blocks ({...}).
+    - Collapses all whitespace to single spaces.
+
+    Makes a single tokenizing pass over the input. For well-formed markup,
+    and for a tag left open at the end of the input, the text is the same as
+    the previous sanitize + parse + normalize pipeline (trim_html_legacy).
+    It differs on malformed markup the old HTML5 parser rearranged:
+    - Text inside a <table> but outside any cell stays where it is written.
+      The old parser moved it in front of the table ("foster parenting"),
+      and lost it in some tables that were never closed.
+    - A ">" inside a quoted attribute value of an allowed tag is handled
+      normally. The old attribute-stripping regex leaked the rest of the
+      value as text.
+    Pass tokens to clean only part of the document (see utils/job_extractors.py).
+    """
+    return " ".join("".join(iter_text(job_html, tokens)).split())
+
+
+def trim_html_capped(
+    job_html: str, max_chars: int, tokens: Iterator[tuple[str, str, str]] = None
+) -> tuple[str, bool]:
+    """
+    Same text as trim_html, but stop reading the markup as soon as more than
+    max_chars characters of text have been produced. Work and memory are
+    bounded by the text budget, not by the size of the input.
+
+    Returns:
+        tuple: (at most max_chars characters of text, whether text was cut off)
+    """
+    words = []
+    size = 0
+    space = False  # whitespace seen since the last word
+    for piece in iter_text(job_html, tokens):
+        if not piece:
+            continue
+        space = space or piece[0].isspace()
+        for i, word in enumerate(piece.split()):
+            if (space or i) and words:
+                words.append(" ")
+                size += 1
+            space = False
+            words.append(word)
+            size += len(word)
+            if size > max_chars:
+                return "".join(words)[:max_chars].rstrip(), True
+        space = space or piece[-1].isspace()
+    return "".join(words), False
+
+
+def iter_tokens(html: str, pos: int = 0) -> Iterator[tuple[str, str, str]]:
+    """
+    Tokenize HTML lazily, starting at offset pos.
+
+    Yields:
+        tuple: (kind, tag name or "", raw token) where kind is
+        "start", "end", "text" or "comment". A tag left open at the end of
+        the input comes back as the text "<name" if only its name was read,
+        otherwise as a "comment" (dropped from the text).
+    """
+    html = html or ""
+    end = len(html)
+    tags_until = html.rfind(">")
+    while pos < end:
+        match = (_TOKEN_RE if pos <= tags_until else _TAIL_TOKEN_RE).match(html, pos)
+        pos = match.end()
+        if match.lastgroup == "text":
+            if match.group(0) == "<" and _UNCLOSED_TAG_RE.match(html, match.start()):
+                name = _UNCLOSED_NAME_RE.fullmatch(html, match.start())
+                if name:
+                    yield "text", "", "<" + name.group(1)
+                else:
+                    yield "comment", "", html[match.start():]
+                return
+            yield "text", "", match.group(0)
+        elif match.lastgroup == "tag":
+            kind = "end" if match.group("close") else "start"
+            yield kind, match.group("name").lower(), match.group(0)
+        else:
+            yield "comment", "", match.group(0)
+
+
+def iter_text(html: str, tokens: Iterator[tuple[str, str, str]] = None) -> Iterator[str]:
+    """
+    Yield the decoded text of an HTML document piece by piece, with {...}
+    blocks removed. A "{" without a closing "}" is kept as text.
+    """
+    pending = None  # raw text since an unclosed "{"
+    seen_tag = False
+    for kind, name, raw in tokens if tokens is not None else iter_tokens(html):
+        if kind == "start" and name in BREAKING_TAGS and seen_tag:
+            raw = "\n"
+        elif kind != "text":
+            seen_tag = seen_tag or kind != "comment"
+            continue
+
+        pos = 0
+        while True:
+            if pending is None:
+                start = raw.find("{", pos)
+                if start < 0:
+                    if pos < len(raw):
+                        yield _decode(raw[pos:])
+                    break
+                if start > pos:
+                    yield _decode(raw[pos:start])
+                pending = []
+                pos = start
+
+            end = raw.find("}", pos)
+            if end < 0:
+                pending.append(raw[pos:])
+                break
+            pending = None
+            pos = end + 1
+
+    if pending:
+        # No closing brace anywhere after it: the text stays
+        yield _decode("".join(pending))
+
+
+def _decode(text: str) -> str:
+    if "&" not in text:
+        return text
+    return _ENTITY_RE.sub(_decode_entity, text)
+
+
+def _decode_entity(match) -> str:
+    ref = match.group(0)
+    if ref[1] == "#" or ref[1:] in HTML5_ENTITIES:
+        return unescape(ref)
+    return ref
+
+
+# ---------------- LEGACY PIPELINE ----------------
+# Kept as the reference for benchmarks/bench_trim_html.py and the
+# equivalence tests.
+
+def trim_html_legacy(job_html: str) -> str:
     """
     Sanitize and normalize a raw HTML job description.
     - Removes unsafe tags and attributes.
@@ -0,0 +1,187 @@
+"""
+Job Description Extractors
+Per-site rules that find the element holding the job description, so only
+that part of the page is cleaned and sent to the model (no navigation,
+sidebars, "similar jobs" lists or footers).
+
+The site is picked from the job URL's host. Pages from other hosts, and pages
+where the site's container is missing or nearly empty, fall back to generic
+containers (schema.org description, <main>, <article>), then to the page
+without its chrome, then to the whole page.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urlparse
+
+from utils.job_cleaner import iter_tokens
+
+# A candidate whose text is shorter than this is treated as not found
+# (e.g. a container the site fills in with JavaScript)
+MIN_DESCRIPTION_CHARS = 100
+
+# Elements skipped by the "page" fallback
+CHROME_TAGS = frozenset([
+    "head", "title", "nav", "header", "footer", "aside", "script", "style", "noscript", "button",
+])
+
+# Elements with no content (and no end tag), e.g. schema.org
+# <meta itemprop="description" content="...">: never a container
+VOID_TAGS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+])
+
+_ATTR_RE = re.compile(r"""([^\s"'=<>/]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+
+@dataclass(frozen=True)
+class SiteExtractor:
+    """
+    Where one job board keeps its description.
+    hosts match the URL host or any subdomain of it. Each container is
+    (attribute, value); "class" matches a single class name. Containers are
+    tried in order.
+    """
+    name: str
+    hosts: tuple[str, ...]
+    containers: tuple[tuple[str, str], ...]
+
+
+SITE_EXTRACTORS = (
+    SiteExtractor("linkedin", ("linkedin.com",), (
+        ("class", "show-more-less-html__markup"),   # public job page
+        ("class", "jobs-description__content"),     # signed-in job view
+        ("class", "description__text"),
+    )),
+    SiteExtractor("indeed", ("indeed.com", "indeed.ca"), (
+        ("id", "jobDescriptionText"),
+    )),
+    SiteExtractor("workday", ("myworkdayjobs.com", "myworkdaysite.com", "workday.com"), (
+        ("data-automation-id", "jobPostingDescription"),
+    )),
+    SiteExtractor("greenhouse", ("greenhouse.io",), (
+        ("class", "job__description"),              # job-boards.greenhouse.io
+        ("id", "content"),                          # boards.greenhouse.io
+    )),
+    SiteExtractor("lever", ("lever.co",), (
+        ("data-qa", "job-description"),
+    )),
+    SiteExtractor("glassdoor", ("glassdoor.com", "glassdoor.ca"), (
+        ("class", "jobDescriptionContent"),
+    )),
+)
+
+# Tried on every page after the site's own containers
+GENERIC_CONTAINERS = (
+    ("itemprop", "description"),
+)
+GENERIC_TAGS = ("main", "article")
+
+
+def site_for_url(url: str | None) -> SiteExtractor | None:
+    """Return the extractor registered for the URL's host, if any."""
+    if not url:
+        return None
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return None
+    for site in SITE_EXTRACTORS:
+        if any(host == suffix or host.endswith("." + suffix) for suffix in site.hosts):
+            return site
+    return None
+
+
+def iter_description_candidates(
+    html: str, url: str = None
+) -> Iterator[tuple[str, Iterator[tuple[str, str, str]]]]:
+    """
+    Yield (extractor name, tokens) from the most to the least specific part
+    of the page. Token streams are lazy, so a caller that stops at the first
+    good candidate never tokenizes the rest of the page.
+
+    Names: the site's name, "generic", "page" (chrome removed) and "full".
+    """
+    html = html or ""
+    site = site_for_url(url)
+    if site:
+        for attr, value in site.containers:
+            found = _find_container(html, attr, value)
+            if found:
+                yield site.name, _container_tokens(html, *found)
+                break
+
+    for attr, value in GENERIC_CONTAINERS:
+        found = _find_container(html, attr, value)
+        if found:
+            yield "generic", _container_tokens(html, *found)
+            break
+    else:
+        for tag in GENERIC_TAGS:
+            found = _find_tag(html, tag)
+            if found:
+                yield "generic", _container_tokens(html, *found)
+                break
+
+    yield "page", _without_chrome(iter_tokens(html))
+    yield "full", iter_tokens(html)
+
+
+def _find_container(html: str, attr: str, value: str) -> tuple[int, str] | None:
+    """Offset and tag name of the first non-void start tag whose attr matches value."""
+    pos = html.find(value)
+    while pos >= 0:
+        start = html.rfind("<", 0, pos)
+        if start >= 0:
+            kind, name, raw = next(iter_tokens(html, start))
+            if (
+                kind == "start" and name not in VOID_TAGS
+                and start + len(raw) > pos and _has_attr(raw, attr, value)
+            ):
+                return start, name
+        pos = html.find(value, pos + len(value))
+    return None
+
+
+def _find_tag(html: str, tag: str) -> tuple[int, str] | None:
+    """Offset of the first <tag> start tag."""
+    match = re.search(rf"<{tag}[\s>]", html, re.I)
+    return (match.start(), tag) if match else None
+
+
+def _has_attr(raw_tag: str, attr: str, value: str) -> bool:
+    for match in _ATTR_RE.finditer(raw_tag):
+        if match.group(1).lower() != attr:
+            continue
+        found = next(group for group in match.groups()[1:] if group is not None)
+        return value in found.split() if attr == "class" else found == value
+    return False
+
+
+def _container_tokens(html: str, start: int, name: str) -> Iterator[tuple[str, str, str]]:
+    """Tokens from the container's start tag up to its matching end tag."""
+    depth = 0
+    for kind, tag, raw in iter_tokens(html, start):
+        if tag == name:
+            depth += 1 if kind == "start" else -1
+        yield kind, tag, raw
+        if depth <= 0:
+            return
+
+
+def _without_chrome(tokens: Iterator[tuple[str, str, str]]) -> Iterator[tuple[str, str, str]]:
+    """Drop navigation, header, footer, sidebar and script/style elements."""
+    skipping, depth = None, 0
+    for kind, name, raw in tokens:
+        if skipping:
+            if name == skipping:
+                depth += 1 if kind == "start" else -1
+                if depth == 0:
+                    skipping = None
+            continue
+        if kind == "start" and name in CHROME_TAGS and not raw.endswith("/>"):
+            skipping, depth = name, 1
+            continue
+        yield kind, name, raw
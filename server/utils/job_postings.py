@@ -0,0 +1,147 @@
+"""
+Job Postings
+Shared store of cleaned job descriptions. Each distinct posting (URL + raw
+HTML) is cleaned once and saved in the `job_postings` collection; an
+in-process LRU sits in front of it. Job history items reference a posting
+by id instead of each user keeping their own copy.
+
+Only the description container found by utils/job_extractors.py is
+cleaned. Cleaning can be given a text budget (max_chars): the HTML is only
+read until that much text has been produced, and the stored text is cut to
+the budget.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import datetime
+
+from utils.job_cleaner import trim_html, trim_html_capped
+from utils.job_extractors import MIN_DESCRIPTION_CHARS, iter_description_candidates
+from utils.metrics import JOB_DESCRIPTION_EXTRACTIONS, JOB_POSTING_LOOKUPS, timed_stage
+from utils.ttl_cache import TTLCache
+
+JOB_POSTINGS_COLLECTION = "job_postings"
+JOB_POSTING_CACHE_MAX_ENTRIES = int(os.getenv("JOB_POSTING_CACHE_MAX_ENTRIES", "256"))
+JOB_POSTING_CACHE_TTL_SECONDS = int(os.getenv("JOB_POSTING_CACHE_TTL_SECONDS", "3600"))
+
+# Bump when trim_html's or the extractors' output changes so postings are cleaned again
+CLEANER_VERSION = 2
+
+_memory_cache = TTLCache(max_size=JOB_POSTING_CACHE_MAX_ENTRIES, ttl_seconds=JOB_POSTING_CACHE_TTL_SECONDS)
+
+_stats_lock = threading.Lock()
+_stats = {"memory_hits": 0, "mongo_hits": 0, "cleaned": 0}
+
+
+def posting_key(raw_html: str, url: str = None, max_chars: int = None) -> str:
+    """Id of a posting: SHA-256 over the cleaner version, text budget, URL and raw HTML."""
+    digest = hashlib.sha256(f"{CLEANER_VERSION}\n{max_chars or ''}\n{url or ''}\n".encode("utf-8"))
+    digest.update(raw_html.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_or_clean_job_posting(
+    db, raw_html: str, url: str = None, max_chars: int = None
+) -> tuple[str | None, str, bool]:
+    """
+    Return the cleaned text for a posting, cleaning and storing it only the
+    first time it is seen by any worker.
+    With max_chars, cleaning stops once the budget is exceeded and at most
+    max_chars characters are returned.
+    Store failures are logged and never block generation.
+
+    Returns:
+        tuple: (posting id or None if it could not be stored, clean text,
+                whether the text was cut off at max_chars)
+    """
+    key = posting_key(raw_html, url, max_chars)
+
+    cached = _memory_cache.get(key)
+    if cached is not None:
+        _record("memory_hits")
+        return (key, *cached)
+
+    if db is not None:
+        try:
+            with timed_stage("job_posting_lookup"):
+                doc = db[JOB_POSTINGS_COLLECTION].find_one({"_id": key}, {"clean_text": 1, "truncated": 1})
+        except Exception as e:
+            print(f"Job posting lookup failed: {e}")
+            doc = None
+
+        if doc is not None:
+            truncated = bool(doc.get("truncated"))
+            _memory_cache.set(key, (doc["clean_text"], truncated))
+            _record("mongo_hits")
+            return key, doc["clean_text"], truncated
+
+    with timed_stage("trim_html"):
+        clean_text, truncated, extractor = clean_job_html(raw_html, url, max_chars)
+    _record("cleaned")
+    JOB_DESCRIPTION_EXTRACTIONS.labels(extractor=extractor).inc()
+    _memory_cache.set(key, (clean_text, truncated))
+
+    if db is None:
+        return None, clean_text, truncated
+
+    try:
+        # Two workers may clean the same posting at once; the first insert wins
+        db[JOB_POSTINGS_COLLECTION].update_one(
+            {"_id": key},
+            {"$setOnInsert": {
+                "url": url,
+                "content_hash": hashlib.sha256(clean_text.encode("utf-8")).hexdigest(),
+                "clean_text": clean_text,
+                "truncated": truncated,
+                "extractor": extractor,
+                "raw_size": len(raw_html),
+                "cleaner_version": CLEANER_VERSION,
+                "created_at": datetime.utcnow(),
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Failed to store job posting: {e}")
+        return None, clean_text, truncated
+
+    return key, clean_text, truncated
+
+
+def clean_job_html(raw_html: str, url: str = None, max_chars: int = None) -> tuple[str, bool, str]:
+    """
+    Clean the description part of a posting page: the first extractor
+    candidate with enough text wins, the whole page is the last resort.
+
+    Returns:
+        tuple: (clean text, whether it was cut off at max_chars, extractor name)
+    """
+    for extractor, tokens in iter_description_candidates(raw_html, url):
+        if max_chars is None:
+            clean_text, truncated = trim_html(raw_html, tokens), False
+        else:
+            clean_text, truncated = trim_html_capped(raw_html, max_chars, tokens)
+        if len(clean_text) >= MIN_DESCRIPTION_CHARS:
+            break
+    return clean_text, truncated, extractor
+
+
+def get_job_posting(db, posting_id: str) -> dict | None:
+    """Load a stored posting (url, clean_text, content_hash, created_at)."""
+    return db[JOB_POSTINGS_COLLECTION].find_one({"_id": posting_id})
+
+
+def get_job_posting_stats() -> dict:
+    """Return lookup counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def clear_memory_cache() -> None:
+    _memory_cache.clear()
+
+
+def _record(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+    JOB_POSTING_LOOKUPS.labels(result=counter).inc()
@@ -0,0 +1,221 @@
+"""
+LLM Backends
+Interface for the text generation model behind cover letter generation,
+with a Google Gemini implementation and a deterministic local fake for
+tests, benchmarks and offline load testing.
+
+Select the backend with LLM_BACKEND=gemini|fake (default: gemini), or
+inject one with set_backend().
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from typing import Iterator
+
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+# Wrap the backend with deadlines, retries and a circuit breaker (utils/llm_client.py)
+LLM_RESILIENCE_ENABLED = os.getenv("LLM_RESILIENCE_ENABLED", "true").lower() == "true"
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class LLMBackendError(Exception):
+    """Raised by a backend when generation fails."""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class LLMBackend:
+    """Base class: a backend turns a prompt into text, whole or streamed."""
+
+    name = "base"
+
+    def check_configured(self) -> None:
+        """Raise if the backend cannot be used (e.g. missing credentials)."""
+
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini via google-generativeai. The client is configured on first use."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str = None, model_name: str = GEMINI_MODEL_NAME):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def check_configured(self) -> None:
+        if not (self.api_key or os.getenv("GEMINI_API_KEY")):
+            raise Exception("Gemini API not configured. Please set GEMINI_API_KEY environment variable.")
+
+    def generate(self, prompt: str) -> str:
+        response = self._get_model().generate_content(prompt)
+        return response.text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self._get_model().generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish-reason chunk)
+                continue
+            if text:
+                yield text
+
+    def _get_model(self):
+        self.check_configured()
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic stand-in for a real model. Output depends only on the prompt;
+    latency, failures and streaming are simulated from the settings below.
+
+    Args:
+        latency_ms (float): Mean time to produce the whole letter
+        latency_distribution (str): "fixed", "uniform", "normal" or "lognormal"
+        latency_jitter (float): Spread as a fraction of latency_ms
+        ms_per_1k_prompt_tokens (float): Extra latency per 1,000 prompt tokens (prefill cost)
+        failure_rate (float): Probability (0-1) that a call raises LLMBackendError
+        chunk_size (int): Characters per streamed chunk
+        seed (int): Seed for latency and failure randomness
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        latency_distribution: str = "fixed",
+        latency_jitter: float = 0.25,
+        ms_per_1k_prompt_tokens: float = 0,
+        failure_rate: float = 0.0,
+        chunk_size: int = 40,
+        seed: int = None
+    ):
+        if latency_distribution not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_jitter = latency_jitter
+        self.ms_per_1k_prompt_tokens = ms_per_1k_prompt_tokens
+        self.failure_rate = failure_rate
+        self.chunk_size = max(1, chunk_size)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeBackend":
+        seed = os.getenv("FAKE_LLM_SEED")
+        return cls(
+            latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "0")),
+            latency_distribution=os.getenv("FAKE_LLM_LATENCY_DISTRIBUTION", "fixed"),
+            latency_jitter=float(os.getenv("FAKE_LLM_LATENCY_JITTER", "0.25")),
+            ms_per_1k_prompt_tokens=float(os.getenv("FAKE_LLM_MS_PER_1K_PROMPT_TOKENS", "0")),
+            failure_rate=float(os.getenv("FAKE_LLM_FAILURE_RATE", "0")),
+            chunk_size=int(os.getenv("FAKE_LLM_CHUNK_SIZE", "40")),
+            seed=int(seed) if seed else None,
+        )
+
+    def generate(self, prompt: str) -> str:
+        latency, fails = self._plan_call(prompt)
+        time.sleep(latency)
+        if fails:
+            raise LLMBackendError("Fake backend: simulated upstream failure", retryable=True)
+        return self._render(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        latency, fails = self._plan_call(prompt)
+        text = self._render(prompt)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+        # Spread the total latency evenly over the chunks
+        delay = latency / max(1, len(chunks))
+        for i, chunk in enumerate(chunks):
+            time.sleep(delay)
+            if fails and i >= len(chunks) // 2:
+                raise LLMBackendError("Fake backend: simulated upstream failure", retryable=True)
+            yield chunk
+
+    def _plan_call(self, prompt: str) -> tuple[float, bool]:
+        """Draw this call's latency (seconds) and whether it fails."""
+        with self._rng_lock:
+            self.calls += 1
+            base = self.latency_ms + self.ms_per_1k_prompt_tokens * (len(prompt) / 4) / 1000
+            spread = base * self.latency_jitter
+            if self.latency_distribution == "uniform":
+                latency = self._rng.uniform(base - spread, base + spread)
+            elif self.latency_distribution == "normal":
+                latency = self._rng.gauss(base, spread)
+            elif self.latency_distribution == "lognormal" and base > 0:
+                # Median ~= base with a long right tail, like real model latency
+                latency = base * self._rng.lognormvariate(0, max(self.latency_jitter, 1e-6))
+            else:
+                latency = base
+            fails = self._rng.random() < self.failure_rate
+        return max(0.0, latency) / 1000, fails
+
+    def _render(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        return (
+            "Dear Hiring Manager,\n\n"
+            "I am excited to apply for this role. My experience building reliable "
+            "software matches the requirements in your posting.\n\n"
+            "In my previous positions I delivered features end to end, improved "
+            "performance and worked closely with my team.\n\n"
+            "I would welcome the chance to discuss how I can contribute.\n\n"
+            "Sincerely,  \n"
+            f"Applicant\n\n<!-- fake-llm {digest} -->"
+        )
+
+
+def create_backend(name: str = None) -> LLMBackend:
+    """Build a backend by name (defaults to the LLM_BACKEND environment variable)."""
+    name = (name or os.getenv("LLM_BACKEND", "gemini")).lower()
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        return FakeBackend.from_env()
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_backend() -> LLMBackend:
+    """Return the process-wide backend, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+            if LLM_RESILIENCE_ENABLED:
+                from utils.llm_client import ResilientBackend
+
+                _backend = ResilientBackend(_backend)
+        return _backend
+
+
+def set_backend(backend: LLMBackend | None) -> None:
+    """Replace the process-wide backend (tests, benchmarks). None resets to LLM_BACKEND."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
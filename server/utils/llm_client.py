@@ -0,0 +1,390 @@
+"""
+Resilient LLM Client
+Wraps an LLM backend with per-call deadlines, jittered exponential retries,
+a circuit breaker and optional hedged requests, so a slow or failing
+upstream costs bounded time per request instead of exhausting workers.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator
+
+from utils.llm_backends import LLMBackend, LLMBackendError
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_TOTAL_DEADLINE_SECONDS = float(os.getenv("LLM_TOTAL_DEADLINE_SECONDS", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+LLM_CIRCUIT_RECOVERY_SECONDS = float(os.getenv("LLM_CIRCUIT_RECOVERY_SECONDS", "30"))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Threads that run model calls so callers can stop waiting at the deadline.
+# A call given up at its deadline keeps its thread until the upstream answers;
+# once every thread is taken, new calls fail fast instead of queueing.
+LLM_CALL_THREADS = int(os.getenv("LLM_CALL_THREADS", "32"))
+
+
+class LLMUnavailableError(LLMBackendError):
+    """The model could not be reached in time; safe to retry later."""
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message, retryable=True)
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMUnavailableError):
+    """A model call did not finish before its deadline."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """The circuit breaker is open: the upstream is considered unhealthy."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Decide whether a failed model call is worth retrying."""
+    if isinstance(error, LLMBackendError):
+        return error.retryable
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    try:
+        from google.api_core import exceptions as google_exceptions
+
+        return isinstance(error, (
+            google_exceptions.TooManyRequests,
+            google_exceptions.InternalServerError,
+            google_exceptions.BadGateway,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.GatewayTimeout,
+            google_exceptions.DeadlineExceeded,
+        ))
+    except ImportError:
+        return False
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker. After `failure_threshold` consecutive failures
+    it opens and rejects calls for `recovery_seconds`, then lets one trial call
+    through (half-open); success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.recovery_seconds:
+                    return False
+                self.state = "half_open"
+                self._trial_in_flight = False
+            # Half-open: a single trial call at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_ignored(self) -> None:
+        """The call said nothing about upstream health: free the trial slot, keep the state."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will allow a trial call."""
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+
+class ResilientBackend(LLMBackend):
+    """
+    LLMBackend wrapper adding deadlines, retries, circuit breaking and hedging.
+
+    Args:
+        backend (LLMBackend): The backend doing the real work
+        timeout_seconds (float): Deadline for a single attempt
+        total_deadline_seconds (float): Deadline for all attempts together
+        max_retries (int): Extra attempts after a retryable failure
+        hedge (bool): Send a second attempt if the first is slower than the
+            observed p95 latency, and take whichever finishes first
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        timeout_seconds: float = LLM_TIMEOUT_SECONDS,
+        total_deadline_seconds: float = LLM_TOTAL_DEADLINE_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_base_delay: float = LLM_RETRY_BASE_DELAY,
+        retry_max_delay: float = LLM_RETRY_MAX_DELAY,
+        breaker: CircuitBreaker = None,
+        hedge: bool = LLM_HEDGE_ENABLED,
+        hedge_percentile: float = LLM_HEDGE_PERCENTILE,
+        hedge_min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        call_threads: int = LLM_CALL_THREADS
+    ):
+        self.backend = backend
+        self.name = backend.name
+        self.timeout_seconds = timeout_seconds
+        self.total_deadline_seconds = total_deadline_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.breaker = breaker or CircuitBreaker(
+            LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RECOVERY_SECONDS
+        )
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies = LatencyTracker()
+        self.call_threads = call_threads
+        self._executor = None
+        self._executor_slots = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
+    def check_configured(self) -> None:
+        self.backend.check_configured()
+
+    # ---------------- BLOCKING ----------------
+    def generate(self, prompt: str) -> str:
+        deadline = time.monotonic() + self.total_deadline_seconds
+        attempt = 0
+        while True:
+            self._check_breaker()
+            try:
+                text = self._attempt(prompt, deadline)
+                self.breaker.record_success()
+                return text
+            except Exception as e:
+                self._record_outcome(e)
+                attempt += 1
+                delay = self._backoff(attempt)
+                if (
+                    not is_retryable(e)
+                    or attempt > self.max_retries
+                    or time.monotonic() + delay >= deadline
+                ):
+                    raise
+                time.sleep(delay)
+
+    def _attempt(self, prompt: str, deadline: float) -> str:
+        """One logical attempt: a call, plus a hedge call if the first is slow."""
+        timeout = min(self.timeout_seconds, deadline - time.monotonic())
+        if timeout <= 0:
+            raise LLMTimeoutError("LLM call deadline exceeded")
+
+        started = time.monotonic()
+        futures = {self._submit(self.backend.generate, prompt)}
+
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = wait(futures, timeout=hedge_delay)
+            if not done:
+                # No hedge when every call thread is busy
+                hedge = self._submit(self.backend.generate, prompt, required=False)
+                if hedge is not None:
+                    futures.add(hedge)
+
+        first_error = None
+        while futures:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, futures = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    text = future.result()
+                except Exception as e:
+                    first_error = first_error or e
+                    continue
+                self.latencies.record(time.monotonic() - started)
+                return text
+
+        if first_error is not None and not futures:
+            raise first_error
+        # Stop waiting; the abandoned call finishes in the background
+        raise LLMTimeoutError(f"LLM call timed out after {timeout:.0f}s", retry_after=self._backoff(1))
+
+    # ---------------- STREAMING ----------------
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream with the same protections. Retries only happen before the first
+        chunk is delivered; each chunk must arrive within timeout_seconds.
+        """
+        deadline = time.monotonic() + self.total_deadline_seconds
+        attempt = 0
+        while True:
+            self._check_breaker()
+            delivered = False
+            try:
+                for chunk in self._stream_with_deadline(prompt, deadline):
+                    delivered = True
+                    yield chunk
+                self.breaker.record_success()
+                return
+            except GeneratorExit:
+                # The caller stopped reading (e.g. the client disconnected):
+                # nothing learned, but a half-open trial must give its slot back
+                self.breaker.record_ignored()
+                raise
+            except Exception as e:
+                self._record_outcome(e)
+                attempt += 1
+                delay = self._backoff(attempt)
+                if (
+                    delivered
+                    or not is_retryable(e)
+                    or attempt > self.max_retries
+                    or time.monotonic() + delay >= deadline
+                ):
+                    raise
+                time.sleep(delay)
+
+    def _stream_with_deadline(self, prompt: str, deadline: float) -> Iterator[str]:
+        chunks = queue.Queue()
+        done = object()
+        cancelled = threading.Event()
+
+        def pump():
+            try:
+                for chunk in self.backend.stream(prompt):
+                    if cancelled.is_set():
+                        return
+                    chunks.put(chunk)
+                chunks.put(done)
+            except Exception as e:
+                chunks.put(e)
+
+        self._submit(pump)
+        try:
+            while True:
+                timeout = min(self.timeout_seconds, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise LLMTimeoutError("LLM stream deadline exceeded")
+                try:
+                    item = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    raise LLMTimeoutError(f"LLM stream stalled for {timeout:.0f}s")
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+
+    # ---------------- HELPERS ----------------
+    def _check_breaker(self) -> None:
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(
+                "LLM service is temporarily unavailable. Please try again shortly.",
+                retry_after=self.breaker.retry_after()
+            )
+
+    def _record_outcome(self, error: Exception) -> None:
+        """Only upstream trouble (retryable errors) counts against the breaker."""
+        if isinstance(error, CircuitOpenError):
+            return
+        if is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            # The upstream answered; the request itself was the problem, which
+            # says nothing about whether an open breaker may close
+            self.breaker.record_ignored()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        cap = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def _hedge_delay(self) -> float | None:
+        if not self.hedge or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    def _submit(self, fn, *args, required: bool = True):
+        """
+        Run fn on a call thread. Calls abandoned at their deadline still hold
+        a thread, so with none free this fails fast (or returns None if not
+        required) rather than queueing behind them.
+        """
+        executor, slots = self._get_executor()
+        if not slots.acquire(blocking=False):
+            if not required:
+                return None
+            raise LLMUnavailableError(
+                "LLM service is slow to respond. Please try again shortly.",
+                retry_after=self.timeout_seconds
+            )
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _get_executor(self) -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+        """Created lazily, once per process (safe under gunicorn forks)."""
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.call_threads,
+                    thread_name_prefix="llm-call"
+                )
+                self._executor_slots = threading.BoundedSemaphore(self.call_threads)
+                self._executor_pid = os.getpid()
+            return self._executor, self._executor_slots
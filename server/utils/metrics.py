@@ -0,0 +1,240 @@
+"""
+Metrics
+Prometheus instrumentation shared by every route module: per-stage latency
+histograms (timed_stage), request counters and latency by route and status,
+in-flight gauges, LLM token counters, cache / rate limit counters and
+MongoDB connection pool usage.
+
+Under gunicorn set PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py) so each
+worker writes its samples to that directory and /metrics aggregates them.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Seconds; the top buckets cover slow model calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "jobmate_stage_seconds",
+    "Time spent in one stage of request handling",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter(
+    "jobmate_http_requests_total",
+    "HTTP requests by route, method and status",
+    ["route", "method", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "jobmate_http_request_seconds",
+    "HTTP request latency by route and method",
+    ["route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "jobmate_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+LLM_IN_FLIGHT = Gauge(
+    "jobmate_llm_calls_in_flight",
+    "Model calls currently holding an admission slot",
+    multiprocess_mode="livesum",
+)
+LLM_TOKENS = Counter(
+    "jobmate_llm_tokens_total",
+    "Estimated tokens sent to (prompt) and received from (completion) the model",
+    ["direction"],
+)
+LLM_SHED = Counter(
+    "jobmate_llm_shed_total",
+    "Model calls rejected because no admission slot freed up in time",
+)
+CACHE_EVENTS = Counter(
+    "jobmate_cover_letter_cache_total",
+    "Cover letter cache lookups and stores",
+    ["event"],
+)
+JOB_POSTING_LOOKUPS = Counter(
+    "jobmate_job_posting_lookups_total",
+    "Job posting lookups by where the cleaned text came from",
+    ["result"],
+)
+JOB_DESCRIPTION_EXTRACTIONS = Counter(
+    "jobmate_job_description_extractions_total",
+    "Cleaned job postings by the extractor that found the description",
+    ["extractor"],
+)
+RESUME_EXTRACTIONS = Counter(
+    "jobmate_resume_extractions_total",
+    "Resume text extractions in the worker pool by outcome",
+    ["result"],
+)
+RATE_LIMITED = Counter(
+    "jobmate_rate_limited_total",
+    "Requests rejected by the rate limiter",
+    ["scope"],
+)
+MONGO_POOL_MAX_SIZE = Gauge(
+    "jobmate_mongo_pool_max_size",
+    "Configured MongoDB connection pool size (maxPoolSize) per pool",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "jobmate_mongo_pool_connections",
+    "Open MongoDB connections",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "jobmate_mongo_pool_checked_out",
+    "MongoDB connections currently in use by a request or job",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_WAIT_SECONDS = Histogram(
+    "jobmate_mongo_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the MongoDB pool",
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "jobmate_mongo_pool_checkout_failures_total",
+    "Failed MongoDB connection checkouts (e.g. timeout waiting for a free connection)",
+    ["reason"],
+)
+
+
+@contextmanager
+def timed_stage(stage: str):
+    """
+    Record how long a block takes in jobmate_stage_seconds{stage=...}.
+    Works as a context manager or a decorator:
+
+        with timed_stage("trim_html"):
+            ...
+
+        @timed_stage("resume_extract")
+        def extract(...):
+            ...
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - started)
+
+
+def record_llm_tokens(prompt_tokens: int, completion_tokens: int) -> None:
+    LLM_TOKENS.labels(direction="prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(direction="completion").inc(completion_tokens)
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    PyMongo connection pool listener feeding the jobmate_mongo_pool_* metrics.
+    Compare checked-out connections and wait times against max size to size
+    the pool for the server's worker and thread count.
+    """
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self._checkout_started = threading.local()
+
+    def pool_created(self, event):
+        MONGO_POOL_MAX_SIZE.inc(self.max_pool_size)
+
+    def pool_closed(self, event):
+        MONGO_POOL_MAX_SIZE.dec(self.max_pool_size)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.dec()
+
+    def connection_check_out_started(self, event):
+        self._checkout_started.value = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKED_OUT.inc()
+        self._observe_wait()
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(reason=event.reason).inc()
+        self._observe_wait()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.dec()
+
+    def _observe_wait(self):
+        started = getattr(self._checkout_started, "value", None)
+        if started is not None:
+            MONGO_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+            self._checkout_started.value = None
+
+
+def instrument_app(app) -> None:
+    """Count and time every request by its route template (not the raw path)."""
+    if not METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            HTTP_REQUESTS.labels(route=route, method=request.method, status=str(response.status_code)).inc()
+            HTTP_REQUEST_SECONDS.labels(route=route, method=request.method).observe(
+                time.perf_counter() - started
+            )
+        return response
+
+    @app.teardown_request
+    def _end_request(error=None):
+        HTTP_IN_FLIGHT.dec()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Prometheus text exposition for /metrics. In multiprocess mode the samples
+    of all gunicorn workers are merged.
+
+    Returns:
+        tuple: (body, content type)
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,88 @@
+"""
+Pagination
+Keyset (cursor) pagination for per-user listings. A page is read by
+continuing after the sort key values of the previous page's last document,
+so every page costs the same index range scan however deep the client goes
+(no skip). Cursors are opaque to clients: URL-safe base64 of the key values.
+"""
+
+import base64
+import os
+
+from bson import json_util
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+
+class InvalidPageRequest(ValueError):
+    """The limit or cursor query parameter is malformed."""
+
+
+def parse_page_args(args, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> tuple[int, list | None]:
+    """
+    Read `limit` and `after` from request args.
+
+    Returns:
+        tuple: (limit, key values to continue after, or None for the first page)
+    """
+    raw_limit = args.get("limit")
+    try:
+        limit = default if raw_limit in (None, "") else int(raw_limit)
+    except ValueError:
+        raise InvalidPageRequest("limit must be a number")
+    if limit < 1:
+        raise InvalidPageRequest("limit must be at least 1")
+
+    after = args.get("after")
+    return min(limit, maximum), decode_cursor(after) if after else None
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise InvalidPageRequest("Invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidPageRequest("Invalid cursor")
+    return values
+
+
+def keyset_page(collection, query: dict, sort: list[tuple[str, int]], limit: int,
+                after: list | None = None, projection: dict | None = None) -> tuple[list[dict], str | None]:
+    """
+    Fetch one page of `query` ordered by `sort` (all keys in one direction,
+    ending with a unique key such as _id).
+
+    Returns:
+        tuple: (documents, cursor for the next page or None on the last page)
+    """
+    if after is not None:
+        if len(after) != len(sort):
+            raise InvalidPageRequest("Invalid cursor")
+        query = {"$and": [query, _after_filter(sort, after)]}
+
+    if projection is not None:
+        # The cursor needs the sort keys even if the response does not
+        projection = {**projection, **{field: 1 for field, _ in sort}}
+
+    # One extra document tells us whether there is another page
+    docs = list(collection.find(query, projection).sort(sort).limit(limit + 1))
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1].get(field) for field, _ in sort])
+
+
+def _after_filter(sort: list[tuple[str, int]], values: list) -> dict:
+    # (a, b) after (x, y)  <=>  a > x  or  (a == x and b > y)   (">" is "<" descending)
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {f: values[j] for j, (f, _) in enumerate(sort[:i])}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
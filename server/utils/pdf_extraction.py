@@ -0,0 +1,142 @@
+"""
+PDF Extraction
+Page-parallel text extraction for PDF resumes and portfolios.
+
+Pages are extracted in chunks of PDF_CHUNK_PAGES, several chunks at a time
+(one per extraction worker), in page order. Once the text so far reaches the
+character budget no further chunks are started. Every extracted page is
+cached by the file's SHA-256 (in-process LRU + `pdf_page_cache` collection),
+so re-uploading or re-extracting the same file skips pages already done.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.files_utils import clean_extracted_text
+from utils.ttl_cache import TTLCache
+
+PDF_PAGE_CACHE_COLLECTION = "pdf_page_cache"
+PDF_CHUNK_PAGES = int(os.getenv("PDF_CHUNK_PAGES", "4"))
+RESUME_EXTRACT_MAX_CHARS = int(os.getenv("RESUME_EXTRACT_MAX_CHARS", "50000"))
+PDF_PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PDF_PAGE_CACHE_MAX_ENTRIES", "64"))
+PDF_PAGE_CACHE_TTL_SECONDS = int(os.getenv("PDF_PAGE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+_memory_cache = TTLCache(max_size=PDF_PAGE_CACHE_MAX_ENTRIES, ttl_seconds=PDF_PAGE_CACHE_TTL_SECONDS)
+
+
+def extract_pdf_text(
+    content_hash: str,
+    run_chunk,
+    workers: int = 1,
+    max_pages: int = None,
+    max_chars: int = RESUME_EXTRACT_MAX_CHARS,
+    chunk_pages: int = PDF_CHUNK_PAGES,
+    db=None,
+) -> str:
+    """
+    Extract the text of a PDF, page ranges in parallel.
+
+    Args:
+        content_hash (str): SHA-256 of the PDF file (the page cache key)
+        run_chunk (callable): run_chunk(page_indexes) -> files_utils.extract_pdf_pages
+            result; normally runs it in an extraction worker process, within
+            what is left of the file's time limit
+        workers (int): Chunks extracted at the same time
+        max_pages (int, optional): Ignore pages after this many
+        max_chars (int): Stop once the text is this long; the result is cut to it
+        chunk_pages (int): Pages per chunk
+        db: Database for the shared page cache (memory only if None)
+
+    Returns:
+        str: Cleaned text, same format as extract_text_from_file
+    """
+    page_count, pages = get_cached_pages(db, content_hash)
+    new_pages = {}
+
+    def _run(indexes):
+        result = run_chunk(indexes)
+        new_pages.update(result["pages"])
+        return result
+
+    if page_count is None:
+        # The first chunk also tells us how many pages there are
+        first = list(range(chunk_pages if max_pages is None else min(chunk_pages, max_pages)))
+        page_count = _run(first)["page_count"]
+        pages.update(new_pages)
+
+    limit = page_count if max_pages is None else min(page_count, max_pages)
+    used, size = 0, 0
+    while used < limit and size < max_chars:
+        # Count pages we already have, in order, against the budget
+        while used < limit and used in pages and size < max_chars:
+            size += len(clean_extracted_text(pages[used])) + 1
+            used += 1
+        if used >= limit or size >= max_chars:
+            break
+
+        # Next wave: up to one chunk per worker of the missing pages
+        missing = [i for i in range(used, limit) if i not in pages][:chunk_pages * workers]
+        chunks = [missing[i:i + chunk_pages] for i in range(0, len(missing), chunk_pages)]
+        if len(chunks) == 1:
+            _run(chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="pdf-pages") as pool:
+                list(pool.map(_run, chunks))
+        pages.update(new_pages)
+        if used not in pages:
+            break
+
+    if new_pages:
+        store_pages(db, content_hash, page_count, new_pages)
+
+    text = clean_extracted_text("\n".join(pages[i] for i in range(used)))
+    return text[:max_chars].rstrip()
+
+
+def get_cached_pages(db, content_hash: str) -> tuple[int | None, dict]:
+    """
+    Return (page count or None if the file was never seen, {index: page text})
+    for a PDF's content hash.
+    """
+    cached = _memory_cache.get(content_hash)
+    if cached is not None:
+        return cached[0], dict(cached[1])
+
+    if db is not None:
+        try:
+            doc = db[PDF_PAGE_CACHE_COLLECTION].find_one({"_id": content_hash})
+        except Exception as e:
+            print(f"PDF page cache lookup failed: {e}")
+            doc = None
+        if doc is not None:
+            pages = {int(i): text for i, text in (doc.get("pages") or {}).items()}
+            _memory_cache.set(content_hash, (doc.get("page_count"), pages))
+            return doc.get("page_count"), dict(pages)
+
+    return None, {}
+
+
+def store_pages(db, content_hash: str, page_count: int, pages: dict) -> None:
+    """Add newly extracted pages to both cache tiers. Failures are only logged."""
+    _, cached = get_cached_pages(None, content_hash)
+    _memory_cache.set(content_hash, (page_count, {**cached, **pages}))
+
+    if db is None:
+        return
+    try:
+        db[PDF_PAGE_CACHE_COLLECTION].update_one(
+            {"_id": content_hash},
+            {"$set": {
+                "page_count": page_count,
+                "updated_at": datetime.utcnow(),
+                **{f"pages.{i}": text for i, text in pages.items()},
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"Failed to store PDF pages: {e}")
+
+
+def clear_memory_cache() -> None:
+    _memory_cache.clear()
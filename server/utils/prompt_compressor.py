@@ -0,0 +1,198 @@
+"""
+Prompt Compression
+Shrinks the job posting and resume before they are pasted into the prompt:
+drops boilerplate (EEO statements, benefits blurbs, cookie banners),
+removes repeated lines, keeps the resume sections most relevant to the
+posting, and enforces a token budget.
+"""
+
+import math
+import os
+import re
+
+from utils.resume_digest import section_for_heading
+
+# Combined token budget for job posting + resume in the prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+
+# Rough average for English text with Gemini-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Matched against whole sentences, which are dropped. Patterns follow the
+# wording of boilerplate, not bare topics: a posting for a security or HR
+# role can have real duties about cookies, background checks or PTO.
+BOILERPLATE_PATTERNS = [
+    # Equal opportunity / legal
+    r"equal (employment )?opportunity (employer|workplace)",
+    r"without regard to (race|color|religion|sex|gender|age|national origin)",
+    r"\bprotected (veteran )?status\b|protected by (applicable |federal |state |local )*law",
+    r"(request|provide|need|require)s? (a )?reasonable accommodations?",
+    r"reasonable accommodations? (will be|are|is|may be|can be) (made|provided|available)",
+    r"\b(participates? in|uses?) e-?verify\b",
+    r"affirmative action (employer|program|plan)",
+    r"(subject to|contingent (up)?on|(must|required to) pass|successful completion of) "
+    r"(a |the )?(criminal |pre-employment )?background (check|screening)",
+    # Benefits blurbs
+    r"\b401\s?\(?k\)? (plan )?(with )?(company |employer )?match",
+    r"\bmedical, dental,? (and|&) vision\b",
+    r"(comprehensive|competitive|full) (medical|health|dental) (insurance|benefits|coverage)",
+    r"\b(unlimited|generous|flexible|competitive|\d+ (days|weeks)( of)?) (pto|paid time off|vacation|parental leave)\b",
+    r"\b(our|the|your) (perks|benefits) (include|package includes)\b|\bperks include\b",
+    r"(competitive|comprehensive|generous) benefits package",
+    r"access to (an |our )?employee assistance program",
+    # Cookie banners and page chrome
+    r"\b(we|this (site|website)) uses? cookies\b|\baccept (all )?cookies\b|\bcookie (settings|preferences)\b",
+    r"\b(read|see|view|review|agree to|accept) (our|the) (privacy (policy|notice|statement)|terms of (use|service))",
+    r"\b(sign|log) in to (apply|save|continue|view|see)\b",
+    r"^share (this (job|posting|page)|on (linkedin|facebook|twitter|x|email))\b",
+    r"^(easy )?apply( now| for this job)?[.!]?$|\bclick (here )?to apply\b",
+    r"^(see |view |more )?(similar|related|recommended) jobs\b",
+    r"report this (job|listing)",
+]
+_BOILERPLATE_RE = re.compile("|".join(f"(?:{p})" for p in BOILERPLATE_PATTERNS), re.I)
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "our", "that", "the", "this", "to",
+    "we", "will", "with", "you", "your", "who", "work", "team", "years", "year",
+    "experience", "ability", "able", "strong", "including", "etc", "role",
+}
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]|[a-z]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer round trip)."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def compress_prompt_inputs(
+    job_posting: str,
+    resume: str,
+    token_budget: int = PROMPT_TOKEN_BUDGET
+) -> tuple[str, str, dict]:
+    """
+    Compress the job posting and resume to fit a shared token budget.
+
+    Args:
+        job_posting (str): Cleaned job description (output of trim_html)
+        resume (str): Resume text
+        token_budget (int): Max estimated tokens for both inputs together
+
+    Returns:
+        tuple: (job_posting, resume, stats) where stats holds before/after
+        token estimates for each input and in total.
+    """
+    before_job = estimate_tokens(job_posting)
+    before_resume = estimate_tokens(resume)
+
+    job_units = _strip_boilerplate(_split_sentences(job_posting))
+    resume_lines = _dedupe([line.strip() for line in resume.splitlines() if line.strip()])
+
+    job_tokens = sum(estimate_tokens(u) + 1 for u in job_units)
+    resume_tokens = sum(estimate_tokens(line) + 1 for line in resume_lines)
+
+    # Each side gets half the budget, plus whatever the other side leaves unused
+    half = token_budget // 2
+    job_budget = max(half, token_budget - resume_tokens)
+    resume_budget = max(half, token_budget - min(job_tokens, job_budget))
+
+    job_units = _take_within_budget(job_units, job_budget)
+    if resume_tokens > resume_budget:
+        resume_lines = _select_resume_sections(resume_lines, job_units, resume_budget)
+
+    compressed_job = " ".join(job_units)
+    compressed_resume = "\n".join(resume_lines)
+
+    after_job = estimate_tokens(compressed_job)
+    after_resume = estimate_tokens(compressed_resume)
+    stats = {
+        "budget": token_budget,
+        "job_posting": {"before": before_job, "after": after_job},
+        "resume": {"before": before_resume, "after": after_resume},
+        "total_before": before_job + before_resume,
+        "total_after": after_job + after_resume,
+    }
+    return compressed_job, compressed_resume, stats
+
+
+def _split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text or "") if s.strip()]
+
+
+def _strip_boilerplate(units: list[str]) -> list[str]:
+    return _dedupe([u for u in units if not _BOILERPLATE_RE.search(u)])
+
+
+def _dedupe(units: list[str]) -> list[str]:
+    """Drop repeated lines/sentences (ignoring case, spacing and punctuation)."""
+    seen = set()
+    kept = []
+    for unit in units:
+        key = re.sub(r"[\W_]+", " ", unit.lower()).strip()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        kept.append(unit)
+    return kept
+
+
+def _take_within_budget(units: list[str], budget: int) -> list[str]:
+    """Keep units in order until the budget is used up."""
+    kept = []
+    used = 0
+    for unit in units:
+        cost = estimate_tokens(unit) + 1
+        if used + cost > budget:
+            break
+        kept.append(unit)
+        used += cost
+    return kept
+
+
+def _keywords(text: str) -> set[str]:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS and len(w) > 1}
+
+
+def _select_resume_sections(lines: list[str], job_units: list[str], budget: int) -> list[str]:
+    """
+    Keep the header (name/contact) and the resume sections that share the most
+    keywords with the posting, in their original order, within the budget.
+    """
+    sections = [[]]
+    current = "contact"
+    for line in lines:
+        heading = section_for_heading(line, current)
+        if heading:
+            current = heading
+        if heading and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+
+    job_keywords = _keywords(" ".join(job_units))
+
+    def score(section):
+        words = _keywords(" ".join(section))
+        if not words:
+            return 0.0
+        # Overlap, lightly normalized so long sections don't win by size alone
+        return len(words & job_keywords) / math.sqrt(len(words))
+
+    header, rest = sections[0], list(enumerate(sections[1:], start=1))
+    chosen = {0: _take_within_budget(header, budget)}
+    used = sum(estimate_tokens(line) + 1 for line in chosen[0])
+
+    for index, section in sorted(rest, key=lambda item: score(item[1]), reverse=True):
+        remaining = budget - used
+        if remaining <= 0:
+            break
+        kept = _take_within_budget(section, remaining)
+        # Each section starts with its heading, and a heading on its own is useless
+        if len(kept) > 1:
+            chosen[index] = kept
+            used += sum(estimate_tokens(line) + 1 for line in kept)
+
+    return [line for index in sorted(chosen) for line in chosen[index]]
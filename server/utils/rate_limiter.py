@@ -0,0 +1,274 @@
+"""
+Rate Limiting and Admission Control
+Token-bucket limits on cover letter generation, per user and for the whole
+service, with bucket state in MongoDB so every gunicorn worker sees the same
+counts. A separate in-flight cap bounds concurrent model calls: callers wait
+briefly for a slot and are shed with a Retry-After once the wait runs out.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from pymongo import ReturnDocument
+
+from utils.llm_client import LLMUnavailableError
+from utils.metrics import LLM_IN_FLIGHT, LLM_SHED, RATE_LIMITED
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# "mongo" (shared by all workers) or "memory" (this process only: dev and tests)
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "mongo").lower()
+RATE_LIMIT_USER_PER_MINUTE = float(os.getenv("RATE_LIMIT_USER_PER_MINUTE", "10"))
+RATE_LIMIT_USER_BURST = int(os.getenv("RATE_LIMIT_USER_BURST", "5"))
+# Batch requests spend a separate per-user bucket, sized for a full batch
+RATE_LIMIT_BATCH_PER_MINUTE = float(os.getenv("RATE_LIMIT_BATCH_PER_MINUTE", "20"))
+RATE_LIMIT_BATCH_BURST = int(os.getenv("RATE_LIMIT_BATCH_BURST", "20"))
+RATE_LIMIT_GLOBAL_PER_MINUTE = float(os.getenv("RATE_LIMIT_GLOBAL_PER_MINUTE", "300"))
+RATE_LIMIT_GLOBAL_BURST = int(os.getenv("RATE_LIMIT_GLOBAL_BURST", "50"))
+RATE_LIMIT_COLLECTION = "rate_limits"
+
+# Concurrent model calls per worker process, and how long a call may wait for a slot
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("LLM_ADMISSION_TIMEOUT_SECONDS", "5"))
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """A bucket is empty; retry_after is the time until it holds enough tokens."""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class OverloadedError(LLMUnavailableError):
+    """No model call slot freed up in time: the request was shed."""
+
+
+class MemoryBucketStore:
+    """Token buckets in a dict. Only shared between threads of one process."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float) -> tuple[bool, float]:
+        """
+        Refill the bucket for the time elapsed, then take `cost` tokens if present.
+
+        Returns:
+            tuple: (allowed, tokens left after the call)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+        return allowed, tokens
+
+    def give_back(self, key: str, capacity: float, cost: float) -> None:
+        """Return tokens taken by a request that was then turned away."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + cost), updated)
+
+
+class MongoBucketStore:
+    """
+    Token buckets in the `rate_limits` collection. Refill and take happen in a
+    single pipeline update, so concurrent workers never double-spend a token.
+    The server clock ($$NOW) is used so worker clocks don't need to agree.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def take(self, key: str, capacity: float, rate: float, cost: float) -> tuple[bool, float]:
+        elapsed = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]}
+        refilled = {"$min": [capacity, {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed, rate]}]}]}
+        # Idle buckets are full again after capacity / rate seconds; expire them after that
+        idle_ms = int(math.ceil(capacity / rate * 1000)) if rate > 0 else 86400 * 1000
+
+        doc = self.db[RATE_LIMIT_COLLECTION].find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": "$$NOW"}},
+                {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                    "expires_at": {"$add": ["$$NOW", idle_ms]},
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return bool(doc["allowed"]), float(doc["tokens"])
+
+    def give_back(self, key: str, capacity: float, cost: float) -> None:
+        self.db[RATE_LIMIT_COLLECTION].update_one(
+            {"_id": key},
+            [{"$set": {"tokens": {"$min": [capacity, {"$add": ["$tokens", cost]}]}}}],
+        )
+
+
+class RateLimiter:
+    """
+    Per-user and global token buckets. The user bucket is checked first so a
+    single noisy user is turned away before spending the shared budget; if the
+    global bucket then turns the request away, the user's tokens are given back.
+    Batch requests use a second per-user bucket ("batch" scope), so a batch
+    can be bigger than the burst allowed for single letters.
+
+    Args:
+        store: MemoryBucketStore or MongoBucketStore
+        user_per_minute / user_burst: Refill rate and capacity of each user's bucket
+        batch_per_minute / batch_burst: Refill rate and capacity of each user's batch bucket
+        global_per_minute / global_burst: Refill rate and capacity of the shared bucket
+    """
+
+    def __init__(
+        self,
+        store,
+        user_per_minute: float = RATE_LIMIT_USER_PER_MINUTE,
+        user_burst: int = RATE_LIMIT_USER_BURST,
+        batch_per_minute: float = RATE_LIMIT_BATCH_PER_MINUTE,
+        batch_burst: int = RATE_LIMIT_BATCH_BURST,
+        global_per_minute: float = RATE_LIMIT_GLOBAL_PER_MINUTE,
+        global_burst: int = RATE_LIMIT_GLOBAL_BURST
+    ):
+        self.store = store
+        self.buckets = {
+            "user": (user_burst, user_per_minute / 60),
+            "batch": (batch_burst, batch_per_minute / 60),
+            "global": (global_burst, global_per_minute / 60),
+        }
+
+    def max_cost(self, scope: str = "user") -> int:
+        """Largest cost a single request can ever be granted (the smaller capacity it spends from)."""
+        return int(min(self.buckets[scope][0], self.buckets["global"][0]))
+
+    def check(self, user_id, cost: int = 1, scope: str = "user") -> None:
+        """
+        Spend `cost` tokens from the user's bucket for `scope` ("user" or
+        "batch") and the global bucket.
+
+        Raises:
+            ValueError: If cost is above max_cost(scope) (callers must refuse such requests)
+            RateLimitExceeded: If either bucket is short of tokens
+        """
+        max_cost = self.max_cost(scope)
+        if cost > max_cost:
+            raise ValueError(f"Request cost {cost} is above the rate limit capacity {max_cost}")
+
+        taken = []
+        for bucket, key in ((scope, f"{scope}:{user_id}"), ("global", "global")):
+            capacity, rate = self.buckets[bucket]
+            allowed, tokens = self.store.take(key, capacity, rate, cost)
+            if not allowed:
+                for taken_key, taken_capacity in taken:
+                    self.store.give_back(taken_key, taken_capacity, cost)
+                retry_after = (cost - tokens) / rate if rate > 0 else 60.0
+                raise RateLimitExceeded(bucket, retry_after)
+            taken.append((key, capacity))
+
+
+class AdmissionController:
+    """
+    Caps concurrent model calls in this process. A caller waits up to
+    `timeout_seconds` for a slot; after that it is shed with OverloadedError
+    rather than queueing behind everyone else.
+    """
+
+    def __init__(self, max_in_flight: int = LLM_MAX_IN_FLIGHT, timeout_seconds: float = LLM_ADMISSION_TIMEOUT_SECONDS):
+        self.max_in_flight = max_in_flight
+        self.timeout_seconds = timeout_seconds
+        self.in_flight = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        if not self._slots.acquire(timeout=self.timeout_seconds):
+            with self._lock:
+                self.rejected += 1
+            LLM_SHED.inc()
+            raise OverloadedError(
+                "Cover letter generation is at capacity. Please try again shortly.",
+                retry_after=max(1.0, self.timeout_seconds)
+            )
+        with self._lock:
+            self.in_flight += 1
+        LLM_IN_FLIGHT.inc()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            LLM_IN_FLIGHT.dec()
+            self._slots.release()
+
+
+llm_admission = AdmissionController()
+
+
+def get_rate_limiter(db=None) -> RateLimiter:
+    """Return the process-wide limiter, creating it on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            if RATE_LIMIT_STORE == "memory" or db is None:
+                store = MemoryBucketStore()
+            elif RATE_LIMIT_STORE == "mongo":
+                store = MongoBucketStore(db)
+            else:
+                raise ValueError(f"Unknown rate limit store: {RATE_LIMIT_STORE}")
+            _limiter = RateLimiter(store)
+        return _limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None) -> None:
+    """Replace the process-wide limiter (tests). None resets to RATE_LIMIT_STORE."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
+
+
+def max_rate_limit_cost(db=None, scope: str = "user") -> int | None:
+    """Most generations one request may ask for at once, or None without rate limits."""
+    if not RATE_LIMIT_ENABLED:
+        return None
+    return get_rate_limiter(db).max_cost(scope)
+
+
+def check_rate_limit(db, user_id, cost: int = 1, scope: str = "user") -> float | None:
+    """
+    Apply the generation rate limits for one request ("batch" scope for batch
+    requests). cost must not be above max_rate_limit_cost(db, scope).
+    The limiter fails open: if its store is unreachable the request goes through.
+
+    Returns:
+        float | None: Seconds to wait before retrying, or None if allowed
+    """
+    if not RATE_LIMIT_ENABLED:
+        return None
+    try:
+        get_rate_limiter(db).check(user_id, cost, scope)
+    except RateLimitExceeded as e:
+        RATE_LIMITED.labels(scope=e.scope).inc()
+        return e.retry_after
+    except ValueError:
+        # A request too big to ever be admitted is the caller's bug: don't let it through
+        raise
+    except Exception as e:
+        print(f"Rate limiter unavailable, allowing request: {e}")
+    return None
@@ -0,0 +1,246 @@
+"""
+Resume Digest
+Builds a structured, compact view of a resume once, at upload time:
+sections (contact, summary, skills, experience, education, ...), normalized
+skill keywords, a one-paragraph summary and a compact text rendering that
+is used in generation prompts instead of the raw resume text.
+"""
+
+import re
+
+DIGEST_VERSION = 2
+
+# Heading text (lowercase, no trailing colon) -> canonical section
+RESUME_HEADINGS = {
+    "summary": "summary",
+    "profile": "summary",
+    "professional summary": "summary",
+    "objective": "summary",
+    "career objective": "summary",
+    "about me": "summary",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core competencies": "skills",
+    "technologies": "skills",
+    "tools": "skills",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "education": "education",
+    "academic background": "education",
+    "projects": "projects",
+    "personal projects": "projects",
+    "academic projects": "projects",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "licenses": "certifications",
+    "awards": "other",
+    "achievements": "other",
+    "publications": "other",
+    "volunteer": "other",
+    "volunteer experience": "other",
+    "leadership": "other",
+    "languages": "other",
+    "interests": "interests",
+    "hobbies": "interests",
+    "activities": "interests",
+    "references": "interests",
+}
+
+# Sections worth sending to the model, in prompt order
+PROMPT_SECTIONS = ["summary", "skills", "experience", "projects", "education", "certifications", "other"]
+
+SKILL_ALIASES = {
+    "py": "Python", "python": "Python", "python3": "Python", "js": "JavaScript", "javascript": "JavaScript",
+    "ts": "TypeScript", "typescript": "TypeScript", "node": "Node.js", "nodejs": "Node.js",
+    "node.js": "Node.js", "react": "React", "reactjs": "React", "react.js": "React",
+    "vue": "Vue", "vuejs": "Vue", "angular": "Angular", "golang": "Go", "go": "Go",
+    "java": "Java", "c#": "C#", "c++": "C++", "cpp": "C++", "ruby": "Ruby", "php": "PHP",
+    "rust": "Rust", "kotlin": "Kotlin", "swift": "Swift", "sql": "SQL", "nosql": "NoSQL",
+    "postgres": "PostgreSQL", "postgresql": "PostgreSQL", "mysql": "MySQL",
+    "mongo": "MongoDB", "mongodb": "MongoDB", "redis": "Redis", "flask": "Flask",
+    "django": "Django", "fastapi": "FastAPI", "spring": "Spring", "spring boot": "Spring Boot",
+    "express": "Express", "express.js": "Express", "graphql": "GraphQL", "rest": "REST APIs",
+    "rest api": "REST APIs", "rest apis": "REST APIs", "docker": "Docker",
+    "k8s": "Kubernetes", "kubernetes": "Kubernetes", "aws": "AWS", "amazon web services": "AWS",
+    "gcp": "GCP", "google cloud": "GCP", "azure": "Azure", "terraform": "Terraform",
+    "ci/cd": "CI/CD", "cicd": "CI/CD", "git": "Git", "github": "GitHub", "linux": "Linux",
+    "html": "HTML", "html5": "HTML", "css": "CSS", "css3": "CSS", "tailwind": "Tailwind CSS",
+    "pandas": "pandas", "numpy": "NumPy", "pytorch": "PyTorch", "tensorflow": "TensorFlow",
+    "scikit-learn": "scikit-learn", "sklearn": "scikit-learn", "ml": "Machine Learning",
+    "machine learning": "Machine Learning", "kafka": "Kafka", "spark": "Spark",
+    "airflow": "Airflow", "jenkins": "Jenkins", "pytest": "pytest", "junit": "JUnit",
+    "agile": "Agile", "scrum": "Scrum", "jira": "Jira", "figma": "Figma", "excel": "Excel",
+}
+
+# Sections whose text has capitalized names of their own (name, employers,
+# projects): short all-caps lines there are content, not headings
+_CAPS_TEXT_SECTIONS = {"contact", "experience", "projects"}
+
+# Below this share of the resume's characters the compact text is not
+# trusted (e.g. headings we do not know) and the raw text is used instead
+MIN_COMPACT_COVERAGE = 0.6
+
+# Aliases that are also common English words: only trusted inside a skills section
+_AMBIGUOUS_ALIASES = {"rest", "spring", "express", "swift", "rust", "excel", "node", "spark", "agile", "tools"}
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
+_LINK_RE = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com)/[\w/-]+", re.I)
+_SKILL_SPLIT_RE = re.compile(r"[,;|•·\n/]+|\s{2,}|\s-\s")
+_SKILL_PREFIX_RE = re.compile(r"^[\w\s&]{2,30}:\s*")
+_BULLET_RE = re.compile(r"^[\-\*•·▪◦●]\s*")
+
+
+def section_for_heading(line: str, current: str | None = None) -> str | None:
+    """
+    Return the canonical section name if the line is a resume heading.
+    `current` is the section the line appears in, if known.
+    """
+    stripped = line.strip()
+    name = stripped.rstrip(":").strip().lower()
+    if name in RESUME_HEADINGS:
+        return RESUME_HEADINGS[name]
+    if current in _CAPS_TEXT_SECTIONS:
+        return None
+    # Short all-caps lines such as "RELEVANT COURSEWORK"
+    letters = sum(c.isalpha() for c in stripped)
+    if len(stripped) <= 40 and stripped.isupper() and letters >= 4 and "," not in stripped:
+        return "other"
+    return None
+
+
+def split_sections(resume_text: str) -> list[tuple[str, list[str]]]:
+    """
+    Split resume lines into (section, lines) pairs in document order.
+    Lines before the first heading belong to "contact"; headings are kept
+    as the first line of their section.
+    """
+    sections = [("contact", [])]
+    for line in (l.strip() for l in (resume_text or "").splitlines()):
+        if not line:
+            continue
+        section = section_for_heading(line, sections[-1][0])
+        if section and sections[-1][1]:
+            sections.append((section, []))
+        elif section:
+            sections[-1] = (section, [])
+        sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def normalize_skills(text: str) -> list[str]:
+    """Split a skills blob into canonical skill names, deduplicated in order."""
+    skills = []
+    seen = set()
+    for raw in _SKILL_SPLIT_RE.split(text or ""):
+        item = _SKILL_PREFIX_RE.sub("", _BULLET_RE.sub("", raw.strip())).strip(" .()")
+        if not item or len(item) > 40 or item.lower().rstrip(":") in RESUME_HEADINGS:
+            continue
+        canonical = SKILL_ALIASES.get(item.lower(), item)
+        key = canonical.lower()
+        if key not in seen:
+            seen.add(key)
+            skills.append(canonical)
+    return skills
+
+
+def build_resume_digest(resume_text: str) -> dict:
+    """
+    Build the digest stored beside `resume_text` in `user_resume`.
+
+    Returns:
+        dict: {"version", "sections", "contact", "skills", "summary", "compact_text"}
+    """
+    sections = {}
+    for name, lines in split_sections(resume_text):
+        # Every section but contact starts with its heading line
+        body = lines if name == "contact" else lines[1:]
+        sections.setdefault(name, []).extend(body)
+
+    contact_lines = sections.get("contact", [])
+    contact = {
+        "name": contact_lines[0] if contact_lines else None,
+        "email": _first_match(_EMAIL_RE, resume_text),
+        "phone": _first_match(_PHONE_RE, "\n".join(contact_lines)),
+        "links": sorted(set(_LINK_RE.findall(resume_text or ""))),
+    }
+
+    skills = normalize_skills("\n".join(sections.get("skills", [])))
+    # Known technologies mentioned elsewhere (e.g. in experience bullets)
+    lowered = (resume_text or "").lower()
+    words = set(re.findall(r"[a-z][a-z0-9+#./-]*[a-z0-9+#]", lowered))
+    known = {skill.lower() for skill in skills}
+    for alias, canonical in SKILL_ALIASES.items():
+        # Two-letter words ("go", "ml", "js") are too noisy outside a skills list
+        if (len(alias) <= 2 and alias.isalpha()) or alias in _AMBIGUOUS_ALIASES or canonical.lower() in known:
+            continue
+        if alias in words or (" " in alias and alias in lowered):
+            skills.append(canonical)
+            known.add(canonical.lower())
+
+    compact_sections = {}
+    for name in PROMPT_SECTIONS:
+        lines = _dedupe_lines(sections.get(name, []))
+        if name == "skills" and skills:
+            lines = [", ".join(skills)]
+        if lines:
+            compact_sections[name] = lines
+
+    summary = _build_summary(contact, skills, sections)
+
+    # The contact area also holds any summary written under the name, and
+    # is all there is when the resume has no headings we recognize
+    compact_lines = _dedupe_lines(contact_lines)
+    for name, lines in compact_sections.items():
+        compact_lines.append(name.upper())
+        compact_lines.extend(lines)
+    compact_text = "\n".join(compact_lines)
+
+    if len(compact_text) < MIN_COMPACT_COVERAGE * len(_squeeze(resume_text)):
+        compact_text = _squeeze(resume_text)
+
+    return {
+        "version": DIGEST_VERSION,
+        "sections": {name: "\n".join(lines) for name, lines in sections.items()},
+        "contact": contact,
+        "skills": skills,
+        "summary": summary,
+        "compact_text": compact_text,
+    }
+
+
+def _build_summary(contact: dict, skills: list[str], sections: dict) -> str:
+    parts = []
+    if sections.get("summary"):
+        parts.append(" ".join(sections["summary"])[:300])
+    if skills:
+        parts.append("Key skills: " + ", ".join(skills[:12]) + ".")
+    experience = [l for l in sections.get("experience", []) if not _BULLET_RE.match(l)]
+    if experience:
+        parts.append(f"Most recent role: {experience[0]}.")
+    if sections.get("education"):
+        parts.append(f"Education: {sections['education'][0]}.")
+    return " ".join(parts)
+
+
+def _dedupe_lines(lines: list[str]) -> list[str]:
+    seen = set()
+    kept = []
+    for line in lines:
+        key = re.sub(r"[\W_]+", " ", line.lower()).strip()
+        if key and key not in seen:
+            seen.add(key)
+            kept.append(_BULLET_RE.sub("- ", line))
+    return kept
+
+
+def _squeeze(text: str) -> str:
+    return "\n".join(line.strip() for line in (text or "").splitlines() if line.strip())
+
+
+def _first_match(pattern, text: str) -> str | None:
+    match = pattern.search(text or "")
+    return match.group(0).strip() if match else None
@@ -0,0 +1,144 @@
+"""
+Resume Processing
+Turns a stored resume file into text and a digest off the request path. The
+upload route saves the file to GridFS with a user_resume document in the
+"pending" state and returns; a local pool of worker threads then claims the
+document ("processing"), extracts the text in the extraction worker processes
+(utils/extraction_pool.py) and marks it "ready" or "failed".
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import gridfs
+
+from utils.extraction_pool import (
+    ExtractionBusy,
+    ExtractionError,
+    ExtractionTimeout,
+    extract_resume_text,
+)
+from utils.metrics import timed_stage
+from utils.resume_digest import build_resume_digest
+from utils.upload_spool import SpooledUpload
+
+RESUME_PROCESSING_WORKERS = int(os.getenv("RESUME_PROCESSING_WORKERS", "2"))
+# Resumes still pending/processing after this long were lost (e.g. worker restart)
+RESUME_PROCESSING_STALE_SECONDS = int(os.getenv("RESUME_PROCESSING_STALE_SECONDS", "300"))
+# Tries when every extraction worker is busy
+RESUME_PROCESSING_ATTEMPTS = 3
+
+PENDING, PROCESSING, READY, FAILED = "pending", "processing", "ready", "failed"
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+class ResumeRejected(Exception):
+    """The file was read but holds no usable resume text."""
+
+
+def enqueue_resume_processing(db, resume_id) -> None:
+    """Hand a pending user_resume document to the local worker pool."""
+    _get_executor().submit(process_resume, db, resume_id)
+
+
+def process_resume(db, resume_id) -> str | None:
+    """
+    Claim a pending resume and extract it. Failures are recorded on the
+    document, never raised.
+
+    Returns:
+        str | None: The final status, or None if the resume was not pending
+    """
+    resumes = db.user_resume
+
+    # Claim the resume so it is only processed once
+    doc = resumes.find_one_and_update(
+        {"_id": resume_id, "status": PENDING},
+        {"$set": {"status": PROCESSING, "updated_at": datetime.utcnow()}},
+    )
+    if not doc:
+        return None
+
+    try:
+        resume_text = _extract(db, doc)
+        with timed_stage("resume_digest"):
+            resume_digest = build_resume_digest(resume_text)
+        update = {"status": READY, "resume_text": resume_text, "resume_digest": resume_digest, "error": None}
+    except ResumeRejected as e:
+        update = {"status": FAILED, "error": str(e)}
+    except ExtractionTimeout:
+        update = {"status": FAILED, "error": "Resume took too long to read. Please upload a smaller or text-based PDF/DOCX."}
+    except (ExtractionError, ExtractionBusy):
+        update = {"status": FAILED, "error": "Could not extract text. Please upload a text-based PDF/DOCX."}
+    except Exception as e:
+        print(f"Failed to process resume {resume_id}: {e}")
+        update = {"status": FAILED, "error": "Could not process resume. Please try uploading it again."}
+
+    now = datetime.utcnow()
+    update.update({"updated_at": now, "processed_at": now})
+    try:
+        # The user may have replaced or deleted the resume meanwhile
+        resumes.update_one({"_id": resume_id, "status": PROCESSING}, {"$set": update})
+    except Exception as e:
+        print(f"Failed to record resume processing {resume_id}: {e}")
+    return update["status"]
+
+
+def resume_status(resume_doc: dict) -> tuple[str, str | None]:
+    """
+    Return (status, error) for a user_resume document. Documents from before
+    background processing are ready; ones stuck in pending/processing past
+    RESUME_PROCESSING_STALE_SECONDS are reported as failed.
+    """
+    status = resume_doc.get("status") or READY
+    error = resume_doc.get("error")
+    if status in (PENDING, PROCESSING):
+        updated_at = resume_doc.get("updated_at")
+        if updated_at and updated_at < datetime.utcnow() - timedelta(seconds=RESUME_PROCESSING_STALE_SECONDS):
+            status, error = FAILED, "Resume processing was interrupted. Please upload it again."
+    return status, error
+
+
+def _extract(db, doc) -> str:
+    filename = doc["file_name"]
+    grid_out = gridfs.GridFS(db).get(doc["resume_file"])
+
+    # Copy the stored file to a spool so the extraction workers read it by path
+    with SpooledUpload(grid_out, max_bytes=grid_out.length) as upload:
+        for attempt in range(1, RESUME_PROCESSING_ATTEMPTS + 1):
+            try:
+                with timed_stage("resume_extract"):
+                    resume_text = extract_resume_text(upload.source(), filename, db, doc.get("content_hash"))
+                break
+            except ExtractionBusy as e:
+                if attempt == RESUME_PROCESSING_ATTEMPTS:
+                    raise
+                time.sleep(e.retry_after)
+
+    # If extractor says unsupported, stop here
+    if resume_text.strip() in {"[Unsupported file type]"}:
+        raise ResumeRejected("Unsupported file type")
+
+    # For PDF/DOC/DOCX we expect non-empty extracted text
+    if filename.lower().endswith((".pdf", ".doc", ".docx")) and not resume_text.strip():
+        raise ResumeRejected("Could not extract text. Please upload a text-based PDF/DOCX.")
+    return resume_text
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the worker pool lazily, once per process (safe under gunicorn forks)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=RESUME_PROCESSING_WORKERS,
+                thread_name_prefix="resume-processing"
+            )
+            _executor_pid = os.getpid()
+        return _executor
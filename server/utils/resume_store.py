@@ -0,0 +1,91 @@
+"""
+Resume Store
+Content-addressed bookkeeping for uploaded resumes. Each user_resume
+document records the SHA-256 of its file (content_hash). Identical uploads,
+from any user, reuse the stored text and point at the same GridFS file.
+
+Each GridFS file has a reference count in `resume_blobs`
+({_id: file id, refs}), changed only with atomic $inc. A resume takes a
+reference before pointing at a file and drops it when deleted; the file is
+deleted once the count reaches 0, and a count at 0 can't be raised again,
+so an upload racing with the last release stores its own copy instead.
+Migration 6 seeds the counts for files uploaded before they existed.
+"""
+
+import os
+
+from pymongo import ReturnDocument
+
+RESUME_BLOBS_COLLECTION = "resume_blobs"
+
+
+def find_resume_by_hash(db, content_hash: str, filename: str) -> dict | None:
+    """
+    Return a stored resume with the same content (and file extension, since
+    extraction depends on it), or None.
+    """
+    ext = _extension(filename)
+    candidates = db.user_resume.find(
+        {"content_hash": content_hash},
+        {"file_name": 1, "resume_text": 1, "resume_digest": 1, "resume_file": 1},
+    ).limit(10)
+    for doc in candidates:
+        if _extension(doc.get("file_name")) == ext and "resume_text" in doc and doc.get("resume_file"):
+            return doc
+    return None
+
+
+def is_same_file(resume_doc: dict | None, content_hash: str, filename: str) -> bool:
+    """True if resume_doc holds exactly this upload."""
+    return bool(
+        resume_doc
+        and resume_doc.get("content_hash") == content_hash
+        and _extension(resume_doc.get("file_name")) == _extension(filename)
+    )
+
+
+def register_resume_file(db, file_id) -> None:
+    """Start the reference count of a newly stored GridFS file at 1."""
+    db[RESUME_BLOBS_COLLECTION].insert_one({"_id": file_id, "refs": 1})
+
+
+def acquire_resume_file(db, file_id) -> bool:
+    """
+    Take a reference on a stored GridFS file before a new resume points at it.
+    False if the file is being (or has been) deleted: store the upload again.
+    """
+    return db[RESUME_BLOBS_COLLECTION].find_one_and_update(
+        {"_id": file_id, "refs": {"$gt": 0}},
+        {"$inc": {"refs": 1}},
+        projection={"_id": 1},
+    ) is not None
+
+
+def release_resume(db, fs, resume_doc: dict) -> None:
+    """
+    Delete a user_resume document and drop its reference on the GridFS file,
+    deleting the file with the last reference.
+    """
+    db.user_resume.delete_one({"_id": resume_doc["_id"]})
+
+    file_id = resume_doc.get("resume_file")
+    if file_id is None:
+        return
+    blob = db[RESUME_BLOBS_COLLECTION].find_one_and_update(
+        {"_id": file_id},
+        {"$inc": {"refs": -1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    # No count: a file from before migration 6 ran, kept to be safe
+    if blob is None or blob["refs"] > 0:
+        return
+    db[RESUME_BLOBS_COLLECTION].delete_one({"_id": file_id, "refs": {"$lte": 0}})
+    try:
+        fs.delete(file_id)
+    except Exception:
+        # File already missing in GridFS
+        pass
+
+
+def _extension(filename: str | None) -> str:
+    return os.path.splitext(filename or "")[1].lower()
@@ -0,0 +1,139 @@
+"""
+Unique Jobs
+Materialized view of the distinct (job title, URL) pairs across every
+user's job history, for the job board. The `unique_jobs` collection holds
+one document per pair with the number of history items that have it:
+
+    {_id: {job_title, url}, job_title, url, count, last_seen}
+
+History inserts, deletes and title changes adjust it incrementally; a
+$group aggregation over job_history rebuilds it from scratch (migration 4,
+or offline):
+
+    python -m utils.unique_jobs rebuild
+
+Incremental updates only ever raise last_seen, so after a delete or title
+change it may be later than a rebuild would make it (only the order moves).
+
+Pages are served newest first and kept in an in-process TTL cache. A
+process drops its cache when it changes the view itself; other server
+processes keep serving their copy for up to UNIQUE_JOBS_CACHE_TTL_SECONDS.
+"""
+
+import argparse
+import os
+from datetime import datetime
+
+from utils.pagination import keyset_page
+from utils.ttl_cache import TTLCache
+
+UNIQUE_JOBS_COLLECTION = "unique_jobs"
+UNIQUE_JOBS_SORT = [("last_seen", -1), ("_id", -1)]
+UNIQUE_JOBS_CACHE_TTL_SECONDS = int(os.getenv("UNIQUE_JOBS_CACHE_TTL_SECONDS", "10"))
+
+_page_cache = TTLCache(max_size=64, ttl_seconds=UNIQUE_JOBS_CACHE_TTL_SECONDS)
+
+
+def record_job_added(db, job_title: str | None, url: str | None, seen_at: datetime | None = None) -> None:
+    """Count a new history item in the view. Failures are only logged."""
+    if not job_title or not url:
+        return
+    try:
+        db[UNIQUE_JOBS_COLLECTION].update_one(
+            {"_id": {"job_title": job_title, "url": url}},
+            {
+                "$inc": {"count": 1},
+                "$max": {"last_seen": seen_at or datetime.utcnow()},
+                "$setOnInsert": {"job_title": job_title, "url": url},
+            },
+            upsert=True,
+        )
+        _page_cache.clear()
+    except Exception as e:
+        print(f"Failed to update unique jobs: {e}")
+
+
+def record_job_removed(db, job_title: str | None, url: str | None) -> None:
+    """Uncount a deleted history item; the pair goes once nothing has it. Failures are only logged."""
+    if not job_title or not url:
+        return
+    key = {"_id": {"job_title": job_title, "url": url}}
+    try:
+        db[UNIQUE_JOBS_COLLECTION].update_one(key, {"$inc": {"count": -1}})
+        db[UNIQUE_JOBS_COLLECTION].delete_one({**key, "count": {"$lte": 0}})
+        _page_cache.clear()
+    except Exception as e:
+        print(f"Failed to update unique jobs: {e}")
+
+
+def record_job_retitled(db, old_title: str | None, new_title: str | None, url: str | None,
+                        seen_at: datetime | None = None) -> None:
+    """Move a history item whose job title changed to its new (title, url) pair."""
+    if old_title == new_title:
+        return
+    record_job_removed(db, old_title, url)
+    record_job_added(db, new_title, url, seen_at)
+
+
+def rebuild_unique_jobs(db) -> int:
+    """
+    Recompute the whole view from job_history with one aggregation and
+    replace the collection with the result ($out swaps it in atomically).
+
+    Returns:
+        int: Number of unique jobs
+    """
+    db.job_history.aggregate([
+        {"$match": {"job_title": {"$type": "string", "$ne": ""}, "url": {"$type": "string", "$ne": ""}}},
+        {"$group": {
+            "_id": {"job_title": "$job_title", "url": "$url"},
+            "count": {"$sum": 1},
+            "last_seen": {"$max": "$created_at"},
+        }},
+        {"$set": {"job_title": "$_id.job_title", "url": "$_id.url"}},
+        {"$out": UNIQUE_JOBS_COLLECTION},
+    ], allowDiskUse=True)
+    _page_cache.clear()
+    return db[UNIQUE_JOBS_COLLECTION].count_documents({})
+
+
+def get_unique_jobs_page(db, limit: int, after: list | None = None) -> tuple[dict, str | None]:
+    """
+    One page of unique jobs, most recently used first.
+
+    Returns:
+        tuple: ({job title: url}, cursor for the next page or None)
+    """
+    cache_key = (limit, repr(after))
+    cached = _page_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    docs, next_cursor = keyset_page(
+        db[UNIQUE_JOBS_COLLECTION],
+        {},
+        UNIQUE_JOBS_SORT,
+        limit,
+        after,
+        projection={"job_title": 1, "url": 1},
+    )
+    # Same title with several URLs: the most recent one wins
+    jobs = {}
+    for doc in docs:
+        jobs.setdefault(doc["job_title"], doc["url"])
+
+    _page_cache.set(cache_key, (jobs, next_cursor))
+    return jobs, next_cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from config.database import get_db
+    print(f"Rebuilt {UNIQUE_JOBS_COLLECTION}: {rebuild_unique_jobs(get_db())} unique jobs")
+
+
+if __name__ == "__main__":
+    main()
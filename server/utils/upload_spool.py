@@ -0,0 +1,100 @@
+"""
+Upload Spool
+Copies an uploaded file out of the request in fixed-size chunks, hashing it
+on the way, so the web process never holds a whole upload in memory.
+Small files stay in memory; anything over RESUME_SPOOL_MEMORY_BYTES goes to a
+temp file on disk. The spool then feeds text extraction (by path, so the
+worker process reads it) and GridFS (chunked reads) from the same copy.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+# Largest multipart request carrying such a file (boundaries, part headers)
+RESUME_MAX_REQUEST_BYTES = RESUME_MAX_BYTES + 64 * 1024
+RESUME_SPOOL_MEMORY_BYTES = int(os.getenv("RESUME_SPOOL_MEMORY_BYTES", str(256 * 1024)))
+SPOOL_CHUNK_BYTES = 64 * 1024
+
+# Bytes kept for MIME sniffing
+HEAD_BYTES = 4096
+
+
+class UploadTooLarge(Exception):
+    """The upload is bigger than the allowed maximum."""
+
+
+class SpooledUpload:
+    """
+    An upload copied out of the request stream.
+
+    Attributes:
+        size (int): Bytes in the file
+        sha256 (str): Hex digest of the content
+        head (bytes): First HEAD_BYTES bytes, for MIME sniffing
+        path (str | None): Temp file holding the content, or None if it is in memory
+    """
+
+    def __init__(self, stream, max_bytes: int = RESUME_MAX_BYTES, memory_bytes: int = RESUME_SPOOL_MEMORY_BYTES):
+        self.size = 0
+        self.head = b""
+        self.path = None
+        self._buffer = io.BytesIO()
+        self._file = None
+
+        digest = hashlib.sha256()
+        try:
+            while True:
+                chunk = stream.read(SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                self.size += len(chunk)
+                if self.size > max_bytes:
+                    raise UploadTooLarge(f"File is too large. Maximum is {max_bytes // (1024 * 1024)} MB.")
+                if len(self.head) < HEAD_BYTES:
+                    self.head += chunk[:HEAD_BYTES - len(self.head)]
+                digest.update(chunk)
+
+                if self._file is None and self.size > memory_bytes:
+                    # Too big to keep in memory: move what we have to disk
+                    self._file = tempfile.NamedTemporaryFile(prefix="resume-upload-", delete=False)
+                    self.path = self._file.name
+                    self._file.write(self._buffer.getbuffer())
+                    self._buffer = None
+                (self._file or self._buffer).write(chunk)
+        except BaseException:
+            self.close()
+            raise
+
+        if self._file is not None:
+            self._file.close()
+        self.sha256 = digest.hexdigest()
+
+    def source(self) -> bytes | str:
+        """What extraction workers read: the temp file's path, or the bytes of a small file."""
+        return self.path if self.path else self._buffer.getvalue()
+
+    def open(self):
+        """A new binary reader positioned at the start (caller closes it)."""
+        if self.path:
+            return open(self.path, "rb")
+        return io.BytesIO(self._buffer.getbuffer())
+
+    def close(self) -> None:
+        """Drop the in-memory copy or delete the temp file."""
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self._file = None
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()